@@ -3,19 +3,44 @@ load_dotenv()
 
 import os
 import json
+import math
+import time
+import uuid
+import base64
+import binascii
 import xml.etree.ElementTree as ET
-from flask import Flask, render_template, request, redirect, url_for, session, send_file, make_response, jsonify, flash
-from resume.resume_generator import generate_resume, generate_cover_letter, generate_interview_qa
+from flask import Flask, render_template, request, redirect, url_for, session, send_file, make_response, jsonify, flash, Response, stream_with_context
+from resume.resume_generator import (
+    generate_resume, generate_cover_letter, generate_interview_qa, generation_cache,
+    generate_resume_stream, generate_cover_letter_stream, generate_interview_qa_stream,
+    openai_limiter, openai_single_flight
+)
+from resume.pdf_cache import PdfRenderCache, resume_cache_key
+from resume.renderer import render_pdf, RenderQueueFull, RenderTimeout, RenderUnavailable
+from resume.thumbnail_queue import ThumbnailQueue
+from resume.job_pool import JobPool
+from resume.user_cache import UserCache
+from resume.db_pool import PoolMetrics, engine_options
+from resume.generation_cache import SQLiteBackend
+from resume.job_search import AdzunaClient, AdzunaError, JobSearchAggregator, JobSearchTimeout
+from resume.geoip import IpLocationDatabase
+from resume.job_index import JobIndex
+from resume.ats import analyze_resume_text
+from resume.matching import JobMatcher
+from resume.streaming import with_heartbeat
 import tempfile
-from weasyprint import HTML
 import stripe
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user, UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
+from werkzeug.middleware.proxy_fix import ProxyFix
 from authlib.integrations.flask_client import OAuth
-from datetime import datetime
+from datetime import datetime, timedelta
 from flask_migrate import Migrate
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import defer, make_transient_to_detached
 import requests
 import fitz  # PyMuPDF
 import logging
@@ -27,12 +52,32 @@ from werkzeug.routing import BuildError
 
 ADZUNA_APP_ID = os.getenv("ADZUNA_APP_ID")
 ADZUNA_APP_KEY = os.getenv("ADZUNA_APP_KEY")
+adzuna = AdzunaClient(
+    ADZUNA_APP_ID,
+    ADZUNA_APP_KEY,
+    cache_backend=SQLiteBackend(os.getenv('ADZUNA_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'adzuna_cache.db')), table='adzuna_cache'),
+    cache_ttl=int(os.getenv('ADZUNA_CACHE_TTL', 900))
+)
+job_search = JobSearchAggregator(
+    adzuna,
+    max_workers=int(os.getenv('JOB_SEARCH_WORKERS', 8)),
+    budget=float(os.getenv('JOB_SEARCH_BUDGET', 2.5))
+)
+JOB_SEARCH_PAGES = int(os.getenv('JOB_SEARCH_PAGES', 3))
+JOB_SEARCH_COUNTRIES = tuple(c.strip() for c in os.getenv('JOB_SEARCH_COUNTRIES', 'us').split(',') if c.strip())
+DEFAULT_JOB_LOCATION = "New York, NY"
+job_matcher = JobMatcher()
+ip_locations = IpLocationDatabase(os.getenv('GEOIP_DB_PATH', os.path.join('instance', 'dbip-city-lite.csv.gz')))
 
 app = Flask(__name__)
 app_secret = os.getenv("SECRET_KEY")
 if not app_secret:
     raise RuntimeError("SECRET_KEY environment variable not set. Please set it in your environment or Render dashboard.")
 app.secret_key = app_secret
+# Render terminates TLS at its proxy, so take the client address from X-Forwarded-For
+trusted_proxy_count = int(os.getenv('TRUSTED_PROXY_COUNT', 1))
+if trusted_proxy_count > 0:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_proxy_count, x_proto=trusted_proxy_count)
 
 stripe_secret = os.getenv("STRIPE_SECRET_KEY")
 if not stripe_secret:
@@ -53,6 +98,8 @@ if not supabase_db_url:
     raise RuntimeError('SUPABASE_DB_URL environment variable not set. Get your connection string from your Supabase project.')
 app.config['SQLALCHEMY_DATABASE_URI'] = supabase_db_url
 # app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///users.db'  # Old SQLite, now disabled
+db_pool_metrics = PoolMetrics()
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(supabase_db_url, db_pool_metrics)
 
 db = SQLAlchemy(app)
 migrate = Migrate(app, db)
@@ -92,13 +139,23 @@ linkedin = oauth.register(
 )
 
 
+# Listing pages read this stored snippet instead of loading the full content column
+PREVIEW_LENGTH = 300
+
+def make_preview(content):
+    return ' '.join((content or '').split())[:PREVIEW_LENGTH]
+
+
 class CoverLetter(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     job_title = db.Column(db.String(150))
     content = db.Column(db.Text)
+    preview = db.Column(db.String(PREVIEW_LENGTH))
+    word_count = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     user = db.relationship('User', backref=db.backref('cover_letters', lazy=True))
+    __table_args__ = (db.Index('ix_cover_letter_user_id_created_at', 'user_id', 'created_at'),)
 
 
 class User(UserMixin, db.Model):
@@ -119,9 +176,11 @@ class Resume(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     title = db.Column(db.String(150))
     content = db.Column(db.Text)
+    preview = db.Column(db.String(PREVIEW_LENGTH))
     template = db.Column(db.String(50), default='classic')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     user = db.relationship('User', backref=db.backref('resumes', lazy=True))
+    __table_args__ = (db.Index('ix_resume_user_id_created_at', 'user_id', 'created_at'),)
 
 class SavedJob(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -132,6 +191,51 @@ class SavedJob(db.Model):
     url = db.Column(db.String(300))
     saved_at = db.Column(db.DateTime, default=datetime.utcnow)
     user = db.relationship('User', backref=db.backref('saved_jobs', lazy=True))
+    __table_args__ = (db.Index('ux_saved_job_user_id_url', 'user_id', 'url', unique=True),)
+
+@db.event.listens_for(Resume.content, 'set')
+def set_resume_preview(target, value, oldvalue, initiator):
+    target.preview = make_preview(value)
+
+@db.event.listens_for(CoverLetter.content, 'set')
+def set_cover_letter_preview(target, value, oldvalue, initiator):
+    target.preview = make_preview(value)
+    target.word_count = len((value or '').split())
+
+class InterviewQA(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    job_title = db.Column(db.String(150))
+    qa = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    user = db.relationship('User', backref=db.backref('interview_qas', lazy=True))
+
+class BackgroundJob(db.Model):
+    id = db.Column(db.String(36), primary_key=True, default=lambda: uuid.uuid4().hex)
+    # Nullable so an account deletion job can outlive the user it deleted
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True, index=True)
+    kind = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)
+    progress = db.Column(db.Integer, default=0)
+    # Bumped on every claim; only the latest attempt may record the outcome
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    params = db.Column(db.Text)
+    result = db.Column(db.Text)
+    error = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'progress': self.progress or 0,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
 
 app.config['UPLOAD_FOLDER'] = 'static/uploads/profile_pics'
 app.config['MAX_CONTENT_LENGTH'] = 2 * 1024 * 1024  # 2MB max file size
@@ -140,11 +244,67 @@ ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# Rendered PDF cache (content-addressed, LRU-evicted on disk)
+app.config['PDF_CACHE_DIR'] = os.getenv('PDF_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'resume_pdf_cache'))
+app.config['PDF_CACHE_MAX_BYTES'] = int(os.getenv('PDF_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+pdf_cache = PdfRenderCache(app.config['PDF_CACHE_DIR'], app.config['PDF_CACHE_MAX_BYTES'])
+
+def resume_pdf_cache_key(resume):
+    """Cache key for a resume's PDF: template name, template file mtime, content and title"""
+    template_path = os.path.join(app.root_path, app.template_folder, 'resume_templates', f"{resume.template}.html")
+    try:
+        template_mtime = os.path.getmtime(template_path)
+    except OSError:
+        template_mtime = 0
+    return resume_cache_key(resume.template, template_mtime, resume.content, resume.title)
+
+
 
+INTERVIEW_QA_PER_PAGE = 10
+
+def save_interview_qa(user_id, job_title, qa_content):
+    entry = InterviewQA(user_id=user_id, job_title=job_title, qa=qa_content)
+    db.session.add(entry)
+    db.session.commit()
+    return entry
+
+def migrate_session_interview_qa():
+    """Move Q&A left in the cookie session by older releases into the InterviewQA table"""
+    legacy = session.pop('interview_qa_list', None)
+    if not legacy:
+        return
+    for item in legacy:
+        if isinstance(item, dict) and item.get('qa'):
+            db.session.add(InterviewQA(user_id=current_user.id, job_title=item.get('job_title'), qa=item['qa']))
+    db.session.commit()
+
+# Per-worker identity cache for the login loader; writes to a User must call invalidate_user
+app.config['USER_CACHE_TTL'] = int(os.getenv('USER_CACHE_TTL', 30))
+user_cache = UserCache(
+    ttl=app.config['USER_CACHE_TTL'],
+    epoch_path=os.getenv('USER_CACHE_EPOCH_PATH', os.path.join(tempfile.gettempdir(), 'resume_user_cache.epoch'))
+)
+
+def invalidate_user(user_id):
+    user_cache.invalidate(int(user_id))
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user_id = int(user_id)
+    route = request.endpoint or 'unknown'
+    values = user_cache.get(user_id)
+    if values is not None:
+        user_cache.record(route, hit=True)
+        # Attach a detached copy to this request's session without a SELECT
+        user = User(**values)
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+    started = time.perf_counter()
+    user = User.query.get(user_id)
+    user_cache.record(route, hit=False, db_seconds=time.perf_counter() - started)
+    if user is not None:
+        user_cache.set(user_id, {column.key: getattr(user, column.key) for column in User.__table__.columns})
+    return user
 
 @app.route('/')
 def index():
@@ -231,18 +391,77 @@ def sitemap_xml():
     response.headers['Content-Type'] = 'application/xml'
     return response
 
+RESUME_API_FIELDS = ('id', 'title', 'preview', 'content', 'template', 'created_at')
+RESUME_API_DEFAULT_FIELDS = ('id', 'title', 'preview', 'template', 'created_at')
+
+def serialize_resume(resume, fields):
+    data = {field: getattr(resume, field) for field in fields}
+    if 'created_at' in data and data['created_at']:
+        data['created_at'] = data['created_at'].isoformat()
+    return data
+
+API_PAGE_DEFAULT_LIMIT = 50
+API_PAGE_MAX_LIMIT = 200
+
+def encode_cursor(row):
+    raw = f"{row.created_at.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+    created_at, row_id = raw.rsplit('|', 1)
+    return datetime.fromisoformat(created_at), int(row_id)
+
+def keyset_page(query, model, serialize):
+    """Return one page of query (newest first) as a JSON response with next_cursor
+
+    The cursor is the (created_at, id) of the last row served, so each page is
+    an index range scan no matter how deep the client has paged.
+    """
+    try:
+        limit = min(max(int(request.args.get('limit', API_PAGE_DEFAULT_LIMIT)), 1), API_PAGE_MAX_LIMIT)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            created_at, row_id = decode_cursor(cursor)
+        except (ValueError, UnicodeDecodeError, binascii.Error):
+            return jsonify({'error': 'Invalid cursor'}), 400
+        query = query.filter(db.or_(
+            model.created_at < created_at,
+            db.and_(model.created_at == created_at, model.id < row_id)
+        ))
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return jsonify({'items': [serialize(r) for r in rows[:limit]], 'next_cursor': next_cursor})
+
+def ndjson_export(query, model, serialize):
+    """Stream every row of query as newline-delimited JSON with flat memory use"""
+    def rows():
+        for row in query.order_by(model.created_at.desc(), model.id.desc()).yield_per(500):
+            yield json.dumps(serialize(row)) + '\n'
+    return Response(stream_with_context(rows()), mimetype='application/x-ndjson')
+
 @app.route('/api/resumes', methods=['GET'])
 @login_required
 def get_resumes_api():
-    resumes = Resume.query.filter_by(user_id=current_user.id).all()
-    data = [{
-        'id': r.id,
-        'title': r.title,
-        'content': r.content,
-        'template': r.template,
-        'created_at': r.created_at.isoformat()
-    } for r in resumes]
-    return jsonify(data)
+    # ?fields=id,title,content opts into the full content column, which is deferred otherwise
+    requested = request.args.get('fields')
+    if requested:
+        fields = [f.strip() for f in requested.split(',') if f.strip()]
+        unknown = [f for f in fields if f not in RESUME_API_FIELDS]
+        if unknown:
+            return jsonify({'error': f"Unknown fields: {', '.join(unknown)}"}), 400
+    else:
+        fields = list(RESUME_API_DEFAULT_FIELDS)
+    query = Resume.query.filter_by(user_id=current_user.id)
+    if 'content' not in fields:
+        query = query.options(defer(Resume.content))
+    serialize = lambda r: serialize_resume(r, fields)
+    if request.args.get('format') == 'ndjson':
+        return ndjson_export(query, Resume, serialize)
+    return keyset_page(query, Resume, serialize)
 
 @app.route('/api/resumes', methods=['POST'])
 @login_required
@@ -256,6 +475,7 @@ def create_resume_api():
     )
     db.session.add(new_resume)
     db.session.commit()
+    pdf_cache.invalidate(new_resume.id)
     return jsonify({'message': 'Resume created', 'id': new_resume.id}), 201
 
 @app.route('/api/resumes/<int:resume_id>', methods=['DELETE'])
@@ -266,33 +486,221 @@ def delete_resume_api(resume_id):
         return jsonify({'error': 'Unauthorized'}), 403
     db.session.delete(resume)
     db.session.commit()
+    pdf_cache.invalidate(resume_id)
+    thumbnail_queue.discard(resume_id)
     return jsonify({'message': 'Resume deleted'})
 
 @app.route('/api/cover-letters', methods=['GET'])
 @login_required
 def get_cover_letters_api():
-    letters = CoverLetter.query.filter_by(user_id=current_user.id).all()
-    data = [{'id': l.id, 'job_title': l.job_title, 'content': l.content, 'created_at': l.created_at.isoformat()} for l in letters]
-    return jsonify(data)
+    query = CoverLetter.query.filter_by(user_id=current_user.id)
+    serialize = lambda l: {'id': l.id, 'job_title': l.job_title, 'content': l.content, 'created_at': l.created_at.isoformat()}
+    if request.args.get('format') == 'ndjson':
+        return ndjson_export(query, CoverLetter, serialize)
+    return keyset_page(query, CoverLetter, serialize)
 
 @app.route('/api/cover-letters', methods=['POST'])
 @login_required
 def create_cover_letter_api():
     data = request.json
-    content = generate_cover_letter(current_user.name, current_user.email, data['job_title'], data['description'])
-    letter = CoverLetter(user_id=current_user.id, job_title=data['job_title'], content=content)
-    db.session.add(letter)
-    db.session.commit()
-    return jsonify({'message': 'Cover letter created', 'id': letter.id}), 201
+    job = enqueue_background_job('cover_letter', {
+        'job_title': data['job_title'],
+        'description': data.get('description', '')
+    })
+    return jsonify({'job_id': job.id, 'status_url': url_for('get_job_api', job_id=job.id)}), 202
 
 
 @app.route('/api/interview-qa', methods=['POST'])
 @login_required
 def generate_interview_qa_api():
     data = request.json
-    job_title = data['job_title']
-    qa_content = generate_interview_qa(job_title)
-    return jsonify({'qa': qa_content})
+    job = enqueue_background_job('interview_qa', {'job_title': data['job_title']})
+    return jsonify({'job_id': job.id, 'status_url': url_for('get_job_api', job_id=job.id)}), 202
+
+
+@app.route('/account-deletion/<job_id>')
+def account_deletion_status(job_id):
+    # The unguessable job id is the only credential: the user is already logged out
+    job = BackgroundJob.query.get(job_id)
+    if not job or job.kind != 'delete_account':
+        return "Not found", 404
+    if request.args.get('format') == 'json':
+        return jsonify({'status': job.status, 'progress': job.progress or 0})
+    return render_template('account_deletion.html', job=job)
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+@login_required
+def get_job_api(job_id):
+    job = BackgroundJob.query.get(job_id)
+    if not job or job.user_id != current_user.id:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+
+# Background jobs: persisted in the database, executed by a bounded per-process pool
+def run_cover_letter_job(job, params):
+    user = User.query.get(job.user_id)
+    name = user.name or user.email.split('@')[0].title()
+    content = generate_cover_letter(name, user.email, params['job_title'], params['description'])
+    letter = CoverLetter(user_id=user.id, job_title=params['job_title'], content=content)
+    db.session.add(letter)
+    db.session.flush()
+    return {'id': letter.id, 'job_title': letter.job_title, 'content': content}
+
+def run_interview_qa_job(job, params):
+    qa_content = generate_interview_qa(params['job_title'])
+    entry = InterviewQA(user_id=job.user_id, job_title=params['job_title'], qa=qa_content)
+    db.session.add(entry)
+    db.session.flush()
+    return {'id': entry.id, 'job_title': entry.job_title, 'qa': qa_content}
+
+def set_job_progress(job, percent):
+    job.progress = percent
+    db.session.commit()
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        app.logger.warning(f"Could not remove {path}: {e}")
+
+# How long account deletion waits for the user's other running jobs to finish
+DELETE_ACCOUNT_WAIT = float(os.getenv('DELETE_ACCOUNT_WAIT_SECONDS', 120))
+
+def other_running_jobs(job):
+    return BackgroundJob.query.filter(
+        BackgroundJob.user_id == job.user_id, BackgroundJob.id != job.id, BackgroundJob.status == 'running'
+    ).count()
+
+def wait_for_other_jobs(job, timeout):
+    """Wait until none of the user's other jobs is running; False if some still are at the timeout"""
+    deadline = time.monotonic() + timeout
+    while other_running_jobs(job):
+        # End the read transaction so the next check sees other workers' commits
+        db.session.commit()
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.5)
+    return True
+
+def run_delete_account_job(job, params):
+    """Delete a user and everything they own in one transaction, then clean up files and caches"""
+    user_id = job.user_id
+    user = User.query.get(user_id)
+    if user is None:
+        return {'deleted': False}
+    set_job_progress(job, 10)
+    # A running generation would write rows for the user after they are gone
+    if not wait_for_other_jobs(job, DELETE_ACCOUNT_WAIT):
+        raise RuntimeError('Other jobs for this account are still running; please try again shortly')
+
+    resume_ids = [row.id for row in db.session.query(Resume.id).filter_by(user_id=user_id)]
+    profile_pic = user.profile_pic
+    counts = {}
+    for model in (Resume, CoverLetter, SavedJob, InterviewQA):
+        counts[model.__tablename__] = model.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+    BackgroundJob.query.filter(
+        BackgroundJob.user_id == user_id, BackgroundJob.id != job.id, BackgroundJob.status != 'running'
+    ).delete(synchronize_session=False)
+    if other_running_jobs(job):
+        # Claimed by a worker since the wait; the caller rolls everything back
+        raise RuntimeError('Another job for this account started; please try again shortly')
+    remove_profile_pic = bool(profile_pic and profile_pic != 'default.jpg') and not User.query.filter(
+        User.profile_pic == profile_pic, User.id != user_id).count()
+    job.user_id = None
+    job.progress = 80
+    db.session.delete(user)
+    db.session.commit()
+    invalidate_user(user_id)
+
+    # Files and side stores are only touched once the rows are gone for good
+    job_index.remove_user(user_id)
+    for resume_id in resume_ids:
+        remove_file(thumbnail_path(resume_id))
+        pdf_cache.invalidate(resume_id)
+        thumbnail_queue.discard(resume_id)
+    if remove_profile_pic:
+        remove_file(os.path.join(app.config['UPLOAD_FOLDER'], profile_pic))
+    return {'deleted': True, 'counts': counts}
+
+BACKGROUND_JOB_HANDLERS = {
+    'cover_letter': run_cover_letter_job,
+    'interview_qa': run_interview_qa_job,
+    'delete_account': run_delete_account_job,
+}
+
+# Jobs still "running" after this long belong to a worker that died and are requeued
+BACKGROUND_JOB_STALE_AFTER = timedelta(seconds=int(os.getenv('BACKGROUND_JOB_STALE_SECONDS', 600)))
+# A stale job that has been claimed this many times is failed instead of requeued again
+BACKGROUND_JOB_MAX_ATTEMPTS = int(os.getenv('BACKGROUND_JOB_MAX_ATTEMPTS', 3))
+
+def finish_background_job(job_id, attempt, **values):
+    """Record a job's outcome if this attempt still owns it; False once it was requeued and claimed again"""
+    values['updated_at'] = datetime.utcnow()
+    return bool(BackgroundJob.query.filter_by(id=job_id, status='running', attempts=attempt).update(
+        values, synchronize_session=False))
+
+def run_background_job(job_id):
+    with app.app_context():
+        claimed = BackgroundJob.query.filter_by(id=job_id, status='queued').update(
+            {'status': 'running', 'attempts': BackgroundJob.attempts + 1, 'updated_at': datetime.utcnow()},
+            synchronize_session=False)
+        db.session.commit()
+        if not claimed:
+            return
+        job = BackgroundJob.query.get(job_id)
+        kind, attempt = job.kind, job.attempts
+        try:
+            params = json.loads(job.params) if job.params else {}
+            result = BACKGROUND_JOB_HANDLERS[kind](job, params)
+            if not finish_background_job(job_id, attempt, status='succeeded', progress=100, result=json.dumps(result)):
+                # A newer attempt owns the job; drop this one's rows so the work is not done twice
+                db.session.rollback()
+                app.logger.warning(f"Background job {job_id} ({kind}) attempt {attempt} was superseded; discarding its result")
+                return
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f"Background job {job_id} ({kind}) failed: {str(e)}")
+            if finish_background_job(job_id, attempt, status='failed', error=str(e)[:500]):
+                db.session.commit()
+
+def sweep_background_jobs(limit):
+    with app.app_context():
+        stale_before = datetime.utcnow() - BACKGROUND_JOB_STALE_AFTER
+        stale = BackgroundJob.query.filter(BackgroundJob.status == 'running', BackgroundJob.updated_at < stale_before)
+        stale.filter(BackgroundJob.attempts >= BACKGROUND_JOB_MAX_ATTEMPTS).update(
+            {'status': 'failed', 'error': 'The job stopped before finishing too many times'}, synchronize_session=False)
+        stale.filter(BackgroundJob.attempts < BACKGROUND_JOB_MAX_ATTEMPTS).update(
+            {'status': 'queued'}, synchronize_session=False)
+        db.session.commit()
+        queued = BackgroundJob.query.filter_by(status='queued').order_by(BackgroundJob.created_at).limit(limit).all()
+        return [job.id for job in queued]
+
+background_jobs = JobPool(
+    run_background_job,
+    sweep=sweep_background_jobs,
+    max_workers=int(os.getenv('BACKGROUND_JOB_WORKERS', 4)),
+    max_pending=int(os.getenv('BACKGROUND_JOB_MAX_PENDING', 16))
+)
+
+@app.before_request
+def start_background_jobs():
+    # Started on the first request so each gunicorn worker resumes queued jobs after a restart
+    background_jobs.start()
+    thumbnail_queue.start()
+    ip_locations.start()
+
+def enqueue_background_job(kind, params):
+    """Persist a job and hand it to the pool; a saturated pool leaves it for the sweep"""
+    job = BackgroundJob(user_id=current_user.id, kind=kind, params=json.dumps(params))
+    db.session.add(job)
+    db.session.commit()
+    background_jobs.dispatch(job.id)
+    return job
 
 
 @app.route('/register', methods=['GET', 'POST'])
@@ -469,8 +877,8 @@ def logout():
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    resumes = Resume.query.filter_by(user_id=current_user.id).all()
-    cover_letters = CoverLetter.query.filter_by(user_id=current_user.id).all()
+    resumes = Resume.query.filter_by(user_id=current_user.id).options(defer(Resume.content)).all()
+    cover_letters = CoverLetter.query.filter_by(user_id=current_user.id).options(defer(CoverLetter.content)).all()
     # Defensive: filter out any cover letters with missing, None, or invalid id
     valid_cover_letters = []
     for cl in cover_letters:
@@ -479,14 +887,15 @@ def dashboard():
         else:
             app.logger.warning(f"[dashboard] Skipping cover letter with invalid id: {getattr(cl, 'id', None)}")
     app.logger.info(f"[dashboard] Rendering cover_letters: {[cl.id for cl in valid_cover_letters]}")
-    interview_qa_list = session.get('interview_qa_list', [])
+    migrate_session_interview_qa()
+    interview_qa_count = InterviewQA.query.filter_by(user_id=current_user.id).count()
     # Defensive: always pass resumes as a list
     if resumes is None:
         resumes = []
     return render_template('dashboard.html', 
                            resumes=resumes, 
                            cover_letters=valid_cover_letters, 
-                           interview_qa_list=interview_qa_list)
+                           interview_qa_count=interview_qa_count)
 
 
 
@@ -552,17 +961,130 @@ def create_resume():
         new_resume = Resume(user_id=current_user.id, title=title, content=content, template=template)
         db.session.add(new_resume)
         db.session.commit()
-        # Generate thumbnail after saving
+        # Queue thumbnail generation after saving
         rendered_html = render_template(f"resume_templates/{template}.html", resume=new_resume)
         try:
-            generate_resume_thumbnail(new_resume.id, rendered_html)
+            thumbnail_queue.enqueue(new_resume.id, rendered_html)
         except Exception as e:
-            logging.error(f'Thumbnail generation failed: {e}')
+            logging.error(f'Thumbnail enqueue failed: {e}')
         logging.debug('Redirecting to preview_resume.')
         return redirect(url_for('resumes'))
     logging.debug('Rendering create_resume.html template.')
     return render_template('create_resume.html')
 
+# Streaming generation endpoints (server-sent events)
+def sse_event(data, event=None):
+    """Format one server-sent event with a JSON payload"""
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data)}\n\n"
+
+# SSE comment line sent while generation is quiet so proxies do not drop the stream
+SSE_KEEPALIVE = ": keepalive\n\n"
+SSE_HEARTBEAT_INTERVAL = float(os.getenv('SSE_HEARTBEAT_INTERVAL', 15))
+
+def sse_tokens(tokens):
+    """Token events for a generation stream, with keepalive comments while it is quiet
+
+    Yields (event, token) pairs; token is None for keepalives.
+    """
+    for token in with_heartbeat(tokens, SSE_HEARTBEAT_INTERVAL):
+        if token is None:
+            yield SSE_KEEPALIVE, None
+        else:
+            yield sse_event({'token': token}), token
+
+def sse_response(events):
+    response = Response(stream_with_context(events), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/stream/resume', methods=['POST'])
+@login_required
+def stream_resume():
+    experience = request.form.get('content', '').strip()
+    if not experience:
+        return jsonify({'error': 'Please enter your experience or resume content.'}), 400
+    title = f"Resume - {current_user.name or current_user.email}"
+    template = request.form.get('template', session.get('selected_template', 'classic'))
+    name = ' '.join([part.capitalize() for part in request.form.get('name', '').split()])
+    user_id = current_user.id
+    tokens = generate_resume_stream(name, '', current_user.email, title, experience)
+
+    def events():
+        parts = []
+        try:
+            for event, token in sse_tokens(tokens):
+                if token is not None:
+                    parts.append(token)
+                yield event
+            new_resume = Resume(user_id=user_id, title=title, content="".join(parts), template=template)
+            db.session.add(new_resume)
+            db.session.commit()
+            rendered_html = render_template(f"resume_templates/{template}.html", resume=new_resume)
+            try:
+                thumbnail_queue.enqueue(new_resume.id, rendered_html)
+            except Exception as e:
+                logging.error(f'Thumbnail enqueue failed: {e}')
+            yield sse_event({'id': new_resume.id, 'redirect': url_for('resumes')}, event='done')
+        except Exception as e:
+            app.logger.error(f"Error streaming resume: {str(e)}")
+            yield sse_event({'error': 'Sorry, there was an error generating your resume. Please try again.'}, event='error')
+
+    return sse_response(events())
+
+@app.route('/stream/cover-letter', methods=['POST'])
+@login_required
+def stream_cover_letter():
+    job_title = request.form.get('job_title', '').strip()
+    description = request.form.get('description', '').strip()
+    if len(job_title) < 2:
+        return jsonify({'error': 'Job title must be at least 2 characters long.'}), 400
+    name = current_user.name or current_user.email.split('@')[0].title()
+    user_id = current_user.id
+    tokens = generate_cover_letter_stream(name, current_user.email, job_title, description)
+
+    def events():
+        parts = []
+        try:
+            for event, token in sse_tokens(tokens):
+                if token is not None:
+                    parts.append(token)
+                yield event
+            letter = CoverLetter(user_id=user_id, job_title=job_title, content="".join(parts))
+            db.session.add(letter)
+            db.session.commit()
+            yield sse_event({'id': letter.id, 'redirect': url_for('cover_letters')}, event='done')
+        except Exception as e:
+            app.logger.error(f"Error streaming cover letter: {str(e)}")
+            yield sse_event({'error': 'Sorry, there was an error generating your cover letter. Please try again.'}, event='error')
+
+    return sse_response(events())
+
+@app.route('/stream/interview-qa', methods=['POST'])
+@login_required
+def stream_interview_qa():
+    job_title = request.form.get('job_title', '').strip()
+    if not job_title:
+        return jsonify({'error': 'Please enter a job title.'}), 400
+    user_id = current_user.id
+    tokens = generate_interview_qa_stream(job_title)
+
+    def events():
+        parts = []
+        try:
+            for event, token in sse_tokens(tokens):
+                if token is not None:
+                    parts.append(token)
+                yield event
+            entry = save_interview_qa(user_id, job_title, "".join(parts))
+            yield sse_event({'id': entry.id, 'redirect': url_for('interview_qa')}, event='done')
+        except Exception as e:
+            app.logger.error(f"Error streaming interview Q&A: {str(e)}")
+            yield sse_event({'error': 'Sorry, there was an error generating interview questions. Please try again.'}, event='error')
+
+    return sse_response(events())
+
 @app.route('/edit-resume/<int:resume_id>', methods=['GET', 'POST'])
 @login_required
 def edit_resume(resume_id):
@@ -574,12 +1096,13 @@ def edit_resume(resume_id):
         resume.content = request.form['content']
         resume.template = request.form.get('template', 'classic')
         db.session.commit()
-        # Generate thumbnail after editing
+        pdf_cache.invalidate(resume.id)
+        # Queue thumbnail regeneration after editing
         rendered_html = render_template(f"resume_templates/{resume.template}.html", resume=resume)
         try:
-            generate_resume_thumbnail(resume.id, rendered_html)
+            thumbnail_queue.enqueue(resume.id, rendered_html)
         except Exception as e:
-            print(f"Thumbnail generation failed: {e}")
+            print(f"Thumbnail enqueue failed: {e}")
         return redirect(url_for('dashboard'))
     return render_template('edit_resume.html', resume=resume)
 
@@ -591,6 +1114,8 @@ def delete_resume(resume_id):
         return "Unauthorized", 403
     db.session.delete(resume)
     db.session.commit()
+    pdf_cache.invalidate(resume_id)
+    thumbnail_queue.discard(resume_id)
     return redirect(url_for('dashboard'))
 
 @app.route('/profile', methods=['GET', 'POST'])
@@ -611,6 +1136,7 @@ def profile():
             current_user.profile_pic = filename
 
         db.session.commit()
+        invalidate_user(current_user.id)
         return redirect(url_for('dashboard'))
 
     return render_template('profile.html', user=current_user)
@@ -625,6 +1151,16 @@ def preview_resume(resume_id):
         return redirect(url_for('dashboard'))
     return render_template(f"resume_templates/{resume.template}.html", resume=resume)
 
+app.config['JOB_INDEX_PATH'] = os.getenv('JOB_INDEX_PATH', os.path.join(app.instance_path, 'job_index.db'))
+job_index = JobIndex(app.config['JOB_INDEX_PATH'], listing_ttl=int(os.getenv('JOB_INDEX_LISTING_TTL', 7 * 24 * 3600)))
+
+def index_job_listings(results):
+    # Keep fetched listings searchable locally; a failure here must not break the page
+    try:
+        job_index.add_listings(results)
+    except Exception as e:
+        logging.error(f"Error indexing job listings: {e}")
+
 @app.route('/find-jobs', methods=['GET', 'POST'])
 @login_required
 def find_jobs():
@@ -632,21 +1168,15 @@ def find_jobs():
     location = request.form.get('location', '')
     country = 'us'  # or 'gb', 'ca', etc.
     
-    # Build API URL
-    api_url = f'https://api.adzuna.com/v1/api/jobs/{country}/search/1'
-    params = {
-        'app_id': '8015aa6c',
-        'app_key': 'b704fa323f3ffea50f9c20bca03c5caf',
-        'what': keyword,
-        'where': location,
-        'results_per_page': 10,
-        'content-type': 'application/json'
-    }
-    response = requests.get(api_url, params=params)
-    
     job_listings = []
-    if response.status_code == 200:
-        data = response.json()
+    try:
+        data = adzuna.search(keyword, location, page=1, results_per_page=10, country=country,
+                             app_id='8015aa6c', app_key='b704fa323f3ffea50f9c20bca03c5caf')
+    except (requests.RequestException, AdzunaError) as e:
+        print(f"Adzuna API error: {e}")
+        data = None
+    if data:
+        index_job_listings(data.get('results', []))
         job_listings = [{
             'title': job.get('title', 'N/A'),
             'company': job.get('company', {}).get('display_name', 'N/A'),
@@ -658,6 +1188,51 @@ def find_jobs():
     saved_jobs = SavedJob.query.filter_by(user_id=current_user.id).all()
     return render_template('find_jobs.html', jobs=job_listings, saved_jobs=saved_jobs)
 
+JOB_SEARCH_API_MAX_LIMIT = 100
+
+def salary_arg(name):
+    """Optional non-negative salary from the query string; raises ValueError if malformed"""
+    value = request.args.get(name, '').strip()
+    if not value:
+        return None
+    salary = float(value)
+    if not math.isfinite(salary) or salary < 0:
+        raise ValueError(name)
+    return salary
+
+@app.route('/api/jobs/search', methods=['GET'])
+@login_required
+def search_jobs_api():
+    """Ranked prefix search over the user's saved jobs and recently fetched listings"""
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), JOB_SEARCH_API_MAX_LIMIT)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify({'error': 'limit and offset must be integers'}), 400
+    try:
+        salary_min = salary_arg('salary_min')
+        salary_max = salary_arg('salary_max')
+    except ValueError:
+        return jsonify({'error': 'salary_min and salary_max must be non-negative numbers'}), 400
+    if salary_min is not None and salary_max is not None and salary_min > salary_max:
+        return jsonify({'error': 'salary_min must not be greater than salary_max'}), 400
+    if not job_index.has_user(current_user.id):
+        saved = SavedJob.query.filter_by(user_id=current_user.id).all()
+        job_index.reindex_user(current_user.id, [
+            {'title': j.title, 'company': j.company, 'location': j.location, 'url': j.url} for j in saved
+        ])
+    results = job_index.search(
+        current_user.id,
+        request.args.get('q', ''),
+        location=request.args.get('location'),
+        salary_min=salary_min,
+        salary_max=salary_max,
+        saved_only=request.args.get('saved') in ('1', 'true'),
+        limit=limit,
+        offset=offset
+    )
+    return jsonify({'items': results, 'limit': limit, 'offset': offset})
+
 @app.route('/save-job', methods=['POST'])
 @login_required
 def save_job():
@@ -666,17 +1241,22 @@ def save_job():
     location = request.form['location']
     url = request.form['url']
 
-    existing = SavedJob.query.filter_by(user_id=current_user.id, url=url).first()
-    if not existing:
-        new_saved = SavedJob(
-            user_id=current_user.id,
-            title=title,
-            company=company,
-            location=location,
-            url=url
-        )
-        db.session.add(new_saved)
-        db.session.commit()
+    # Single round trip; the unique (user_id, url) index makes repeat saves a no-op
+    insert = pg_insert if db.engine.dialect.name == 'postgresql' else sqlite_insert
+    statement = insert(SavedJob.__table__).values(
+        user_id=current_user.id,
+        title=title,
+        company=company,
+        location=location,
+        url=url,
+        saved_at=datetime.utcnow()
+    ).on_conflict_do_nothing(index_elements=['user_id', 'url'])
+    db.session.execute(statement)
+    db.session.commit()
+    try:
+        job_index.add_saved_jobs(current_user.id, [{'title': title, 'company': company, 'location': location, 'url': url}])
+    except Exception as e:
+        logging.error(f"Error indexing saved job: {e}")
 
     return redirect(url_for('find_jobs'))
 
@@ -685,17 +1265,7 @@ def save_job():
 @login_required
 def generate_interview_for_job(job_title):
     qa_content = generate_interview_qa(job_title)
-    
-    # Get current list or initialize
-    interview_qa_list = session.get('interview_qa_list', [])
-    
-    # Append and reassign
-    interview_qa_list.append({'job_title': job_title, 'qa': qa_content})
-    session['interview_qa_list'] = interview_qa_list
-    
-    # Explicitly mark the session as modified
-    session.modified = True
-    
+    save_interview_qa(current_user.id, job_title, qa_content)
     return redirect(url_for('dashboard'))
 
 
@@ -704,8 +1274,21 @@ def generate_interview_for_job(job_title):
 @login_required
 def clear_interview_qa():
     session.pop('interview_qa_list', None)
+    InterviewQA.query.filter_by(user_id=current_user.id).delete(synchronize_session=False)
+    db.session.commit()
     return redirect(url_for('dashboard'))
 
+@app.route('/interview-qa/<int:qa_id>/delete', methods=['POST'])
+@login_required
+def delete_interview_qa(qa_id):
+    # Another user's entry answers the same as a missing one, so ids cannot be probed
+    entry = InterviewQA.query.filter_by(id=qa_id, user_id=current_user.id).first()
+    if entry is None:
+        return jsonify({'error': 'Interview Q&A not found'}), 404
+    db.session.delete(entry)
+    db.session.commit()
+    return jsonify({'message': 'Interview Q&A deleted'})
+
 
 
 @app.route('/create-resume/<job_title>')
@@ -757,17 +1340,7 @@ def generate_interview_qa_route():
         return redirect(url_for('interview_qa'))
 
     qa_content = generate_interview_qa(job_title)
-
-    # Get or initialize the list
-    interview_qa_list = session.get('interview_qa_list', [])
-    interview_qa_list.append({'job_title': job_title, 'qa': qa_content})
-    
-    # Reassign the list back to session
-    session['interview_qa_list'] = interview_qa_list
-
-    # Ensure session is modified
-    session.modified = True
-
+    save_interview_qa(current_user.id, job_title, qa_content)
     return redirect(url_for('interview_qa'))
 
 
@@ -834,6 +1407,7 @@ def stripe_webhook():
                         if customer_id and not user.stripe_customer_id:
                             user.stripe_customer_id = customer_id
                         db.session.commit()
+                        invalidate_user(user.id)
                         print(f"✅ Subscription activated: User {user.email} → {plan} (Customer: {customer_id})")
                     else:
                         print(f"⚠️  User not found for subscription: {user_id}")
@@ -899,6 +1473,7 @@ def stripe_webhook():
                 if user:
                     user.subscription = 'Free'
                     db.session.commit()
+                    invalidate_user(user.id)
                     print(f"   User {user.email} downgraded to Free plan")
             
         elif event.get('type') == 'customer.subscription.updated':
@@ -962,8 +1537,19 @@ def download_pdf(resume_id):
     resume = Resume.query.get_or_404(resume_id)
     if resume.user_id != current_user.id:
         return "Unauthorized", 403
-    rendered = render_template(f"resume_templates/{resume.template}.html", resume=resume)
-    pdf = HTML(string=rendered).write_pdf()
+    cache_key = resume_pdf_cache_key(resume)
+    pdf = pdf_cache.get(resume.id, cache_key)
+    if pdf is None:
+        rendered = render_template(f"resume_templates/{resume.template}.html", resume=resume)
+        try:
+            pdf = render_pdf(rendered)
+        except (RenderQueueFull, RenderUnavailable):
+            response = make_response("PDF rendering is busy. Please try again in a moment.", 503)
+            response.headers['Retry-After'] = '5'
+            return response
+        except RenderTimeout:
+            return "PDF rendering timed out. Please try again.", 504
+        pdf_cache.put(resume.id, cache_key, pdf)
     response = make_response(pdf)
     response.headers['Content-Type'] = 'application/pdf'
     response.headers['Content-Disposition'] = f'attachment; filename={resume.title}.pdf'
@@ -1085,13 +1671,14 @@ def create_checkout_session():
 @app.route('/resumes')
 @login_required
 def resumes():
-    resumes = Resume.query.filter_by(user_id=current_user.id).all()
-    return render_template('resumes.html', resumes=resumes, current_user=current_user, active_page='resumes')
+    resumes = Resume.query.filter_by(user_id=current_user.id).options(defer(Resume.content)).all()
+    ready_thumbnails = {r.id for r in resumes if os.path.exists(thumbnail_path(r.id))}
+    return render_template('resumes.html', resumes=resumes, ready_thumbnails=ready_thumbnails, current_user=current_user, active_page='resumes')
 
 @app.route('/cover_letters')
 @login_required
 def cover_letters():
-    cover_letters = CoverLetter.query.filter_by(user_id=current_user.id).all()
+    cover_letters = CoverLetter.query.filter_by(user_id=current_user.id).options(defer(CoverLetter.content)).all()
     # Defensive: filter out any cover letters with missing, None, or invalid id
     valid_cover_letters = []
     for cl in cover_letters:
@@ -1105,39 +1692,41 @@ def cover_letters():
 @app.route('/interview_qa', methods=['GET', 'POST'])
 @login_required
 def interview_qa():
-    interview_qa_list = session.get('interview_qa_list', [])
+    migrate_session_interview_qa()
     if request.method == 'POST':
         job_title = request.form.get('job_title')
         if job_title:
             qa_content = generate_interview_qa(job_title)
-            interview_qa_list.append({'job_title': job_title, 'qa': qa_content})
-            session['interview_qa_list'] = interview_qa_list
-            session.modified = True
+            save_interview_qa(current_user.id, job_title, qa_content)
             return redirect(url_for('interview_qa'))
-    return render_template('interview_qa.html', interview_qa_list=interview_qa_list, current_user=current_user, active_page='interview_qa')
+    page = request.args.get('page', 1, type=int)
+    pagination = InterviewQA.query.filter_by(user_id=current_user.id) \
+        .order_by(InterviewQA.created_at.desc(), InterviewQA.id.desc()) \
+        .paginate(page=page, per_page=INTERVIEW_QA_PER_PAGE, error_out=False)
+    return render_template('interview_qa.html', interview_qa_list=pagination.items, pagination=pagination, current_user=current_user, active_page='interview_qa')
 
 def get_user_location():
-    """Get user's approximate location using IP geolocation or return default."""
-    try:
-        # Try to get user's location from IP
-        response = requests.get('http://ip-api.com/json/', timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('status') == 'success':
-                city = data.get('city', '')
-                region = data.get('regionName', '')
-                country = data.get('country', '')
-                if city and region:
-                    return f"{city}, {region}"
-                elif city:
-                    return city
-                elif region:
-                    return region
-    except:
-        pass
-    
-    # Default to major US cities if location detection fails
-    return "New York, NY"
+    """Get user's approximate location from the offline IP database, cached in the session."""
+    cached = session.get('user_location')
+    if cached and cached.get('user_id') == current_user.id and cached.get('ip') == request.remote_addr:
+        return cached['location']
+    location = ip_locations.lookup(request.remote_addr) or DEFAULT_JOB_LOCATION
+    # Until the IP database has finished loading, serve the default without caching it
+    if ip_locations.ready:
+        session['user_location'] = {'user_id': current_user.id, 'ip': request.remote_addr, 'location': location}
+    return location
+
+def rank_jobs_for_resume(job_listings, resume_id=None):
+    """Order listings by similarity to the chosen (or latest) resume and attach a match percentage"""
+    query = Resume.query.filter_by(user_id=current_user.id)
+    resume = query.filter_by(id=resume_id).first() if resume_id else query.order_by(Resume.created_at.desc()).first()
+    if not resume or not resume.content or not job_listings:
+        return job_listings
+    scores = job_matcher.score(resume.id, resume.content, job_listings)
+    for job, score in zip(job_listings, scores):
+        job['match'] = round(score * 100)
+    # sorted() is stable, so equal scores keep the aggregator's keyword ranking
+    return [job for _, job in sorted(zip(scores, job_listings), key=lambda pair: -pair[0])]
 
 @app.route('/jobs')
 @login_required
@@ -1153,45 +1742,36 @@ def jobs():
     if not keyword:
         keyword = 'software developer'  # Default search term for better results
     
-    api_url = f'https://api.adzuna.com/v1/api/jobs/us/search/1'
-    params = {
-        'app_id': ADZUNA_APP_ID,
-        'app_key': ADZUNA_APP_KEY,
-        'what': keyword,
-        'where': location,
-        'results_per_page': 25,  # Show more jobs
-        'content-type': 'application/json'
-    }
-    
-    response = None
     error_message = None
     job_listings = []
     
     try:
-        response = requests.get(api_url, params=params, timeout=10)
+        data = job_search.search(keyword, location, pages=JOB_SEARCH_PAGES, countries=JOB_SEARCH_COUNTRIES, results_per_page=25)
+        if data['late'] or data['failed']:
+            logging.warning(f"Job search for '{keyword}' dropped {data['late']} late and {data['failed']} failed requests")
+        index_job_listings(data['results'])
+        job_listings = [{
+            'title': job.get('title', 'N/A'),
+            'company': job.get('company', {}).get('display_name', 'N/A'),
+            'location': job.get('location', {}).get('display_name', 'N/A'),
+            'url': job.get('redirect_url', '#'),
+            'description': job.get('description', ''),
+            'salary': job.get('salary_min', None),
+            'salary_max': job.get('salary_max', None)
+        } for job in data.get('results', [])]
+        job_listings = rank_jobs_for_resume(job_listings, request.args.get('resume_id', type=int))
+    except JobSearchTimeout as e:
+        logging.warning(f"Job search for '{keyword}' timed out: {e}")
+        error_message = 'Job search is taking longer than usual. Please try again in a moment.'
     except requests.RequestException as e:
         print(f"Adzuna API error: {e}")
         error_message = 'Could not load jobs. Please try again later.'
-    
-    if response is not None:
-        try:
-            if response.status_code == 200:
-                data = response.json()
-                job_listings = [{
-                    'title': job.get('title', 'N/A'),
-                    'company': job.get('company', {}).get('display_name', 'N/A'),
-                    'location': job.get('location', {}).get('display_name', 'N/A'),
-                    'url': job.get('redirect_url', '#'),
-                    'description': job.get('description', ''),
-                    'salary': job.get('salary_min', None),
-                    'salary_max': job.get('salary_max', None)
-                } for job in data.get('results', [])]
-            else:
-                print(f"Adzuna API returned status {response.status_code}: {response.text}")
-                error_message = 'Unable to fetch jobs at the moment. Please try again later.'
-        except Exception as e:
-            print(f"Error parsing Adzuna API response: {e}")
-            error_message = 'Error processing job listings. Please try again later.'
+    except AdzunaError as e:
+        print(str(e))
+        error_message = 'Unable to fetch jobs at the moment. Please try again later.'
+    except Exception as e:
+        print(f"Error parsing Adzuna API response: {e}")
+        error_message = 'Error processing job listings. Please try again later.'
     
     return render_template('jobs.html', 
                          jobs=job_listings, 
@@ -1244,34 +1824,16 @@ def my_account():
         delete_account = request.form.get('delete_account')
         
         if delete_account:
-            # Delete all user data
-            resumes = Resume.query.filter_by(user_id=current_user.id).all()
-            for resume in resumes:
-                db.session.delete(resume)
-            
-            cover_letters = CoverLetter.query.filter_by(user_id=current_user.id).all()
-            for cover_letter in cover_letters:
-                db.session.delete(cover_letter)
-            
-            # Delete user profile picture if exists
-            if current_user.profile_pic:
-                try:
-                    profile_pic_path = os.path.join(app.config['UPLOAD_FOLDER'], current_user.profile_pic)
-                    if os.path.exists(profile_pic_path):
-                        os.remove(profile_pic_path)
-                except:
-                    pass
-            
-            # Delete the user account
-            db.session.delete(current_user)
-            db.session.commit()
+            # Data is removed by a background job; the user follows its progress after logout
+            job = enqueue_background_job('delete_account', {})
             logout_user()
-            return redirect(url_for('index'))
+            return redirect(url_for('account_deletion_status', job_id=job.id))
         
         if change_subscription and subscription:
             # Update subscription (this would integrate with payment processor in production)
             current_user.subscription = subscription
             db.session.commit()
+            invalidate_user(current_user.id)
             return redirect(url_for('my_account'))
         
         if current_password and new_password and confirm_password:
@@ -1281,6 +1843,7 @@ def my_account():
                     if len(new_password) >= 6:
                         current_user.password = generate_password_hash(new_password)
                         db.session.commit()
+                        invalidate_user(current_user.id)
                         return redirect(url_for('my_account'))
                     else:
                         return render_template('profile.html', user=current_user, active_page='my_account', 
@@ -1315,6 +1878,7 @@ def my_account():
             current_user.profile_pic = filename
             
         db.session.commit()
+        invalidate_user(current_user.id)
         return redirect(url_for('my_account'))
     
     return render_template('profile.html', 
@@ -1323,44 +1887,55 @@ def my_account():
                          success_message=success_message,
                          error_message=error_message)
 
+THUMBNAIL_WIDTH = int(os.getenv('THUMBNAIL_WIDTH', 640))
+
 def generate_resume_thumbnail(resume_id, html_content):
     """Generate a PNG thumbnail for the given resume HTML and save it to static/resume_thumbnails/{resume_id}.png"""
-    from weasyprint import HTML
-    import os
-    # Render PDF to a temporary file
-    pdf_path = f"/tmp/resume_{resume_id}.pdf"
-    HTML(string=html_content).write_pdf(pdf_path)
-    # Open PDF and render first page as PNG
-    doc = fitz.open(pdf_path)
-    page = doc.load_page(0)
-    pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2x scale for better quality
-    out_dir = os.path.join('static', 'resume_thumbnails')
+    pdf_bytes = render_pdf(html_content)
+    # Rasterize only the first page straight from memory, scaled to the target width
+    doc = fitz.open(stream=pdf_bytes, filetype='pdf')
+    try:
+        page = doc.load_page(0)
+        zoom = THUMBNAIL_WIDTH / page.rect.width
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        png_bytes = pix.tobytes('png')
+    finally:
+        doc.close()
+    out_path = thumbnail_path(resume_id)
+    out_dir = os.path.dirname(out_path)
     os.makedirs(out_dir, exist_ok=True)
-    out_path = os.path.join(out_dir, f"{resume_id}.png")
-    pix.save(out_path)
-    doc.close()
-    os.remove(pdf_path)
+    # Write next to the target and rename so readers never see a partial PNG
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, suffix='.png.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(png_bytes)
+        os.replace(tmp_path, out_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def thumbnail_path(resume_id):
+    return os.path.join('static', 'resume_thumbnails', f"{resume_id}.png")
+
+# Thumbnails are rendered off the request path by a per-process worker thread
+app.config['THUMBNAIL_QUEUE_PATH'] = os.getenv('THUMBNAIL_QUEUE_PATH', os.path.join(app.instance_path, 'thumbnail_queue.db'))
+# A saturated or slow renderer is retried with backoff; a job is only dropped once it succeeds or runs out of attempts
+thumbnail_queue = ThumbnailQueue(
+    app.config['THUMBNAIL_QUEUE_PATH'],
+    generate_resume_thumbnail,
+    retry_on=(RenderQueueFull, RenderTimeout, RenderUnavailable),
+    max_attempts=int(os.getenv('THUMBNAIL_MAX_ATTEMPTS', 5))
+)
 
 @app.route('/analyze-resume/<int:resume_id>', methods=['GET'])
 @login_required
 def analyze_resume(resume_id):
-    # Fetch the resume content (this assumes resumes are stored as text or can be converted to text)
-    resume_path = os.path.join('static', 'resume_thumbnails', f'{resume_id}.png')
-    if not os.path.exists(resume_path):
+    resume = Resume.query.get(resume_id)
+    if not resume or resume.user_id != current_user.id:
         return jsonify({'error': 'Resume not found'}), 404
-
-    # Placeholder for ATS analysis logic
-    # Replace this with actual analysis logic or API integration
-    analysis_result = {
-        'score': 85,  # Example score
-        'recommendations': [
-            'Use more keywords relevant to the job description.',
-            'Avoid using tables or images for critical information.',
-            'Ensure consistent formatting throughout the resume.'
-        ]
-    }
-
-    return jsonify(analysis_result)
+    # ?job_description= scores keyword coverage against a specific posting
+    return jsonify(analyze_resume_text(resume.content, request.args.get('job_description')))
 
 @app.route('/upload-resume', methods=['POST'])
 @login_required
@@ -1467,13 +2042,13 @@ def upload_existing_resume():
                 db.session.commit()
                 logging.info(f"Resume created with ID: {new_resume.id}")
                 
-                # Generate thumbnail
+                # Queue thumbnail generation
                 rendered_html = render_template(f"resume_templates/{template}.html", resume=new_resume)
                 try:
-                    generate_resume_thumbnail(new_resume.id, rendered_html)
-                    logging.info("Thumbnail generated successfully")
+                    thumbnail_queue.enqueue(new_resume.id, rendered_html)
+                    logging.info("Thumbnail queued")
                 except Exception as e:
-                    logging.error(f'Thumbnail generation failed: {e}')
+                    logging.error(f'Thumbnail enqueue failed: {e}')
                 
                 # Provide appropriate feedback based on parsing success
                 if parsed_data['raw_text'] and len(parsed_data['raw_text']) > 50:
@@ -1505,6 +2080,22 @@ def clear_prefill_job_title():
     session.pop('prefill_job_title', None)
     return jsonify({'success': True})
 
+@app.route('/api/metrics')
+@login_required
+def metrics_api():
+    """Per-process cache and performance counters"""
+    return jsonify({
+        'generation_cache': generation_cache.stats(),
+        'user_loader': user_cache.stats(),
+        'db_pool': db_pool_metrics.snapshot(db.engine.pool),
+        'adzuna': adzuna.stats(),
+        'job_search': job_search.stats(),
+        'job_matching': job_matcher.stats(),
+        'geoip': ip_locations.stats(),
+        'openai': dict(openai_limiter.stats(), coalesced=openai_single_flight.coalesced,
+                       shared_coalesced=openai_single_flight.shared_coalesced)
+    })
+
 # API Routes for Stripe Configuration
 @app.route('/api/stripe-config')
 def get_stripe_config():
@@ -1569,6 +2160,7 @@ def subscription_success(plan):
             old_plan = current_user.subscription or 'Free'
             current_user.subscription = plan
             db.session.commit()
+            invalidate_user(current_user.id)
             
             # Log successful subscription
             print(f"✅ User {current_user.email} successfully changed subscription: {old_plan} → {plan}")
@@ -1609,6 +2201,7 @@ def create_customer_portal():
             )
             current_user.stripe_customer_id = customer.id
             db.session.commit()
+            invalidate_user(current_user.id)
             customer_id = customer.id
         
         # Create Customer Portal session
@@ -1753,6 +2346,7 @@ def downgrade_subscription():
                     # Update user in database
                     current_user.subscription = 'Free'
                     db.session.commit()
+                    invalidate_user(current_user.id)
                     
                     flash('Your subscription will be cancelled at the end of the current billing period. You will then be on the Free plan.', 'success')
                     
@@ -1764,6 +2358,7 @@ def downgrade_subscription():
                 # User already on free plan
                 current_user.subscription = 'Free'
                 db.session.commit()
+                invalidate_user(current_user.id)
                 flash('You are now on the Free plan.', 'info')
                 
         elif plan in ['Pro', 'Premium']:
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ATS scoring engine over a corpus of synthetic resumes
+of varying length, with and without a target job description
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+from resume.ats import SKILL_LEXICON, analyze_resume_text
+
+RESUMES = int(os.getenv('BENCH_RESUMES', 2000))
+
+HEADERS = ['PROFESSIONAL SUMMARY', 'SKILLS', 'WORK EXPERIENCE', 'EDUCATION', 'PROJECTS', 'CERTIFICATIONS']
+VERBS = ['Led', 'Built', 'Designed', 'Improved', 'Managed', 'Worked on', 'Helped with', 'Responsible for']
+FILLER = ('the team delivered features for customers across several regions while keeping quality high '
+          'and coordinating with product design and operations on planning and releases').split()
+
+
+def synthetic_resume(rng):
+    skills = rng.sample(list(SKILL_LEXICON), rng.randint(3, 20))
+    lines = [f'Candidate {rng.randrange(10 ** 6)}', f'candidate{rng.randrange(1000)}@example.com | (555) 555-{rng.randrange(10000):04d}', '']
+    for header in HEADERS:
+        if rng.random() < 0.2:
+            continue
+        lines.append(header)
+        if header == 'SKILLS':
+            lines.append(', '.join(skills))
+        elif header == 'WORK EXPERIENCE':
+            for _ in range(rng.randint(1, 5)):
+                lines.append(f'Engineer, Company {rng.randrange(500)} (20{rng.randint(10, 23)}-present)')
+                for _ in range(rng.randint(2, 8)):
+                    words = ' '.join(rng.sample(FILLER, rng.randint(6, 14)))
+                    metric = f' by {rng.randint(5, 80)}%' if rng.random() < 0.4 else ''
+                    lines.append(f'- {rng.choice(VERBS)} {words} using {rng.choice(skills)}{metric}')
+        else:
+            lines.extend(' '.join(rng.sample(FILLER, rng.randint(8, 18))) for _ in range(rng.randint(1, 4)))
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def time_scoring(corpus, targets, label):
+    timings = []
+    for text, target in zip(corpus, targets):
+        started = time.perf_counter()
+        analyze_resume_text(text, target)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(f"\n{label}")
+    print(f"  mean {statistics.mean(timings):8.3f} ms")
+    print(f"  p95  {timings[int(len(timings) * 0.95)]:8.3f} ms")
+    print(f"  max  {timings[-1]:8.3f} ms")
+    return timings
+
+
+def main():
+    rng = random.Random(42)
+    corpus = [synthetic_resume(rng) for _ in range(RESUMES)]
+    words = [len(text.split()) for text in corpus]
+    print(f"Scoring {RESUMES} synthetic resumes ({min(words)}-{max(words)} words, mean {statistics.mean(words):.0f})...")
+    descriptions = [
+        f"We are hiring an engineer with {', '.join(rng.sample(list(SKILL_LEXICON), 8))} experience."
+        for _ in range(RESUMES)
+    ]
+    time_scoring(corpus, [None] * RESUMES, 'Without job description')
+    time_scoring(corpus, descriptions, 'With job description')
+    scores = [analyze_resume_text(text)['score'] for text in corpus]
+    print(f"\nScores: min {min(scores)}, median {statistics.median(scores)}, max {max(scores)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark ranking job listings against a resume with TF-IDF cosine
+similarity, with cold and warm term-count caches
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+from resume.ats import SKILL_LEXICON
+from resume.matching import JobMatcher
+
+LISTINGS = int(os.getenv('BENCH_LISTINGS', 500))
+ROUNDS = int(os.getenv('BENCH_ROUNDS', 20))
+
+WORDS = ('design build maintain scalable services collaborate product teams customers reliable '
+         'platform ownership mentoring growth remote benefits healthcare equity fast paced startup '
+         'enterprise clients quality delivery documentation reviews testing deployment').split()
+
+
+def synthetic_text(rng, words):
+    skills = [alias for skill in rng.sample(list(SKILL_LEXICON), 6) for alias in SKILL_LEXICON[skill][:1]]
+    return ' '.join(rng.sample(WORDS, min(words, len(WORDS))) + skills)
+
+
+def main():
+    rng = random.Random(42)
+    resume = '\n'.join(synthetic_text(rng, 20) for _ in range(40))
+    listings = [{'title': synthetic_text(rng, 3), 'description': synthetic_text(rng, 25)} for _ in range(LISTINGS)]
+    matcher = JobMatcher()
+
+    started = time.perf_counter()
+    matcher.score(1, resume, listings)
+    cold = (time.perf_counter() - started) * 1000
+
+    timings = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        matcher.score(1, resume, listings)
+        timings.append((time.perf_counter() - started) * 1000)
+    print(f"Ranking {LISTINGS} listings against a {len(resume.split())}-word resume")
+    print(f"  cold caches  {cold:8.3f} ms")
+    print(f"  warm caches  {statistics.mean(timings):8.3f} ms mean, {max(timings):8.3f} ms max")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-user listing queries with and without the
+(user_id, created_at) and unique (user_id, url) indexes at 100k rows
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROWS = int(os.getenv('BENCH_ROWS', 100000))
+USERS = int(os.getenv('BENCH_USERS', 2000))
+QUERIES = int(os.getenv('BENCH_QUERIES', 500))
+
+
+def build_database():
+    conn = sqlite3.connect(':memory:')
+    conn.executescript('''
+        CREATE TABLE resume (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, title VARCHAR(150),
+                             content TEXT, template VARCHAR(50), created_at DATETIME);
+        CREATE TABLE cover_letter (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, job_title VARCHAR(150),
+                                   content TEXT, created_at DATETIME);
+        CREATE TABLE saved_job (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, title VARCHAR(150),
+                                company VARCHAR(150), location VARCHAR(150), url VARCHAR(300), saved_at DATETIME);
+    ''')
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    resumes, letters, jobs = [], [], []
+    for i in range(ROWS):
+        user_id = rng.randrange(USERS)
+        created = (start + timedelta(minutes=i)).isoformat()
+        resumes.append((user_id, f'Resume {i}', 'x' * 200, 'classic', created))
+        letters.append((user_id, f'Job {i}', 'y' * 200, created))
+        jobs.append((user_id, f'Job {i}', 'Company', 'Remote', f'https://example.com/jobs/{i}', created))
+    conn.executemany('INSERT INTO resume (user_id, title, content, template, created_at) VALUES (?, ?, ?, ?, ?)', resumes)
+    conn.executemany('INSERT INTO cover_letter (user_id, job_title, content, created_at) VALUES (?, ?, ?, ?)', letters)
+    conn.executemany('INSERT INTO saved_job (user_id, title, company, location, url, saved_at) VALUES (?, ?, ?, ?, ?, ?)', jobs)
+    conn.commit()
+    return conn
+
+
+def time_queries(conn, label):
+    rng = random.Random(7)
+    user_ids = [rng.randrange(USERS) for _ in range(QUERIES)]
+    urls = [f'https://example.com/jobs/{rng.randrange(ROWS)}' for _ in range(QUERIES)]
+    timings = {}
+    for name, sql, args in (
+        ('resume by user', 'SELECT id, title FROM resume WHERE user_id = ? ORDER BY created_at DESC', [(u,) for u in user_ids]),
+        ('cover_letter by user', 'SELECT id, job_title FROM cover_letter WHERE user_id = ? ORDER BY created_at DESC', [(u,) for u in user_ids]),
+        ('saved_job by user+url', 'SELECT id FROM saved_job WHERE user_id = ? AND url = ?', list(zip(user_ids, urls))),
+    ):
+        started = time.perf_counter()
+        for params in args:
+            conn.execute(sql, params).fetchall()
+        timings[name] = (time.perf_counter() - started) / len(args) * 1000
+    print(f"\n{label}")
+    for name, ms in timings.items():
+        print(f"  {name:<24} {ms:8.3f} ms/query")
+    return timings
+
+
+def main():
+    print(f"Building {ROWS} rows per table across {USERS} users...")
+    conn = build_database()
+    before = time_queries(conn, 'Without indexes')
+    conn.executescript('''
+        CREATE INDEX ix_resume_user_id_created_at ON resume (user_id, created_at);
+        CREATE INDEX ix_cover_letter_user_id_created_at ON cover_letter (user_id, created_at);
+        CREATE UNIQUE INDEX ux_saved_job_user_id_url ON saved_job (user_id, url);
+    ''')
+    after = time_queries(conn, 'With indexes')
+    print('\nSpeedup')
+    for name in before:
+        print(f"  {name:<24} {before[name] / after[name]:8.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark serial vs page-parallel PDF text extraction
+on generated 1, 5 and 50 page documents
+"""
+
+import os
+import statistics
+import sys
+import time
+
+import fitz  # PyMuPDF
+
+from resume import file_parser
+
+PAGE_COUNTS = [int(n) for n in os.getenv('BENCH_PAGES', '1,5,50').split(',')]
+ROUNDS = int(os.getenv('BENCH_ROUNDS', 5))
+
+LINE = 'Led a cross-functional team delivering a portfolio of analytics products to 40 clients.'
+
+
+def build_pdf(pages):
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        text = '\n'.join(f'{number}.{line} {LINE}' for line in range(55))
+        page.insert_textbox(page.rect + (36, 36, -36, -36), text, fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def time_extraction(data, min_pages):
+    file_parser.PDF_PARALLEL_MIN_PAGES = min_pages
+    timings = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        file_parser.extract_text_from_pdf(data)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    print(f"{file_parser.PDF_EXTRACT_WORKERS} extraction workers, median of {ROUNDS} runs")
+    # Start the pool once so process start-up is not charged to the first document
+    file_parser.PDF_PARALLEL_MIN_PAGES = 1
+    file_parser.extract_text_from_pdf(build_pdf(file_parser.PDF_EXTRACT_WORKERS))
+    print(f"  {'pages':>5} {'serial':>12} {'parallel':>12} {'speedup':>8}")
+    for pages in PAGE_COUNTS:
+        data = build_pdf(pages)
+        serial = time_extraction(data, sys.maxsize)
+        parallel = time_extraction(data, 1)
+        print(f"  {pages:>5} {serial:9.2f} ms {parallel:9.2f} ms {serial / parallel:7.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
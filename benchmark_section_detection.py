@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark section header detection on 10k-line resumes: the old
+per-keyword substring loop vs the precompiled alternation in extract_sections
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+from resume.file_parser import SECTION_HEADER_MAX_LENGTH, SECTION_KEYWORDS, extract_sections, section_header_pattern
+
+LINES = int(os.getenv('BENCH_LINES', 10000))
+ROUNDS = int(os.getenv('BENCH_ROUNDS', 10))
+
+BODY = ['Designed and shipped billing services used by 2M customers',
+        'Reduced p95 latency by 40% by introducing request coalescing',
+        'B.S. Computer Science, State University, 2015',
+        'Python, Go, PostgreSQL, Kubernetes, Terraform',
+        'Mentored five engineers and ran the on-call rotation']
+HEADERS = ['WORK EXPERIENCE', 'Education', 'Technical Skills', 'Projects', 'Certifications']
+
+
+def legacy_is_header(line):
+    for keyword in SECTION_KEYWORDS['en']:
+        if keyword in line.lower() and len(line) < 50:
+            return True
+    return False
+
+
+def legacy_headers(lines):
+    return [line for line in lines if legacy_is_header(line.strip())]
+
+
+def compiled_headers(lines):
+    search = section_header_pattern(('en',)).search
+    return [line for line in lines if len(line.strip()) < SECTION_HEADER_MAX_LENGTH and search(line.strip().lower())]
+
+
+def time_it(fn, lines):
+    timings = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        fn(lines)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    rng = random.Random(42)
+    lines = [rng.choice(HEADERS) if rng.random() < 0.05 else rng.choice(BODY) for _ in range(LINES)]
+    assert compiled_headers(lines) == legacy_headers(lines)
+    legacy = time_it(legacy_headers, lines)
+    compiled = time_it(compiled_headers, lines)
+    full = time_it(extract_sections, lines)
+    print(f"{LINES} lines, median of {ROUNDS} runs")
+    print(f"  keyword loop       {legacy:8.2f} ms")
+    print(f"  compiled pattern   {compiled:8.2f} ms  ({legacy / compiled:.1f}x)")
+    print(f"  extract_sections   {full:8.2f} ms  (detection plus section assembly)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
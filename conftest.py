@@ -1,5 +1,49 @@
+import os
+import uuid
+
 import pytest
 
 @pytest.fixture
 def sample_fixture():
-    return "Hello, World!"
\ No newline at end of file
+    return "Hello, World!"
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """The Flask app imported against a throwaway SQLite database and temp cache paths"""
+    pytest.importorskip('flask_sqlalchemy')
+    tmp = tmp_path_factory.mktemp('app')
+    os.environ.update({
+        'SECRET_KEY': 'test',
+        'STRIPE_SECRET_KEY': 'sk_test',
+        'STRIPE_PUBLISHABLE_KEY': 'pk_test',
+        'OPENAI_API_KEY': 'test',
+        'SUPABASE_DB_URL': f"sqlite:///{tmp / 'app.db'}",
+        'ADZUNA_CACHE_PATH': str(tmp / 'adzuna_cache.db'),
+        'GENERATION_CACHE_PATH': str(tmp / 'generation_cache.db'),
+        'OPENAI_LIMITS_PATH': str(tmp / 'openai_limits.db'),
+        'PDF_CACHE_DIR': str(tmp / 'pdf_cache'),
+        'USER_CACHE_EPOCH_PATH': str(tmp / 'users.epoch'),
+        'JOB_INDEX_PATH': str(tmp / 'job_index.db'),
+        'THUMBNAIL_QUEUE_PATH': str(tmp / 'thumbnail_queue.db'),
+        'GEOIP_DB_PATH': str(tmp / 'missing.csv'),
+    })
+    import app as module
+    with module.app.app_context():
+        module.db.create_all()
+    return module
+
+@pytest.fixture
+def user(app_module):
+    with app_module.app.app_context():
+        account = app_module.User(email=f"{uuid.uuid4().hex}@example.com", password='x', name='Test User')
+        app_module.db.session.add(account)
+        app_module.db.session.commit()
+        return account.id
+
+@pytest.fixture
+def client(app_module, user):
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user)
+        session['_fresh'] = True
+    return client
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Download the DB-IP "IP to City Lite" database used for job search locations
+Fetches this month's gzipped CSV (falling back to last month's, which DB-IP
+keeps until the new one is published) to GEOIP_DB_PATH. Run from the build
+step; a failed download leaves any existing file in place and does not fail
+the build, since the app falls back to a default location without it.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date
+
+import requests
+
+DBIP_URL = 'https://download.db-ip.com/free/dbip-city-lite-{month}.csv.gz'
+DEFAULT_PATH = os.path.join('instance', 'dbip-city-lite.csv.gz')
+
+
+def candidate_months(today):
+    previous = date(today.year - 1, 12, 1) if today.month == 1 else date(today.year, today.month - 1, 1)
+    return [today.strftime('%Y-%m'), previous.strftime('%Y-%m')]
+
+
+def download(url, path):
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    with requests.get(url, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=1 << 20):
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def main():
+    path = os.getenv('GEOIP_DB_PATH', DEFAULT_PATH)
+    for month in candidate_months(date.today()):
+        url = DBIP_URL.format(month=month)
+        try:
+            download(url, path)
+        except requests.RequestException as e:
+            print(f"Could not download {url}: {e}")
+            continue
+        print(f"Saved {url} to {path} ({os.path.getsize(path) // 1024} KiB)")
+        return 0
+    print(f"WARNING: no IP location database downloaded; job search will use the default location"
+          f"{' (keeping the existing file)' if os.path.exists(path) else ''}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
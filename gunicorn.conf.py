@@ -0,0 +1,15 @@
+"""
+Gunicorn settings
+Generation endpoints stream server-sent events for as long as the model is
+writing, so workers are threaded: an open stream holds one thread, not a
+whole worker, and the worker timeout is not tied to request length.
+"""
+
+import os
+
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
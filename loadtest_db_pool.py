@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Load test for the database connection pool settings
+Runs concurrent workers that hold connections against DATABASE_URL (a local
+Postgres container, e.g. `docker run -p 5432:5432 -e POSTGRES_PASSWORD=postgres postgres`,
+or a throwaway SQLite file by default) and reports checkout wait times and timeouts
+using the same engine options as the app (DB_POOL_* variables).
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from resume.db_pool import PoolMetrics, engine_options
+
+THREADS = int(os.getenv('LOADTEST_THREADS', 32))
+QUERIES_PER_THREAD = int(os.getenv('LOADTEST_QUERIES', 50))
+HOLD_SECONDS = float(os.getenv('LOADTEST_HOLD_SECONDS', 0.01))
+
+
+def run(database_url):
+    metrics = PoolMetrics()
+    engine = create_engine(database_url, **engine_options(database_url, metrics))
+    errors = []
+
+    def worker():
+        for _ in range(QUERIES_PER_THREAD):
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text('SELECT 1')).scalar()
+                    time.sleep(HOLD_SECONDS)
+            except Exception as e:
+                errors.append(e)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    snapshot = metrics.snapshot(engine.pool)
+    total = THREADS * QUERIES_PER_THREAD
+    print(f"Database:        {engine.url.render_as_string(hide_password=True)}")
+    print(f"Workers:         {THREADS} x {QUERIES_PER_THREAD} queries, holding {HOLD_SECONDS * 1000:.0f} ms")
+    print(f"Pool:            size={snapshot['pool_size']} overflow={engine.pool._max_overflow}")
+    print(f"Throughput:      {total / elapsed:.0f} queries/s")
+    print(f"Checkouts:       {snapshot['checkouts']}  timeouts: {snapshot['timeouts']}")
+    print(f"Checkout wait:   avg {snapshot['avg_wait_ms']} ms  max {snapshot['max_wait_ms']} ms")
+    print(f"Errors:          {len(errors)}")
+    engine.dispose()
+    return 0 if not errors else 1
+
+
+if __name__ == '__main__':
+    url = os.getenv('DATABASE_URL') or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'loadtest.db')}"
+    sys.exit(run(url))
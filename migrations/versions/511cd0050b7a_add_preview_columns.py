@@ -0,0 +1,65 @@
+"""Add stored preview columns to resume and cover_letter
+
+Revision ID: 511cd0050b7a
+Revises: 5b980a20cb71
+Create Date: 2026-10-18 12:21:09.774310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '511cd0050b7a'
+down_revision = '5b980a20cb71'
+branch_labels = None
+depends_on = None
+
+PREVIEW_LENGTH = 300
+BATCH_SIZE = 500
+
+
+def _backfill(table, with_word_count=False):
+    bind = op.get_bind()
+    meta = sa.MetaData()
+    columns = [sa.Column('id', sa.Integer), sa.Column('content', sa.Text), sa.Column('preview', sa.String(PREVIEW_LENGTH))]
+    if with_word_count:
+        columns.append(sa.Column('word_count', sa.Integer))
+    rows_table = sa.Table(table, meta, *columns)
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(rows_table.c.id, rows_table.c.content)
+            .where(rows_table.c.id > last_id)
+            .order_by(rows_table.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        for row_id, content in rows:
+            values = {'preview': ' '.join((content or '').split())[:PREVIEW_LENGTH]}
+            if with_word_count:
+                values['word_count'] = len((content or '').split())
+            bind.execute(rows_table.update().where(rows_table.c.id == row_id).values(**values))
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    with op.batch_alter_table('resume', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('preview', sa.String(length=PREVIEW_LENGTH), nullable=True))
+
+    with op.batch_alter_table('cover_letter', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('preview', sa.String(length=PREVIEW_LENGTH), nullable=True))
+        batch_op.add_column(sa.Column('word_count', sa.Integer(), nullable=True))
+
+    _backfill('resume')
+    _backfill('cover_letter', with_word_count=True)
+
+
+def downgrade():
+    with op.batch_alter_table('cover_letter', schema=None) as batch_op:
+        batch_op.drop_column('word_count')
+        batch_op.drop_column('preview')
+
+    with op.batch_alter_table('resume', schema=None) as batch_op:
+        batch_op.drop_column('preview')
@@ -0,0 +1,43 @@
+"""Add per-user listing indexes and unique saved_job (user_id, url)
+
+Revision ID: 5b980a20cb71
+Revises: 47b707da6a83
+Create Date: 2026-10-18 11:40:53.208117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b980a20cb71'
+down_revision = '47b707da6a83'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('resume', schema=None) as batch_op:
+        batch_op.create_index('ix_resume_user_id_created_at', ['user_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('cover_letter', schema=None) as batch_op:
+        batch_op.create_index('ix_cover_letter_user_id_created_at', ['user_id', 'created_at'], unique=False)
+
+    # Drop duplicate saves (keeping the first) so the unique index can be built
+    op.execute(
+        'DELETE FROM saved_job WHERE id NOT IN '
+        '(SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM saved_job GROUP BY user_id, url) AS keepers)'
+    )
+    with op.batch_alter_table('saved_job', schema=None) as batch_op:
+        batch_op.create_index('ux_saved_job_user_id_url', ['user_id', 'url'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('saved_job', schema=None) as batch_op:
+        batch_op.drop_index('ux_saved_job_user_id_url')
+
+    with op.batch_alter_table('cover_letter', schema=None) as batch_op:
+        batch_op.drop_index('ix_cover_letter_user_id_created_at')
+
+    with op.batch_alter_table('resume', schema=None) as batch_op:
+        batch_op.drop_index('ix_resume_user_id_created_at')
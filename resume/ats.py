@@ -0,0 +1,262 @@
+"""
+Deterministic ATS analysis
+Scores resume text on keyword coverage, section completeness and formatting
+the way applicant tracking systems parse it. Everything is rule based over a
+curated skill lexicon, so a resume scores in milliseconds without an LLM.
+"""
+
+import re
+
+# Canonical skill -> aliases as they appear in resumes and job descriptions. Only aliases
+# are matched, so names that are also ordinary words or units (Go, Swift, Rust, Excel, Sales,
+# ML) need a less ambiguous alias.
+SKILL_LEXICON = {
+    'Python': ['python'],
+    'Java': ['java'],
+    'JavaScript': ['javascript', 'js', 'es6'],
+    'TypeScript': ['typescript'],
+    'C++': ['c++', 'cpp'],
+    'C#': ['c#', 'csharp'],
+    'Go': ['golang'],
+    'Ruby': ['ruby'],
+    'PHP': ['php'],
+    'Swift': ['swiftui', 'swift ui', 'swift lang', 'swift language', 'swift programming'],
+    'Kotlin': ['kotlin'],
+    'Rust': ['rustlang', 'rust lang', 'rust language', 'rust programming'],
+    'SQL': ['sql'],
+    'PostgreSQL': ['postgresql', 'postgres'],
+    'MySQL': ['mysql'],
+    'MongoDB': ['mongodb', 'mongo'],
+    'Redis': ['redis'],
+    'HTML': ['html', 'html5'],
+    'CSS': ['css', 'css3'],
+    'React': ['react', 'react.js', 'reactjs'],
+    'Angular': ['angular', 'angularjs'],
+    'Vue': ['vue', 'vue.js', 'vuejs'],
+    'Node.js': ['node.js', 'nodejs'],
+    'Django': ['django'],
+    'Flask': ['flask'],
+    'Spring': ['spring boot', 'spring framework', 'spring mvc'],
+    'REST APIs': ['restful', 'rest api', 'rest apis'],
+    'GraphQL': ['graphql'],
+    'AWS': ['aws', 'amazon web services'],
+    'Azure': ['azure'],
+    'Google Cloud': ['gcp', 'google cloud'],
+    'Docker': ['docker'],
+    'Kubernetes': ['kubernetes', 'k8s'],
+    'Terraform': ['terraform'],
+    'CI/CD': ['ci/cd', 'continuous integration', 'continuous delivery', 'jenkins', 'github actions'],
+    'Git': ['git', 'github', 'gitlab'],
+    'Linux': ['linux', 'unix'],
+    'Microservices': ['microservices', 'microservice'],
+    'Machine Learning': ['machine learning'],
+    'Deep Learning': ['deep learning', 'neural networks'],
+    'Data Analysis': ['data analysis', 'data analytics', 'analytics'],
+    'Data Visualization': ['data visualization', 'tableau', 'power bi'],
+    'Pandas': ['pandas'],
+    'NumPy': ['numpy'],
+    'TensorFlow': ['tensorflow'],
+    'PyTorch': ['pytorch'],
+    'Spark': ['spark', 'pyspark'],
+    'Excel': ['microsoft excel', 'ms excel', 'excel spreadsheets', 'spreadsheets', 'pivot tables', 'vlookup'],
+    'Statistics': ['statistics', 'statistical analysis'],
+    'Testing': ['unit testing', 'integration testing', 'automated testing', 'test automation', 'pytest', 'junit', 'selenium', 'qa'],
+    'Agile': ['agile', 'scrum', 'kanban'],
+    'Project Management': ['project management', 'pmp'],
+    'Product Management': ['product management', 'roadmap', 'roadmaps'],
+    'Jira': ['jira'],
+    'Salesforce': ['salesforce', 'crm'],
+    'SEO': ['seo', 'search engine optimization'],
+    'Digital Marketing': ['digital marketing', 'social media marketing', 'email marketing'],
+    'Content Writing': ['content writing', 'copywriting', 'content strategy'],
+    'Sales': ['b2b sales', 'inside sales', 'outside sales', 'sales pipeline', 'business development', 'lead generation'],
+    'Customer Service': ['customer service', 'customer support', 'customer success'],
+    'Accounting': ['accounting', 'bookkeeping', 'quickbooks', 'gaap'],
+    'Financial Analysis': ['financial analysis', 'financial modeling', 'forecasting', 'budgeting'],
+    'Figma': ['figma'],
+    'UX Design': ['ux', 'user experience', 'ux design', 'wireframing', 'prototyping'],
+    'UI Design': ['ui design', 'user interface', 'ui/ux'],
+    'Adobe Creative Suite': ['photoshop', 'illustrator', 'indesign', 'adobe creative suite'],
+    'Leadership': ['leadership', 'team lead', 'mentoring', 'mentored'],
+    'Communication': ['communication', 'presentations', 'public speaking'],
+    'Problem Solving': ['problem solving', 'troubleshooting'],
+    'Stakeholder Management': ['stakeholder management', 'stakeholders'],
+    'Negotiation': ['negotiation'],
+    'Nursing': ['patient care', 'nursing', 'emr', 'ehr'],
+    'Security': ['cybersecurity', 'information security', 'application security', 'network security', 'penetration testing', 'siem'],
+    'Networking': ['tcp/ip', 'dns', 'networking'],
+}
+
+# Section -> header aliases; required sections weigh more in completeness
+SECTION_ALIASES = {
+    'summary': ['summary', 'professional summary', 'profile', 'objective', 'about me'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment', 'employment history', 'work history'],
+    'education': ['education', 'academic background', 'qualifications'],
+    'skills': ['skills', 'technical skills', 'core competencies', 'expertise', 'key skills'],
+    'projects': ['projects', 'key projects'],
+    'certifications': ['certifications', 'licenses', 'certificates', 'awards', 'achievements', 'accomplishments'],
+}
+SECTION_WEIGHTS = {'experience': 3, 'education': 2, 'skills': 2, 'summary': 1, 'projects': 0.5, 'certifications': 0.5}
+
+ACTION_VERBS = frozenset('''
+    achieved analyzed architected automated built collaborated created delivered designed developed
+    drove established executed grew implemented improved increased launched led managed mentored
+    migrated negotiated optimized organized owned planned reduced resolved scaled shipped spearheaded
+    streamlined supervised trained
+'''.split())
+
+SCORE_WEIGHTS = {'keywords': 0.4, 'sections': 0.35, 'formatting': 0.25}
+# Without a job description, coverage is measured as breadth against this many skills
+TARGET_SKILL_COUNT = 10
+IDEAL_WORD_RANGE = (250, 1000)
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+EMAIL_RE = re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]+')
+PHONE_RE = re.compile(r'(?:\+?\d[\s().-]*){10,}')
+BULLET_RE = re.compile(r'^\s*(?:[-*•▪●–]|\d+[.)])\s+')
+METRIC_RE = re.compile(r'\d+(?:[.,]\d+)?\s*(?:%|percent|k\b|m\b|x\b)|\$\s?\d', re.IGNORECASE)
+FIRST_PERSON_RE = re.compile(r'\b(?:i|me|my)\b', re.IGNORECASE)
+HEADER_MAX_LENGTH = 50
+
+
+def _build_phrase_index(lexicon):
+    index = {}
+    for skill, aliases in lexicon.items():
+        for alias in aliases:
+            index[tuple(tokenize(alias))] = skill
+    return index, max(len(phrase) for phrase in index)
+
+
+def tokenize(text):
+    """Lowercase word tokens, keeping symbols that matter in skill names (c++, c#, node.js)"""
+    return [token.rstrip('.') for token in TOKEN_RE.findall(text.lower())]
+
+
+def extract_skills(text, phrase_index=None):
+    """Canonical skills mentioned in text, longest alias wins"""
+    index, max_length = phrase_index or PHRASE_INDEX
+    tokens = tokenize(text)
+    found = set()
+    i = 0
+    while i < len(tokens):
+        for length in range(min(max_length, len(tokens) - i), 0, -1):
+            skill = index.get(tuple(tokens[i:i + length]))
+            if skill:
+                found.add(skill)
+                i += length
+                break
+        else:
+            i += 1
+    return found
+
+
+PHRASE_INDEX = _build_phrase_index(SKILL_LEXICON)
+SECTION_HEADER_RE = re.compile(
+    r'^[\s#*_\-=:|]*(' + '|'.join(
+        re.escape(alias) for aliases in SECTION_ALIASES.values()
+        for alias in sorted(aliases, key=len, reverse=True)
+    ) + r')[\s#*_\-=:|]*$',
+    re.IGNORECASE
+)
+SECTION_BY_ALIAS = {alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+
+def find_sections(lines):
+    """Map each section found to the lines under its header"""
+    sections = {}
+    current = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        match = SECTION_HEADER_RE.match(stripped) if len(stripped) < HEADER_MAX_LENGTH else None
+        if match:
+            current = SECTION_BY_ALIAS[match.group(1).lower()]
+            sections.setdefault(current, [])
+        elif current:
+            sections[current].append(stripped)
+    return sections
+
+
+def _keyword_score(resume_skills, target_text):
+    if target_text:
+        target_skills = extract_skills(target_text)
+        if target_skills:
+            matched = resume_skills & target_skills
+            return len(matched) / len(target_skills), sorted(target_skills - resume_skills)
+    return min(len(resume_skills) / TARGET_SKILL_COUNT, 1.0), []
+
+
+def _formatting_checks(text, lines, sections, word_count):
+    experience = sections.get('experience', [])
+    bullets = [line for line in experience if BULLET_RE.match(line)]
+    bullet_text = [BULLET_RE.sub('', line) for line in bullets]
+    action_led = [line for line in bullet_text if line.split() and line.split()[0].lower().strip(',.') in ACTION_VERBS]
+    quantified = [line for line in bullet_text if METRIC_RE.search(line)]
+    low, high = IDEAL_WORD_RANGE
+    return {
+        'contact_email': bool(EMAIL_RE.search(text)),
+        'contact_phone': bool(PHONE_RE.search(text)),
+        'length': low <= word_count <= high,
+        'bullets': len(bullets) >= 3,
+        'action_verbs': bool(bullets) and len(action_led) * 2 >= len(bullets),
+        'quantified_results': len(quantified) >= 2,
+        'no_tables': sum(1 for line in lines if line.count('|') >= 2 or line.count('\t') >= 2) == 0,
+        'no_first_person': len(FIRST_PERSON_RE.findall(text)) <= 2,
+    }
+
+
+RECOMMENDATIONS = {
+    'contact_email': 'Add an email address so recruiters can contact you.',
+    'contact_phone': 'Add a phone number to your contact details.',
+    'length': 'Aim for roughly 250 to 1000 words; ATS and recruiters skim very short or very long resumes.',
+    'bullets': 'List responsibilities under Experience as bullet points rather than paragraphs.',
+    'action_verbs': 'Start experience bullets with strong action verbs such as "Led", "Built" or "Improved".',
+    'quantified_results': 'Quantify achievements with numbers, percentages or dollar amounts.',
+    'no_tables': 'Avoid tables and column layouts; many ATS parsers read them out of order.',
+    'no_first_person': 'Drop first-person pronouns ("I", "my") and write in a concise implied first person.',
+}
+
+
+def analyze_resume_text(text, target_text=None):
+    """Score resume text out of 100 with a per-area breakdown and recommendations
+
+    target_text is an optional job description or title; when it names skills,
+    keyword coverage is measured against them instead of overall skill breadth.
+    """
+    text = text or ''
+    lines = text.splitlines()
+    word_count = len(text.split())
+    resume_skills = extract_skills(text)
+    keyword_score, missing_keywords = _keyword_score(resume_skills, target_text)
+
+    sections = find_sections(lines)
+    total_weight = sum(SECTION_WEIGHTS.values())
+    section_score = sum(weight for name, weight in SECTION_WEIGHTS.items() if sections.get(name)) / total_weight
+    missing_sections = [name for name, weight in SECTION_WEIGHTS.items() if weight >= 1 and not sections.get(name)]
+
+    checks = _formatting_checks(text, lines, sections, word_count)
+    formatting_score = sum(checks.values()) / len(checks)
+
+    breakdown = {'keywords': keyword_score, 'sections': section_score, 'formatting': formatting_score}
+    score = round(100 * sum(SCORE_WEIGHTS[area] * value for area, value in breakdown.items()))
+
+    recommendations = []
+    if missing_keywords:
+        recommendations.append(f"Add keywords from the job description: {', '.join(missing_keywords[:8])}.")
+    elif not target_text and len(resume_skills) < TARGET_SKILL_COUNT:
+        recommendations.append('List more of your relevant tools and skills so ATS keyword filters can match them.')
+    for name in missing_sections:
+        recommendations.append(f"Add a clearly labelled {name.title()} section.")
+    recommendations.extend(RECOMMENDATIONS[name] for name, passed in checks.items() if not passed)
+
+    return {
+        'score': score,
+        'breakdown': {area: round(100 * value) for area, value in breakdown.items()},
+        'skills': sorted(resume_skills),
+        'missing_keywords': missing_keywords,
+        'missing_sections': missing_sections,
+        'checks': checks,
+        'word_count': word_count,
+        'recommendations': recommendations,
+    }
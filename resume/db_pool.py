@@ -0,0 +1,108 @@
+"""
+Database connection pool configuration and metrics
+Engine options come from the environment so pool sizing can be tuned per
+deployment, and a QueuePool subclass records how long checkouts wait.
+"""
+
+import os
+import time
+import threading
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Counters for connection checkouts and the time spent waiting for them"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, waited, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def snapshot(self, pool=None):
+        with self._lock:
+            data = {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'avg_wait_ms': round(self.wait_seconds * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                'max_wait_ms': round(self.max_wait_seconds * 1000, 3),
+            }
+        if pool is not None and hasattr(pool, 'checkedout'):
+            data.update({
+                'pool_size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'overflow': pool.overflow(),
+                'idle': pool.checkedin(),
+            })
+        return data
+
+
+def timed_queue_pool(metrics):
+    """Build a QueuePool class that reports checkout wait time to metrics"""
+
+    class TimedQueuePool(QueuePool):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except exc.TimeoutError:
+                metrics.record(time.perf_counter() - started, timed_out=True)
+                raise
+            metrics.record(time.perf_counter() - started)
+            return connection
+
+    return TimedQueuePool
+
+
+def statement_timeout_listener(timeout_ms):
+    """Pool connect listener that sets a session statement_timeout on each new Postgres connection
+
+    Sent as a plain SET rather than the libpq "options" startup parameter,
+    which PgBouncer and managed poolers reject. Autocommit keeps the SET from
+    being rolled back with the connection's first transaction.
+    """
+
+    def on_connect(dbapi_connection, connection_record):
+        autocommit = dbapi_connection.autocommit
+        dbapi_connection.autocommit = True
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f'SET statement_timeout = {int(timeout_ms)}')
+        finally:
+            cursor.close()
+            dbapi_connection.autocommit = autocommit
+
+    return on_connect
+
+
+def engine_options(database_url, metrics):
+    """SQLAlchemy engine options for database_url, tuned from DB_POOL_* variables"""
+    poolclass = timed_queue_pool(metrics)
+    options = {
+        'poolclass': poolclass,
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.getenv('DB_POOL_MAX_OVERFLOW', 10)),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+        # Supabase's pooler drops idle connections, so recycle before that and ping on checkout
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 280)),
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes'),
+    }
+    # Behind a transaction-mode pooler a session SET does not stick; set DB_STATEMENT_TIMEOUT_MS=0
+    # there and configure the timeout on the database role instead
+    statement_timeout_ms = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 15000))
+    if database_url.startswith(('postgres://', 'postgresql')) and statement_timeout_ms > 0:
+        # poolclass is built per call, so the listener applies to this engine's pool only
+        event.listen(poolclass, 'connect', statement_timeout_listener(statement_timeout_ms))
+    return options
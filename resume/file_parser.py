@@ -1,47 +1,169 @@
 """
 File parsing utilities for resume uploads
 Supports PDF, DOC, and DOCX files
+Uploads are parsed from memory; only non-seekable streams larger than
+UPLOAD_SPOOL_MAX_MEMORY are spooled to an anonymous temporary file.
+Long PDFs are split into page ranges extracted in a process pool.
 """
 
+import io
 import os
+import shutil
 import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from resume.process_pool import pool_context
 import fitz  # PyMuPDF
 from PyPDF2 import PdfReader
 from docx import Document
 import logging
 import re
 
-def extract_text_from_pdf(file_path):
-    """Extract text from PDF using PyMuPDF (more reliable)"""
+UPLOAD_SPOOL_MAX_MEMORY = int(os.getenv('UPLOAD_SPOOL_MAX_MEMORY', 5 * 1024 * 1024))
+# PDFs with fewer pages than this are extracted serially; process start-up would cost more than it saves
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', 20))
+PDF_EXTRACT_WORKERS = int(os.getenv('PDF_EXTRACT_WORKERS', min(4, os.cpu_count() or 1)))
+
+_extract_executor = None
+_extract_pid = None
+_extract_lock = threading.Lock()
+
+def open_upload(file_obj):
+    """Return a seekable binary stream for bytes, a werkzeug FileStorage or a file object"""
+    if isinstance(file_obj, (bytes, bytearray, memoryview)):
+        return io.BytesIO(file_obj)
+    stream = getattr(file_obj, 'stream', file_obj)
+    if getattr(stream, 'seekable', lambda: False)():
+        stream.seek(0)
+        return stream
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_MEMORY)
+    shutil.copyfileobj(stream, spool)
+    spool.seek(0)
+    return spool
+
+def _read_bytes(source):
+    """PDF bytes from bytes, a path or a binary stream"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            return file.read()
+    source.seek(0)
+    return source.read()
+
+def _get_extract_executor():
+    # Pools cannot be shared across fork, so each gunicorn worker builds its own
+    global _extract_executor, _extract_pid
+    with _extract_lock:
+        if _extract_executor is None or _extract_pid != os.getpid():
+            _extract_executor = ProcessPoolExecutor(max_workers=PDF_EXTRACT_WORKERS, mp_context=pool_context())
+            _extract_pid = os.getpid()
+        return _extract_executor
+
+def _discard_extract_executor(executor):
+    """Drop a broken pool so the next long PDF starts a fresh one"""
+    global _extract_executor
+    with _extract_lock:
+        if _extract_executor is not executor:
+            return
+        _extract_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+def _extract_page_range(data, start, stop):
+    """Worker entry point: text of pages [start, stop) of a PDF given as bytes"""
+    doc = fitz.open(stream=data, filetype='pdf')
     try:
-        doc = fitz.open(file_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
+        return [doc[number].get_text() for number in range(start, stop)]
+    finally:
         doc.close()
-        return text.strip()
+
+def page_ranges(page_count, shards):
+    """Split page_count pages into at most shards contiguous [start, stop) ranges"""
+    size = max(-(-page_count // max(shards, 1)), 1)
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+def _parallel_pages(data, page_count):
+    """Yield page text from the process pool, in page order"""
+    executor = _get_extract_executor()
+    futures = []
+    try:
+        for start, stop in page_ranges(page_count, PDF_EXTRACT_WORKERS):
+            futures.append(executor.submit(_extract_page_range, data, start, stop))
+        for future in futures:
+            yield from future.result()
+    except BrokenProcessPool:
+        _discard_extract_executor(executor)
+        raise
+    finally:
+        for future in futures:
+            future.cancel()
+
+def _serial_pages(doc, start=0):
+    try:
+        for number in range(start, doc.page_count):
+            yield doc[number].get_text()
+    finally:
+        doc.close()
+
+def _pymupdf_pages(data, doc):
+    """Page text of an open document, sharded across processes for long documents"""
+    if PDF_EXTRACT_WORKERS < 2 or doc.page_count < PDF_PARALLEL_MIN_PAGES:
+        yield from _serial_pages(doc)
+        return
+    page_count = doc.page_count
+    doc.close()
+    done = 0
+    try:
+        for text in _parallel_pages(data, page_count):
+            yield text
+            done += 1
+        return
+    except (BrokenProcessPool, OSError) as e:
+        logging.error(f"Parallel PDF extraction failed, continuing serially: {e}")
+    yield from _serial_pages(fitz.open(stream=data, filetype='pdf'), start=done)
+
+def _pypdf2_pages(data):
+    reader = PdfReader(io.BytesIO(data))
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+def iter_pdf_text(source):
+    """Yield PDF text page by page, falling back to PyPDF2 if PyMuPDF cannot open it"""
+    data = _read_bytes(source)
+    try:
+        doc = fitz.open(stream=data, filetype='pdf')
+    except Exception as e:
+        logging.error(f"Error opening PDF with PyMuPDF: {e}")
+        yield from _pypdf2_pages(data)
+        return
+    yield from _pymupdf_pages(data, doc)
+
+def iter_docx_text(source):
+    """Yield DOCX text paragraph by paragraph"""
+    if not isinstance(source, (str, os.PathLike)):
+        source.seek(0)
+    for paragraph in Document(source).paragraphs:
+        yield paragraph.text + "\n"
+
+def extract_text_from_pdf(source):
+    """Extract text from a PDF path or stream using PyMuPDF (more reliable)"""
+    data = _read_bytes(source)
+    try:
+        return "".join(_pymupdf_pages(data, fitz.open(stream=data, filetype='pdf'))).strip()
     except Exception as e:
         logging.error(f"Error extracting text from PDF with PyMuPDF: {e}")
         # Fallback to PyPDF2
         try:
-            with open(file_path, 'rb') as file:
-                reader = PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text()
-                return text.strip()
+            return "".join(_pypdf2_pages(data)).strip()
         except Exception as e2:
             logging.error(f"Error extracting text from PDF with PyPDF2: {e2}")
             return None
 
-def extract_text_from_docx(file_path):
-    """Extract text from DOCX file"""
+def extract_text_from_docx(source):
+    """Extract text from a DOCX path or stream"""
     try:
-        doc = Document(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text.strip()
+        return "".join(iter_docx_text(source)).strip()
     except Exception as e:
         logging.error(f"Error extracting text from DOCX: {e}")
         return None
@@ -54,26 +176,38 @@ def extract_text_from_doc(file_path):
     logging.warning(f"DOC file parsing not fully supported: {file_path}")
     return "DOC file uploaded. Please manually enter your resume content below."
 
+def iter_resume_text(file_obj, filename):
+    """
+    Yield an uploaded resume's text one PDF page or DOCX paragraph at a time
+    Callers that only need the beginning (a title, a preview, a language
+    check) can stop iterating early and the remaining pages are never extracted
+    """
+    source = open_upload(file_obj)
+    file_ext = filename.lower().split('.')[-1]
+    if file_ext == 'pdf':
+        yield from iter_pdf_text(source)
+    elif file_ext == 'docx':
+        yield from iter_docx_text(source)
+    elif file_ext == 'doc':
+        yield extract_text_from_doc(filename)
+
 def parse_resume_file(file_obj, filename):
     """
     Parse uploaded resume file and extract text content
+    file_obj may be a FileStorage, a binary stream or bytes
     Returns structured resume data
     """
-    # Create temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as temp_file:
-        file_obj.save(temp_file.name)
-        temp_path = temp_file.name
-    
     try:
+        source = open_upload(file_obj)
         # Determine file type and extract text
         file_ext = filename.lower().split('.')[-1]
         
         if file_ext == 'pdf':
-            raw_text = extract_text_from_pdf(temp_path)
+            raw_text = extract_text_from_pdf(source)
         elif file_ext == 'docx':
-            raw_text = extract_text_from_docx(temp_path)
+            raw_text = extract_text_from_docx(source)
         elif file_ext == 'doc':
-            raw_text = extract_text_from_doc(temp_path)
+            raw_text = extract_text_from_doc(filename)
         else:
             raw_text = None
         
@@ -99,13 +233,6 @@ def parse_resume_file(file_obj, filename):
             'contact_info': {},
             'sections': []
         }
-    
-    finally:
-        # Clean up temporary file
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
 
 def parse_resume_text(text):
     """
@@ -174,21 +301,80 @@ def extract_contact_info(text):
     
     return contact_info
 
-def extract_sections(lines):
-    """Extract different sections from resume lines"""
-    sections = []
-    current_section = None
-    current_content = []
-    
-    # Common section headers
-    section_keywords = [
+# Section header keywords per locale; a short line containing any of them starts a section
+SECTION_KEYWORDS = {
+    'en': [
         'experience', 'work experience', 'employment', 'professional experience',
         'education', 'academic background', 'qualifications',
         'skills', 'technical skills', 'core competencies', 'expertise',
         'summary', 'professional summary', 'profile', 'objective',
         'projects', 'achievements', 'accomplishments',
         'certifications', 'licenses', 'awards'
-    ]
+    ],
+    'es': [
+        'experiencia', 'experiencia laboral', 'experiencia profesional', 'educación', 'formación',
+        'habilidades', 'competencias', 'resumen', 'perfil', 'objetivo', 'proyectos', 'logros',
+        'certificaciones', 'idiomas'
+    ],
+    'fr': [
+        'expérience', 'expérience professionnelle', 'formation', 'éducation', 'compétences',
+        'résumé', 'profil', 'objectif', 'projets', 'réalisations', 'certifications', 'langues'
+    ],
+    'de': [
+        'berufserfahrung', 'erfahrung', 'ausbildung', 'bildung', 'kenntnisse', 'fähigkeiten',
+        'kompetenzen', 'profil', 'zusammenfassung', 'projekte', 'zertifikate', 'sprachen'
+    ],
+}
+SECTION_LOCALES = tuple(os.getenv('RESUME_SECTION_LOCALES', 'en').split(','))
+SECTION_HEADER_MAX_LENGTH = 50
+
+_section_patterns = {}
+
+def register_section_keywords(locale, keywords):
+    """Add header keywords for a locale, e.g. from a deployment that serves another market"""
+    SECTION_KEYWORDS.setdefault(locale, [])
+    SECTION_KEYWORDS[locale].extend(k for k in keywords if k not in SECTION_KEYWORDS[locale])
+    _section_patterns.clear()
+
+def _trie_alternation(keywords):
+    """Regex alternation with shared prefixes factored out, e.g. pro(?:file|jects)
+
+    The re module tries every branch of a flat alternation at each position;
+    factoring prefixes lets a mismatch on the first character skip a whole group.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+def section_header_pattern(locales=None):
+    """One compiled alternation of every keyword for the given locales, matched against lowercased lines"""
+    key = tuple(locales or SECTION_LOCALES)
+    pattern = _section_patterns.get(key)
+    if pattern is None:
+        keywords = {k.lower() for locale in key for k in SECTION_KEYWORDS.get(locale, [])}
+        # Lowercasing each line once is much faster than re.IGNORECASE over the alternation
+        pattern = re.compile(_trie_alternation(keywords) if keywords else r'(?!)')
+        _section_patterns[key] = pattern
+    return pattern
+
+def extract_sections(lines, locales=None):
+    """Extract different sections from resume lines"""
+    sections = []
+    current_section = None
+    current_content = []
+    header_search = section_header_pattern(locales).search
     
     for line in lines:
         line = line.strip()
@@ -196,11 +382,7 @@ def extract_sections(lines):
             continue
             
         # Check if this line is a section header
-        is_section_header = False
-        for keyword in section_keywords:
-            if keyword in line.lower() and len(line) < 50:
-                is_section_header = True
-                break
+        is_section_header = len(line) < SECTION_HEADER_MAX_LENGTH and header_search(line.lower()) is not None
         
         if is_section_header:
             # Save previous section
@@ -0,0 +1,158 @@
+"""
+Cache for OpenAI generations
+Completions are keyed on model plus a normalized prompt and expire after a
+TTL. The in-process LRU backend suits a single worker; the SQLite backend is
+shared by every gunicorn worker on the host.
+"""
+
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+
+def normalize_prompt(prompt):
+    """Collapse whitespace and case so equivalent prompts share a key"""
+    return re.sub(r'\s+', ' ', prompt).strip().casefold()
+
+
+def generation_cache_key(model, prompt):
+    normalized = normalize_prompt(prompt)
+    return hashlib.sha256(f"{model}\x00{normalized}".encode('utf-8')).hexdigest()
+
+
+class MemoryBackend:
+    """In-process LRU store with per-entry expiry"""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend:
+    """SQLite store shared across processes, evicting least-recently-used rows"""
+
+    def __init__(self, db_path, max_entries=5000, table='generation_cache'):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.table = table
+        with self._connect() as conn:
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} ('
+                'key TEXT PRIMARY KEY, '
+                'value TEXT NOT NULL, '
+                'expires_at REAL NOT NULL, '
+                'accessed_at REAL NOT NULL)'
+            )
+            conn.execute(f'CREATE INDEX IF NOT EXISTS ix_{table}_accessed_at ON {table} (accessed_at)')
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def get(self, key):
+        now = time.time()
+        conn = self._connect()
+        try:
+            row = conn.execute(f'SELECT value, expires_at FROM {self.table} WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                return None
+            conn.execute(f'UPDATE {self.table} SET accessed_at = ? WHERE key = ?', (now, key))
+            return row[0]
+        finally:
+            conn.close()
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, value, now + ttl, now)
+            )
+            conn.execute(f'DELETE FROM {self.table} WHERE expires_at < ?', (now,))
+            conn.execute(
+                f'DELETE FROM {self.table} WHERE key IN ('
+                f'SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+        finally:
+            conn.close()
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            conn.execute(f'DELETE FROM {self.table}')
+        finally:
+            conn.close()
+
+
+class GenerationCache:
+    """TTL cache in front of a backend, with hit/miss counters"""
+
+    def __init__(self, backend, ttl=7 * 24 * 3600):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, model, prompt):
+        try:
+            value = self.backend.get(generation_cache_key(model, prompt))
+        except Exception as e:
+            logging.warning(f"Generation cache read failed: {e}")
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, model, prompt, value):
+        try:
+            self.backend.set(generation_cache_key(model, prompt), value, self.ttl)
+        except Exception as e:
+            logging.warning(f"Generation cache write failed: {e}")
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'backend': type(self.backend).__name__,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            }
@@ -0,0 +1,170 @@
+"""
+Offline IP geolocation
+Loads an IP-range CSV in the DB-IP "IP to City Lite" layout
+(start_ip, end_ip, continent, country, region, city, ...) into sorted
+arrays and resolves addresses with a binary search, so no request ever waits
+on a third-party geolocation service. The file is loaded on a background
+thread; until it is ready lookups return None.
+"""
+
+import os
+import csv
+import gzip
+import bisect
+import socket
+import logging
+import ipaddress
+import threading
+from array import array
+
+
+class IpRangeTable:
+    """Sorted, non-overlapping IP ranges for one address family
+
+    Bounds are kept in compact typed arrays and each range points at an
+    index into a shared list of location strings. IPv6 bounds are reduced to
+    their /64 prefix to fit an unsigned 64-bit array; geolocation data is not
+    finer grained than that.
+    """
+
+    def __init__(self, typecode='I', shift=0):
+        self.typecode = typecode
+        self.shift = shift
+        self.starts = array(typecode)
+        self.ends = array(typecode)
+        self.location_ids = array('I')
+        self.names = []
+        self._name_ids = {}
+
+    def add(self, start, end, location):
+        location_id = self._name_ids.get(location)
+        if location_id is None:
+            location_id = self._name_ids[location] = len(self.names)
+            self.names.append(location)
+        self.starts.append(start >> self.shift)
+        self.ends.append(end >> self.shift)
+        self.location_ids.append(location_id)
+
+    def sort(self):
+        starts = self.starts
+        # DB-IP files are already ordered, so usually there is nothing to do
+        if all(starts[i] <= starts[i + 1] for i in range(len(starts) - 1)):
+            return
+        order = sorted(range(len(starts)), key=starts.__getitem__)
+        self.starts = array(self.typecode, (starts[i] for i in order))
+        self.ends = array(self.typecode, (self.ends[i] for i in order))
+        self.location_ids = array('I', (self.location_ids[i] for i in order))
+
+    def lookup(self, value):
+        value >>= self.shift
+        index = bisect.bisect_right(self.starts, value) - 1
+        if index >= 0 and value <= self.ends[index]:
+            return self.names[self.location_ids[index]]
+        return None
+
+
+def new_tables():
+    return {4: IpRangeTable('I'), 6: IpRangeTable('Q', 64)}
+
+
+def parse_ip(text):
+    """Version and integer value of an address, using the fast socket parsers"""
+    try:
+        if ':' in text:
+            return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, text), 'big')
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, text), 'big')
+    except OSError:
+        return None, None
+
+
+def format_location(city, region):
+    if city and region:
+        return f"{city}, {region}"
+    return city or region or None
+
+
+class IpLocationDatabase:
+    """Offline IP to "City, Region" lookup, loaded in the background"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self._tables = None
+        self._lock = threading.Lock()
+        self._loader = None
+        self._pid = None
+        self.status = 'not loaded'
+
+    @property
+    def ready(self):
+        return self._tables is not None
+
+    def load_rows(self, rows):
+        tables = new_tables()
+        for row in rows:
+            if len(row) < 6:
+                continue
+            start_version, start = parse_ip(row[0].strip())
+            end_version, end = parse_ip(row[1].strip())
+            if start_version is None or start_version != end_version:
+                continue
+            location = format_location(row[5].strip(), row[4].strip())
+            if location:
+                tables[start_version].add(start, end, location)
+        for table in tables.values():
+            table.sort()
+        self._tables = tables
+
+    def load(self):
+        """Read the CSV (optionally gzipped); a missing or unreadable file leaves an empty database"""
+        if not self.path or not os.path.exists(self.path):
+            logging.warning(
+                f"IP location database {self.path or '(no path)'} not found; every visitor gets the default "
+                f"job location. Run download_geoip.py or set GEOIP_DB_PATH."
+            )
+            self.status = 'missing'
+            self._tables = new_tables()
+            return
+        opener = gzip.open if self.path.endswith('.gz') else open
+        try:
+            with opener(self.path, 'rt', encoding='utf-8', newline='') as f:
+                self.load_rows(csv.reader(f))
+            self.status = 'loaded'
+            logging.info(f"Loaded IP location database from {self.path}")
+        except (OSError, csv.Error) as e:
+            logging.error(f"Could not load IP location database {self.path}: {e}")
+            self.status = 'failed'
+            self._tables = new_tables()
+
+    def start(self):
+        """Load the database on a daemon thread in this process if it is not loaded or loading"""
+        with self._lock:
+            if self._tables is not None:
+                return
+            if self._loader is not None and self._loader.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._loader = threading.Thread(target=self.load, name='geoip-loader', daemon=True)
+            self._loader.start()
+
+    def stats(self):
+        tables = self._tables or {}
+        return {
+            'path': self.path,
+            'status': self.status,
+            'ranges': sum(len(table.starts) for table in tables.values()),
+        }
+
+    def lookup(self, ip):
+        """Return "City, Region" for a public IP address, or None (also while still loading)"""
+        tables = self._tables
+        if tables is None:
+            return None
+        try:
+            address = ipaddress.ip_address(ip)
+        except (TypeError, ValueError):
+            return None
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if not address.is_global:
+            return None
+        return tables[address.version].lookup(int(address))
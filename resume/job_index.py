@@ -0,0 +1,222 @@
+"""
+Local full-text index of job listings
+Saved jobs and listings fetched from Adzuna are kept in a SQLite FTS5 table
+so users can search them again, ranked with BM25 and filtered by location and
+salary, without another upstream query. The index is rebuildable: saved jobs
+are re-indexed per user on first search and fetched listings expire.
+"""
+
+import os
+import re
+import time
+import sqlite3
+
+# Listings fetched for everyone are stored under this user id; saved jobs use the owner's id
+SHARED_USER_ID = 0
+
+# BM25 column weights for title, company, location and description
+RANK_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query where every word must match as a prefix"""
+    words = re.findall(r'\w+', text or '')
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def adzuna_listing_row(job):
+    return {
+        'url': job.get('redirect_url') or '',
+        'title': job.get('title') or '',
+        'company': (job.get('company') or {}).get('display_name') or '',
+        'location': (job.get('location') or {}).get('display_name') or '',
+        'description': job.get('description') or '',
+        'salary_min': job.get('salary_min'),
+        'salary_max': job.get('salary_max'),
+    }
+
+
+class JobIndex:
+    """FTS5 index over saved jobs and recently fetched listings"""
+
+    def __init__(self, db_path, listing_ttl=7 * 24 * 3600):
+        self.db_path = db_path
+        self.listing_ttl = listing_ttl
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS job_listings (
+                    id INTEGER PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    url TEXT NOT NULL,
+                    title TEXT NOT NULL DEFAULT '',
+                    company TEXT NOT NULL DEFAULT '',
+                    location TEXT NOT NULL DEFAULT '',
+                    description TEXT NOT NULL DEFAULT '',
+                    salary_min REAL,
+                    salary_max REAL,
+                    indexed_at REAL NOT NULL,
+                    UNIQUE (user_id, url)
+                );
+                CREATE INDEX IF NOT EXISTS ix_job_listings_indexed_at ON job_listings (indexed_at);
+                CREATE VIRTUAL TABLE IF NOT EXISTS job_listings_fts USING fts5(
+                    title, company, location, description,
+                    content='job_listings', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+                );
+                CREATE TRIGGER IF NOT EXISTS job_listings_ai AFTER INSERT ON job_listings BEGIN
+                    INSERT INTO job_listings_fts (rowid, title, company, location, description)
+                    VALUES (new.id, new.title, new.company, new.location, new.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS job_listings_ad AFTER DELETE ON job_listings BEGIN
+                    INSERT INTO job_listings_fts (job_listings_fts, rowid, title, company, location, description)
+                    VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS job_listings_au AFTER UPDATE ON job_listings BEGIN
+                    INSERT INTO job_listings_fts (job_listings_fts, rowid, title, company, location, description)
+                    VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+                    INSERT INTO job_listings_fts (rowid, title, company, location, description)
+                    VALUES (new.id, new.title, new.company, new.location, new.description);
+                END;
+                CREATE TABLE IF NOT EXISTS job_index_users (user_id INTEGER PRIMARY KEY);
+            ''')
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _upsert(self, conn, user_id, rows, now):
+        conn.executemany(
+            'INSERT INTO job_listings '
+            '(user_id, url, title, company, location, description, salary_min, salary_max, indexed_at) '
+            'VALUES (:user_id, :url, :title, :company, :location, :description, :salary_min, :salary_max, :indexed_at) '
+            'ON CONFLICT (user_id, url) DO UPDATE SET '
+            'title = excluded.title, company = excluded.company, location = excluded.location, '
+            'description = CASE WHEN excluded.description != \'\' THEN excluded.description ELSE job_listings.description END, '
+            'salary_min = COALESCE(excluded.salary_min, job_listings.salary_min), '
+            'salary_max = COALESCE(excluded.salary_max, job_listings.salary_max), '
+            'indexed_at = excluded.indexed_at',
+            [dict(row, user_id=user_id, indexed_at=now) for row in rows if row.get('url')]
+        )
+
+    def add_listings(self, jobs):
+        """Index Adzuna results for every user and expire stale listings"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            self._upsert(conn, SHARED_USER_ID, [adzuna_listing_row(job) for job in jobs], now)
+            conn.execute(
+                'DELETE FROM job_listings WHERE user_id = ? AND indexed_at < ?',
+                (SHARED_USER_ID, now - self.listing_ttl)
+            )
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def add_saved_jobs(self, user_id, jobs):
+        """Index a user's saved jobs; jobs are dicts with title, company, location and url"""
+        self._write_saved_jobs(user_id, jobs, replace=False)
+
+    def reindex_user(self, user_id, jobs):
+        """Replace everything indexed for a user with their current saved jobs"""
+        self._write_saved_jobs(user_id, jobs, replace=True)
+
+    def _write_saved_jobs(self, user_id, jobs, replace):
+        rows = [{
+            'url': job.get('url') or '',
+            'title': job.get('title') or '',
+            'company': job.get('company') or '',
+            'location': job.get('location') or '',
+            'description': '',
+            'salary_min': None,
+            'salary_max': None,
+        } for job in jobs]
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            if replace:
+                conn.execute('DELETE FROM job_listings WHERE user_id = ?', (user_id,))
+            self._upsert(conn, user_id, rows, time.time())
+            if replace:
+                conn.execute('INSERT OR IGNORE INTO job_index_users (user_id) VALUES (?)', (user_id,))
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def has_user(self, user_id):
+        conn = self._connect()
+        try:
+            return conn.execute('SELECT 1 FROM job_index_users WHERE user_id = ?', (user_id,)).fetchone() is not None
+        finally:
+            conn.close()
+
+    def remove_user(self, user_id):
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('DELETE FROM job_listings WHERE user_id = ?', (user_id,))
+            conn.execute('DELETE FROM job_index_users WHERE user_id = ?', (user_id,))
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def search(self, user_id, query='', location=None, salary_min=None, salary_max=None, saved_only=False, limit=20, offset=0):
+        """Ranked search over a user's saved jobs and the shared listings
+
+        Every query word matches as a prefix. The salary filter keeps listings
+        whose advertised range overlaps [salary_min, salary_max]; saved jobs
+        carry no salary and are excluded once a salary filter is given.
+        """
+        match = fts_query(query)
+        params = []
+        if match:
+            sql = (
+                'SELECT j.*, bm25(job_listings_fts, ?, ?, ?, ?) AS rank '
+                'FROM job_listings_fts JOIN job_listings j ON j.id = job_listings_fts.rowid '
+                'WHERE job_listings_fts MATCH ?'
+            )
+            params.extend(RANK_WEIGHTS)
+            params.append(match)
+        else:
+            sql = 'SELECT j.*, 0.0 AS rank FROM job_listings j WHERE 1 = 1'
+        if saved_only:
+            sql += ' AND j.user_id = ?'
+            params.append(user_id)
+        else:
+            sql += ' AND j.user_id IN (?, ?)'
+            params.extend((user_id, SHARED_USER_ID))
+        if location:
+            sql += ' AND j.location LIKE ?'
+            params.append(f"%{location.strip()}%")
+        if salary_min is not None:
+            sql += ' AND COALESCE(j.salary_max, j.salary_min) >= ?'
+            params.append(salary_min)
+        if salary_max is not None:
+            sql += ' AND COALESCE(j.salary_min, j.salary_max) <= ?'
+            params.append(salary_max)
+        sql += ' ORDER BY rank, j.indexed_at DESC LIMIT ? OFFSET ?'
+        params.extend((limit, offset))
+
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        return [{
+            'title': row['title'],
+            'company': row['company'],
+            'location': row['location'],
+            'url': row['url'],
+            'description': row['description'],
+            'salary_min': row['salary_min'],
+            'salary_max': row['salary_max'],
+            'saved': row['user_id'] != SHARED_USER_ID,
+            'score': round(-row['rank'], 4),
+        } for row in rows]
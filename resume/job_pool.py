@@ -0,0 +1,85 @@
+"""
+Bounded worker pool for persisted background jobs
+Jobs themselves live in the database; the pool only runs job ids. When every
+slot is busy a job simply stays queued and the periodic sweep dispatches it
+later, which is also how jobs left behind by a restarted worker get picked up.
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobPool:
+    """Run job ids through a bounded thread pool with a recovery sweep
+
+    runner(job_id) executes one job. sweep(free_slots) is called periodically
+    and returns the ids of queued jobs that should be dispatched.
+    """
+
+    def __init__(self, runner, sweep=None, max_workers=4, max_pending=8, sweep_interval=5.0):
+        self.runner = runner
+        self.sweep = sweep
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.sweep_interval = sweep_interval
+        self._capacity = max_workers + max_pending
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._sweeper = None
+        self._pid = None
+
+    def _ensure_started(self):
+        # Threads do not survive fork, so each gunicorn worker starts its own
+        if self._executor is not None and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._in_flight = 0
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job-worker')
+        if self.sweep is not None:
+            self._sweeper = threading.Thread(target=self._sweep_loop, name='job-sweeper', daemon=True)
+            self._sweeper.start()
+
+    def start(self):
+        """Start the pool and sweeper for this process if they are not running"""
+        with self._lock:
+            self._ensure_started()
+
+    def free_slots(self):
+        with self._lock:
+            return self._capacity - self._in_flight
+
+    def dispatch(self, job_id):
+        """Hand a job to the pool; returns False when the pool is saturated"""
+        with self._lock:
+            self._ensure_started()
+            if self._in_flight >= self._capacity:
+                return False
+            self._in_flight += 1
+            executor = self._executor
+        executor.submit(self._run, job_id)
+        return True
+
+    def _run(self, job_id):
+        try:
+            self.runner(job_id)
+        except Exception as e:
+            logging.error(f"Background job {job_id} crashed: {e}")
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _sweep_loop(self):
+        event = threading.Event()
+        while not event.wait(self.sweep_interval):
+            try:
+                free = self.free_slots()
+                if free <= 0:
+                    continue
+                for job_id in self.sweep(free):
+                    if not self.dispatch(job_id):
+                        break
+            except Exception as e:
+                logging.error(f"Background job sweep failed: {e}")
@@ -0,0 +1,264 @@
+"""
+Adzuna job search client
+Requests go through one pooled keep-alive session with retry/backoff, and
+successful responses are cached on disk so identical searches from any
+gunicorn worker are served without another upstream call. The aggregator
+fans a search out over several pages and countries within a latency budget.
+"""
+
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+ADZUNA_SEARCH_URL = 'https://api.adzuna.com/v1/api/jobs/{country}/search/{page}'
+
+
+class AdzunaError(Exception):
+    """Raised when Adzuna answers with a non-200 status"""
+
+    def __init__(self, status_code, body):
+        super().__init__(f"Adzuna API returned status {status_code}: {body}")
+        self.status_code = status_code
+        self.body = body
+
+
+class JobSearchTimeout(Exception):
+    """Raised when no upstream request finished within the search deadline"""
+
+    def __init__(self, late, budget):
+        super().__init__(f"No job search request finished within {budget}s ({late} still running)")
+        self.late = late
+        self.budget = budget
+
+
+def search_cache_key(country, keyword, location, page, results_per_page):
+    normalized = [
+        country.strip().lower(),
+        ' '.join((keyword or '').split()).lower(),
+        ' '.join((location or '').split()).lower(),
+        str(page),
+        str(results_per_page),
+    ]
+    return hashlib.sha256('\x00'.join(normalized).encode('utf-8')).hexdigest()
+
+
+class AdzunaClient:
+    """Pooled, cached client for the Adzuna search endpoint"""
+
+    def __init__(self, app_id, app_key, cache_backend=None, cache_ttl=900, timeout=10, pool_size=10):
+        self.app_id = app_id
+        self.app_key = app_key
+        self.cache_backend = cache_backend
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.upstream_calls = 0
+        self.upstream_errors = 0
+        self.upstream_seconds = 0.0
+        self.upstream_max_seconds = 0.0
+
+    def search(self, keyword, location, page=1, results_per_page=25, country='us', app_id=None, app_key=None):
+        """Return the decoded Adzuna response for a search, from cache when possible"""
+        key = search_cache_key(country, keyword, location, page, results_per_page)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        params = {
+            'app_id': app_id or self.app_id,
+            'app_key': app_key or self.app_key,
+            'what': keyword,
+            'where': location,
+            'results_per_page': results_per_page,
+            'content-type': 'application/json'
+        }
+        started = time.perf_counter()
+        try:
+            response = self.session.get(ADZUNA_SEARCH_URL.format(country=country, page=page), params=params, timeout=self.timeout)
+        except requests.RequestException:
+            self._record_upstream(time.perf_counter() - started, error=True)
+            raise
+        self._record_upstream(time.perf_counter() - started, error=response.status_code != 200)
+        if response.status_code != 200:
+            raise AdzunaError(response.status_code, response.text)
+        data = response.json()
+        self._cache_set(key, data)
+        return data
+
+    def _cache_get(self, key):
+        value = None
+        if self.cache_backend is not None:
+            try:
+                raw = self.cache_backend.get(key)
+                value = json.loads(raw) if raw is not None else None
+            except Exception as e:
+                logging.warning(f"Adzuna cache read failed: {e}")
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def _cache_set(self, key, data):
+        if self.cache_backend is None:
+            return
+        try:
+            self.cache_backend.set(key, json.dumps(data), self.cache_ttl)
+        except Exception as e:
+            logging.warning(f"Adzuna cache write failed: {e}")
+
+    def _record_upstream(self, seconds, error=False):
+        with self._lock:
+            self.upstream_calls += 1
+            self.upstream_seconds += seconds
+            self.upstream_max_seconds = max(self.upstream_max_seconds, seconds)
+            if error:
+                self.upstream_errors += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'upstream_calls': self.upstream_calls,
+                'upstream_errors': self.upstream_errors,
+                'upstream_avg_ms': round(self.upstream_seconds * 1000 / self.upstream_calls, 3) if self.upstream_calls else 0.0,
+                'upstream_max_ms': round(self.upstream_max_seconds * 1000, 3),
+            }
+
+
+def listing_keys(job):
+    """Keys that identify the same posting across pages and countries"""
+    keys = []
+    url = (job.get('redirect_url') or '').strip()
+    if url:
+        keys.append(('url', url))
+    title = ' '.join((job.get('title') or '').split()).casefold()
+    company = ' '.join(((job.get('company') or {}).get('display_name') or '').split()).casefold()
+    if title and company:
+        keys.append(('title', title, company))
+    return keys
+
+
+def rank_listings(listings, keyword):
+    """Order (page, position, job) tuples by keyword matches, then by upstream order"""
+    terms = set(re.findall(r'\w+', (keyword or '').casefold()))
+
+    def score(item):
+        page, position, job = item
+        title_words = set(re.findall(r'\w+', (job.get('title') or '').casefold()))
+        description_words = set(re.findall(r'\w+', (job.get('description') or '').casefold()))
+        matches = 2 * len(terms & title_words) + len(terms & description_words)
+        return (-matches, page, position)
+
+    return [job for _, _, job in sorted(listings, key=score)]
+
+
+class JobSearchAggregator:
+    """Concurrent multi-page, multi-country search that answers within a deadline"""
+
+    def __init__(self, client, max_workers=8, budget=2.5):
+        self.client = client
+        self.budget = budget
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job-search')
+        self._lock = threading.Lock()
+        self.searches = 0
+        self.requests_completed = 0
+        self.requests_late = 0
+        self.requests_failed = 0
+        self.duplicates = 0
+
+    def search(self, keyword, location, pages=3, countries=('us',), results_per_page=25, budget=None, **kwargs):
+        """Merged, deduplicated and ranked results from every request that finished in time
+
+        Requests still running at the deadline are left to finish in the
+        background, which warms the client cache for the next search. When no
+        request succeeded, raises the last upstream error, or JobSearchTimeout
+        if every request was still running at the deadline.
+        """
+        budget = self.budget if budget is None else budget
+        futures = {}
+        for country in countries:
+            for page in range(1, pages + 1):
+                future = self.executor.submit(
+                    self.client.search, keyword, location, page=page,
+                    results_per_page=results_per_page, country=country, **kwargs
+                )
+                futures[future] = page
+        done, not_done = wait(futures, timeout=budget)
+        for future in not_done:
+            future.cancel()
+
+        listings = []
+        seen = set()
+        duplicates = 0
+        completed = 0
+        failed = 0
+        error = None
+        for future, page in futures.items():
+            if future not in done:
+                continue
+            try:
+                data = future.result()
+            except Exception as e:
+                failed += 1
+                error = e
+                continue
+            completed += 1
+            for position, job in enumerate(data.get('results', [])):
+                keys = listing_keys(job)
+                if any(key in seen for key in keys):
+                    duplicates += 1
+                    continue
+                seen.update(keys)
+                listings.append((page, position, job))
+
+        with self._lock:
+            self.searches += 1
+            self.requests_completed += completed
+            self.requests_late += len(not_done)
+            self.requests_failed += failed
+            self.duplicates += duplicates
+        if not completed and error is not None:
+            raise error
+        if not completed and not_done:
+            raise JobSearchTimeout(len(not_done), budget)
+        return {
+            'results': rank_listings(listings, keyword),
+            'completed': completed,
+            'late': len(not_done),
+            'failed': failed,
+        }
+
+    def stats(self):
+        with self._lock:
+            return {
+                'searches': self.searches,
+                'requests_completed': self.requests_completed,
+                'requests_late': self.requests_late,
+                'requests_failed': self.requests_failed,
+                'duplicates_dropped': self.duplicates,
+            }
@@ -0,0 +1,131 @@
+"""
+Resume-to-job matching
+Ranks job listings by TF-IDF cosine similarity to a resume. Vectors are
+sparse dicts so no numerical library is needed, and the resume's term counts
+are cached per content checksum so it is only tokenized again after an edit.
+Listing term counts are cached too, since searches repeat.
+"""
+
+import re
+import math
+import time
+import zlib
+import threading
+from collections import Counter, OrderedDict
+
+from resume.ats import tokenize
+
+STOP_WORDS = frozenset('''
+    a about above after all also am an and any are as at be been being but by can could did do does
+    for from had has have he her his how i if in into is it its job jobs may me more most must my no
+    not of on or our out over role she should so such than that the their them then there these they
+    this those through to under up us was we were what when where which while who will with work
+    would you your
+'''.split())
+TAG_RE = re.compile(r'<[^>]+>')
+
+
+def term_counts(text):
+    text = TAG_RE.sub(' ', text or '')
+    return Counter([token for token in tokenize(text) if len(token) > 1 and token not in STOP_WORDS])
+
+
+def cosine_scores(query_counts, document_counts):
+    """Cosine similarity of the query against every document, with IDF fitted on the documents
+
+    Weights are sublinear tf * smoothed idf. The query is weighted and
+    normalized once; each document's norm and dot product are accumulated in
+    a single pass over its terms, so the cost is linear in the total terms.
+    """
+    n = len(document_counts)
+    df = Counter()
+    for counts in document_counts:
+        df.update(counts.keys())
+    # Smoothed IDF as in scikit-learn; terms absent from every listing get the maximum weight
+    idf = {term: math.log((1 + n) / (1 + freq)) + 1 for term, freq in df.items()}
+    default_idf = math.log(1 + n) + 1
+
+    query = {term: (1 + math.log(count)) * idf.get(term, default_idf) for term, count in query_counts.items()}
+    query_norm = math.sqrt(sum(w * w for w in query.values()))
+    if not query_norm:
+        return [0.0] * n
+    log = math.log
+    scores = []
+    for counts in document_counts:
+        dot = 0.0
+        norm = 0.0
+        for term, count in counts.items():
+            weight = (1 + log(count)) * idf[term]
+            norm += weight * weight
+            q = query.get(term)
+            if q:
+                dot += weight * q
+        scores.append(dot / (math.sqrt(norm) * query_norm) if dot else 0.0)
+    return scores
+
+
+class JobMatcher:
+    """Scores listings against a resume, caching resume term counts until the content changes"""
+
+    def __init__(self, max_entries=1024, max_listings=5000):
+        self.max_entries = max_entries
+        self.max_listings = max_listings
+        self._resumes = OrderedDict()
+        self._listings = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rankings = 0
+        self.ranking_seconds = 0.0
+
+    def resume_counts(self, resume_id, content):
+        key = (resume_id, zlib.crc32((content or '').encode('utf-8')))
+        with self._lock:
+            counts = self._resumes.get(key)
+            if counts is not None:
+                self._resumes.move_to_end(key)
+                self.hits += 1
+                return counts
+            self.misses += 1
+        counts = term_counts(content)
+        with self._lock:
+            self._resumes[key] = counts
+            while len(self._resumes) > self.max_entries:
+                self._resumes.popitem(last=False)
+        return counts
+
+    def listing_counts(self, text):
+        # Search results are cached upstream, so the same listings come back on repeat searches
+        with self._lock:
+            counts = self._listings.get(text)
+            if counts is not None:
+                self._listings.move_to_end(text)
+                return counts
+        counts = term_counts(text)
+        with self._lock:
+            self._listings[text] = counts
+            while len(self._listings) > self.max_listings:
+                self._listings.popitem(last=False)
+        return counts
+
+    def score(self, resume_id, content, listings):
+        """Similarity between the resume and each listing's title and description, 0..1"""
+        started = time.perf_counter()
+        query = self.resume_counts(resume_id, content)
+        documents = [self.listing_counts(f"{listing.get('title', '')} {listing.get('description', '')}") for listing in listings]
+        scores = cosine_scores(query, documents)
+        with self._lock:
+            self.rankings += 1
+            self.ranking_seconds += time.perf_counter() - started
+        return scores
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'resume_hits': self.hits,
+                'resume_misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'rankings': self.rankings,
+                'avg_ranking_ms': round(self.ranking_seconds * 1000 / self.rankings, 3) if self.rankings else 0.0,
+            }
@@ -0,0 +1,94 @@
+"""
+Content-addressed cache for rendered resume PDFs
+Entries live on disk and are evicted least-recently-used once the cache
+grows past its size budget
+"""
+
+import os
+import glob
+import hashlib
+import logging
+import tempfile
+import threading
+
+
+def resume_cache_key(template_name, template_mtime, content, title):
+    """Hash everything that can change the rendered PDF"""
+    digest = hashlib.sha256()
+    for part in (template_name, template_mtime, content, title):
+        digest.update(str(part if part is not None else '').encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+class PdfRenderCache:
+    """Disk-backed LRU cache of PDF bytes keyed by resume id and content hash"""
+
+    def __init__(self, cache_dir, max_bytes=100 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, resume_id, key):
+        return os.path.join(self.cache_dir, f"{resume_id}-{key}.pdf")
+
+    def get(self, resume_id, key):
+        """Return cached PDF bytes or None, refreshing the entry's LRU position"""
+        path = self._path(resume_id, key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path, None)
+            return data
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logging.warning(f"PDF cache read failed for {path}: {e}")
+            return None
+
+    def put(self, resume_id, key, pdf_bytes):
+        """Store PDF bytes atomically, dropping stale entries for the same resume"""
+        self.invalidate(resume_id)
+        path = self._path(resume_id, key)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(pdf_bytes)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"PDF cache write failed for {path}: {e}")
+            return
+        self._evict()
+
+    def invalidate(self, resume_id):
+        """Remove every cached PDF for a resume"""
+        for path in glob.glob(os.path.join(self.cache_dir, f"{resume_id}-*.pdf")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _evict(self):
+        """Delete least-recently-used entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+            for path in glob.glob(os.path.join(self.cache_dir, '*.pdf')):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+            if total <= self.max_bytes:
+                return
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
@@ -0,0 +1,30 @@
+"""
+Process pool helpers
+Pools are created after the app has started daemon threads (job pool,
+thumbnail queue, IP database loader), so workers are started with forkserver
+where available instead of forking a threaded parent.
+"""
+
+import os
+import logging
+import multiprocessing
+
+PROCESS_POOL_START_METHOD = os.getenv('PROCESS_POOL_START_METHOD', '')
+
+
+def pool_context():
+    """Multiprocessing context for worker pools: forkserver, else spawn"""
+    methods = multiprocessing.get_all_start_methods()
+    method = PROCESS_POOL_START_METHOD or ('forkserver' if 'forkserver' in methods else 'spawn')
+    return multiprocessing.get_context(method)
+
+
+def kill_pool(executor):
+    """Stop a pool whose workers may be hung; pending futures fail with BrokenProcessPool"""
+    # ProcessPoolExecutor cannot interrupt a running task, so its workers are killed outright
+    for process in list((getattr(executor, '_processes', None) or {}).values()):
+        try:
+            process.kill()
+        except (OSError, AttributeError) as e:
+            logging.error(f"Could not kill pool worker: {e}")
+    executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,355 @@
+"""
+Concurrency control for upstream API calls
+A limiter caps in-flight requests and paces them with a token bucket, and
+single-flight coalescing lets identical concurrent requests share one call.
+With a SQLiteCoordinator the cap, the pacing and the coalescing apply across
+every worker process on the host instead of within one process.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Polling interval while waiting on another process, doubled up to the maximum
+POLL_INTERVAL = 0.05
+MAX_POLL_INTERVAL = 0.5
+
+
+class LimiterTimeout(Exception):
+    """Raised when a call cannot get a slot or token before its deadline"""
+
+
+class TokenBucket:
+    """Token bucket refilled at rate tokens per second up to capacity"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class SQLiteCoordinator:
+    """Slot leases, token buckets and in-flight call results shared through one SQLite file
+
+    Leases and pending calls expire after lease_ttl seconds so a worker that
+    dies mid-call cannot hold them forever; finished results are kept for
+    result_ttl seconds so callers that were waiting can read them.
+    """
+
+    def __init__(self, db_path, lease_ttl=300, result_ttl=60):
+        self.db_path = db_path
+        self.lease_ttl = lease_ttl
+        self.result_ttl = result_ttl
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS limiter_leases (
+                    token TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_limiter_leases_name ON limiter_leases (name, expires_at);
+                CREATE TABLE IF NOT EXISTS limiter_buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS limiter_flights (
+                    key TEXT PRIMARY KEY,
+                    done INTEGER NOT NULL DEFAULT 0,
+                    value TEXT,
+                    expires_at REAL NOT NULL
+                );
+            ''')
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def try_lease(self, name, limit):
+        """Take one of limit slots named name; returns a lease token or None if all are taken"""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM limiter_leases WHERE name = ? AND expires_at < ?', (name, now))
+            held = conn.execute('SELECT COUNT(*) FROM limiter_leases WHERE name = ?', (name,)).fetchone()[0]
+            if held >= limit:
+                return None
+            token = uuid.uuid4().hex
+            conn.execute(
+                'INSERT INTO limiter_leases (token, name, expires_at) VALUES (?, ?, ?)',
+                (token, name, now + self.lease_ttl)
+            )
+            return token
+
+    def release(self, token):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM limiter_leases WHERE token = ?', (token,))
+
+    def try_take_token(self, name, rate, capacity):
+        """Take a token from the shared bucket; returns 0 on success, else seconds until one is due"""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute('SELECT tokens, updated_at FROM limiter_buckets WHERE name = ?', (name,)).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + max(now - row[1], 0) * rate)
+            wait = 0 if tokens >= 1 else (1 - tokens) / rate
+            if not wait:
+                tokens -= 1
+            conn.execute(
+                'INSERT OR REPLACE INTO limiter_buckets (name, tokens, updated_at) VALUES (?, ?, ?)',
+                (name, tokens, now)
+            )
+            return wait
+
+    def claim_flight(self, key):
+        """Become the caller that runs key, unless another live call already is"""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute('SELECT done, expires_at FROM limiter_flights WHERE key = ?', (key,)).fetchone()
+            if row is not None and not row[0] and row[1] >= now:
+                return False
+            conn.execute('DELETE FROM limiter_flights WHERE expires_at < ?', (now,))
+            conn.execute(
+                'INSERT OR REPLACE INTO limiter_flights (key, done, value, expires_at) VALUES (?, 0, NULL, ?)',
+                (key, now + self.lease_ttl)
+            )
+            return True
+
+    def finish_flight(self, key, value):
+        with self._transaction() as conn:
+            conn.execute(
+                'UPDATE limiter_flights SET done = 1, value = ?, expires_at = ? WHERE key = ?',
+                (json.dumps(value), time.time() + self.result_ttl, key)
+            )
+
+    def abandon_flight(self, key):
+        """Drop a failed call so a waiting caller runs it itself"""
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM limiter_flights WHERE key = ? AND done = 0', (key,))
+
+    def flight_result(self, key):
+        """(True, value) once key has finished, (False, None) while it is running, None if no live call"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                'SELECT done, value, expires_at FROM limiter_flights WHERE key = ?', (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None or (not row[0] and row[2] < time.time()):
+            return None
+        return (True, json.loads(row[1])) if row[0] else (False, None)
+
+
+def _poll_until(deadline, attempt):
+    """Sleep before retrying attempt(); returns its first truthy result, or None at the deadline"""
+    interval = POLL_INTERVAL
+    while True:
+        result = attempt()
+        if result:
+            return result
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+
+class ConcurrencyLimiter:
+    """Bound in-flight calls and their start rate
+
+    max_in_flight caps concurrent calls; rate/burst configure the token bucket
+    (rate <= 0 disables it). timeout bounds the total wait for a slot and token.
+    Without a coordinator the limits are per process; with one they are
+    shared by every process using the same coordinator file and name.
+    """
+
+    def __init__(self, max_in_flight=4, rate=0, burst=1, timeout=60, coordinator=None, name='default'):
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.coordinator = coordinator
+        self.name = name
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._bucket = TokenBucket(rate, self.burst) if rate > 0 and coordinator is None else None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    @contextmanager
+    def slot(self):
+        """Hold one in-flight slot for the duration of the block"""
+        deadline = time.monotonic() + self.timeout
+        if not self._slots.acquire(timeout=self.timeout):
+            self._reject()
+        lease = None
+        try:
+            if self.coordinator is not None:
+                lease = _poll_until(deadline, lambda: self.coordinator.try_lease(self.name, self.max_in_flight))
+                if lease is None:
+                    self._reject()
+                if self.rate > 0 and not self._take_shared_token(deadline):
+                    self._reject()
+            elif self._bucket and not self._bucket.acquire(timeout=max(deadline - time.monotonic(), 0)):
+                self._reject()
+            with self._lock:
+                self.in_flight += 1
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+        finally:
+            if lease is not None:
+                self.coordinator.release(lease)
+            self._slots.release()
+
+    def _take_shared_token(self, deadline):
+        while True:
+            wait = self.coordinator.try_take_token(self.name, self.rate, self.burst)
+            if not wait:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(wait, remaining))
+
+    def call(self, fn, *args, **kwargs):
+        with self.slot():
+            return fn(*args, **kwargs)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_in_flight': self.max_in_flight,
+                'in_flight': self.in_flight,
+                'rejected': self.rejected,
+            }
+
+    def _reject(self):
+        with self._lock:
+            self.rejected += 1
+        raise LimiterTimeout('Timed out waiting for an upstream API slot')
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one execution
+
+    With a coordinator, calls are also coalesced across processes: one
+    process runs the call and the others wait up to timeout seconds for its
+    JSON-serializable result. If that call fails, a waiting caller runs it.
+    """
+
+    def __init__(self, coordinator=None, timeout=300):
+        self.coordinator = coordinator
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+        self.shared_coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            if self.coordinator is None:
+                call.result = fn(*args, **kwargs)
+            else:
+                call.result = self._do_shared(key, fn, *args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _do_shared(self, key, fn, *args, **kwargs):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            if self.coordinator.claim_flight(key):
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception:
+                    self.coordinator.abandon_flight(key)
+                    raise
+                self.coordinator.finish_flight(key, result)
+                return result
+            # Another process is running this call; wait for its result or for it to give up
+            state = _poll_until(deadline, lambda: self._flight_settled(key))
+            if state is None:
+                raise LimiterTimeout('Timed out waiting for a shared upstream call')
+            if state[0]:
+                with self._lock:
+                    self.shared_coalesced += 1
+                return state[1]
+
+    def _flight_settled(self, key):
+        """(True, value) when the other call finished, (False, None) when it is gone, else None"""
+        state = self.coordinator.flight_result(key)
+        if state is None:
+            return (False, None)
+        return state if state[0] else None
@@ -0,0 +1,132 @@
+"""
+Rendering service for WeasyPrint jobs
+HTML is rendered to PDF bytes in a bounded process pool so a large resume
+cannot hold a web worker for the whole render
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from resume.process_pool import pool_context, kill_pool
+
+
+class RenderError(Exception):
+    """Base error for rendering service failures"""
+
+
+class RenderQueueFull(RenderError):
+    """Raised when too many render jobs are already running or queued"""
+
+
+class RenderTimeout(RenderError):
+    """Raised when a render job does not finish within its timeout"""
+
+
+class RenderUnavailable(RenderError):
+    """Raised when a render worker died; the pool is rebuilt for the next job"""
+
+
+def _write_pdf(html_string, base_url=None):
+    """Worker entry point: render HTML to PDF bytes"""
+    from weasyprint import HTML
+    return HTML(string=html_string, base_url=base_url).write_pdf()
+
+
+class RenderService:
+    """Bounded process pool for HTML to PDF rendering
+
+    max_workers caps concurrent renders, max_queue caps how many extra jobs
+    may wait for a free worker before new submissions are rejected, and
+    timeout bounds how long a caller waits for its result. worker is the
+    module-level function run in the pool, _write_pdf unless overridden.
+    """
+
+    def __init__(self, max_workers=2, max_queue=8, timeout=30, worker=_write_pdf):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.worker = worker
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def _get_executor(self):
+        # Pools cannot be shared across fork, so each gunicorn worker builds its own
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=pool_context())
+                self._pid = os.getpid()
+            return self._executor
+
+    def _discard_executor(self, executor, kill=False):
+        """Drop a broken or hung pool so the next job starts a fresh one"""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        if kill:
+            kill_pool(executor)
+        else:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, html_string, base_url=None):
+        """Queue a render job and return its future, or raise RenderQueueFull"""
+        return self._submit(html_string, base_url)[0]
+
+    def _submit(self, html_string, base_url):
+        if not self._slots.acquire(blocking=False):
+            raise RenderQueueFull('Render queue is full')
+        try:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(self.worker, html_string, base_url)
+            except BrokenProcessPool:
+                self._discard_executor(executor)
+                executor = self._get_executor()
+                future = executor.submit(self.worker, html_string, base_url)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future, executor
+
+    def render_pdf(self, html_string, base_url=None, timeout=None):
+        """Render HTML to PDF bytes, waiting at most timeout seconds
+
+        A render that times out is stopped by killing the pool, since a
+        running process cannot be interrupted; renders sharing that pool fail
+        with RenderUnavailable and can be retried.
+        """
+        future, executor = self._submit(html_string, base_url)
+        try:
+            return future.result(timeout=timeout or self.timeout)
+        except FutureTimeoutError:
+            logging.error('PDF render timed out; recycling the render pool')
+            self._discard_executor(executor, kill=True)
+            raise RenderTimeout('PDF render timed out')
+        except BrokenProcessPool as e:
+            logging.error(f"PDF render worker died: {e}")
+            self._discard_executor(executor)
+            raise RenderUnavailable('PDF renderer restarted')
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+render_service = RenderService(
+    max_workers=int(os.getenv('RENDER_MAX_WORKERS', 2)),
+    max_queue=int(os.getenv('RENDER_MAX_QUEUE', 8)),
+    timeout=float(os.getenv('RENDER_TIMEOUT', 30)),
+)
+
+
+def render_pdf(html_string, base_url=None, timeout=None):
+    """Render HTML to PDF bytes through the shared rendering service"""
+    return render_service.render_pdf(html_string, base_url=base_url, timeout=timeout)
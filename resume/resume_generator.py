@@ -4,15 +4,98 @@ from openai import OpenAI
 from PyPDF2 import PdfReader, PdfWriter
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
-from weasyprint import HTML
+from resume.renderer import render_pdf
+from resume.generation_cache import GenerationCache, MemoryBackend, SQLiteBackend, generation_cache_key
+from resume.rate_limit import ConcurrencyLimiter, SingleFlight, SQLiteCoordinator
 
 
 # Initialize OpenAI client
 client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
 
+# Generation cache: "memory" keeps an LRU per process, "sqlite" shares one store across workers
+GENERATION_CACHE_TTL = int(os.getenv("GENERATION_CACHE_TTL", 7 * 24 * 3600))
+GENERATION_CACHE_MAX_ENTRIES = int(os.getenv("GENERATION_CACHE_MAX_ENTRIES", 1000))
+if os.getenv("GENERATION_CACHE_BACKEND", "memory") == "sqlite":
+    _cache_backend = SQLiteBackend(
+        os.getenv("GENERATION_CACHE_PATH", "instance/generation_cache.db"),
+        max_entries=GENERATION_CACHE_MAX_ENTRIES
+    )
+else:
+    _cache_backend = MemoryBackend(max_entries=GENERATION_CACHE_MAX_ENTRIES)
+generation_cache = GenerationCache(_cache_backend, ttl=GENERATION_CACHE_TTL)
 
-def generate_resume(name, phone, email, job_title, experience):
-    prompt = f"""
+# Limits for every OpenAI call: "sqlite" shares the in-flight cap, the start rate and
+# call coalescing across all workers on the host; "memory" applies them per process
+if os.getenv("OPENAI_LIMITS_BACKEND", "sqlite") == "sqlite":
+    openai_coordinator = SQLiteCoordinator(
+        os.getenv("OPENAI_LIMITS_PATH", "instance/openai_limits.db"),
+        lease_ttl=float(os.getenv("OPENAI_LEASE_TTL", 300))
+    )
+else:
+    openai_coordinator = None
+openai_limiter = ConcurrencyLimiter(
+    max_in_flight=int(os.getenv("OPENAI_MAX_IN_FLIGHT", 4)),
+    rate=float(os.getenv("OPENAI_RATE_PER_SECOND", 2)),
+    burst=int(os.getenv("OPENAI_RATE_BURST", 4)),
+    timeout=float(os.getenv("OPENAI_QUEUE_TIMEOUT", 60)),
+    coordinator=openai_coordinator,
+    name="openai"
+)
+openai_single_flight = SingleFlight(openai_coordinator, timeout=float(os.getenv("OPENAI_LEASE_TTL", 300)))
+
+
+def _create_completion(prompt, model):
+    with openai_limiter.slot():
+        response = client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}]
+        )
+    return response.choices[0].message.content
+
+
+def _complete(prompt, model="gpt-4", cache=False):
+    """Run a chat completion, optionally served from the generation cache
+
+    Identical prompts already in flight share a single upstream call.
+    """
+    if cache:
+        cached = generation_cache.get(model, prompt)
+        if cached is not None:
+            return cached
+    key = generation_cache_key(model, prompt)
+    content = openai_single_flight.do(key, _create_completion, prompt, model)
+    if cache:
+        generation_cache.set(model, prompt, content)
+    return content
+
+
+def _complete_stream(prompt, model="gpt-4", cache=False):
+    """Yield completion text chunks as they arrive from the API"""
+    if cache:
+        cached = generation_cache.get(model, prompt)
+        if cached is not None:
+            yield cached
+            return
+    parts = []
+    with openai_limiter.slot():
+        stream = client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True
+        )
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+    if cache:
+        generation_cache.set(model, prompt, "".join(parts))
+
+
+def _resume_prompt(job_title):
+    return f"""
     Create a professional resume for the role of {job_title}.
     Include:
     - A PROFESSIONAL SUMMARY
@@ -22,11 +105,12 @@ def generate_resume(name, phone, email, job_title, experience):
 
     Use plain text sections so it can be inserted into HTML blocks.
     """
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[{"role": "user", "content": prompt}]
-    )
-    return response.choices[0].message.content
+
+def generate_resume(name, phone, email, job_title, experience):
+    return _complete(_resume_prompt(job_title))
+
+def generate_resume_stream(name, phone, email, job_title, experience):
+    return _complete_stream(_resume_prompt(job_title))
 
 def build_template_resume(name, contact, resume_text):
     sections = resume_text.split("\n\n")
@@ -74,30 +158,34 @@ def build_template_resume(name, contact, resume_text):
     """
     return html
 
-def generate_cover_letter(name, email, job_title, description):
-    prompt = f"""
+def _cover_letter_prompt(name, job_title, description):
+    return f"""
     Write a professional cover letter for {name} applying to a {job_title} position.
     The cover letter should highlight relevant skills and refer to the following job description:
     {description}
     """
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[{"role": "user", "content": prompt}]
-    )
-    return response.choices[0].message.content
 
-def generate_interview_qa(job_title):
-    prompt = f"""
+def generate_cover_letter(name, email, job_title, description):
+    return _complete(_cover_letter_prompt(name, job_title, description))
+
+def generate_cover_letter_stream(name, email, job_title, description):
+    return _complete_stream(_cover_letter_prompt(name, job_title, description))
+
+def _interview_qa_prompt(job_title):
+    return f"""
     Generate a list of common interview questions and answers for a {job_title} position. Provide at least 5 questions and model answers.
     """
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[{"role": "user", "content": prompt}]
-    )
-    return response.choices[0].message.content    
+
+def generate_interview_qa(job_title):
+    return _complete(_interview_qa_prompt(job_title), cache=True)
+
+def generate_interview_qa_stream(job_title):
+    return _complete_stream(_interview_qa_prompt(job_title), cache=True)
 
 def export_pdf_from_html(html_string, filename="styled_resume.pdf"):
-    HTML(string=html_string).write_pdf(filename)
+    pdf_bytes = render_pdf(html_string)
+    with open(filename, 'wb') as f:
+        f.write(pdf_bytes)
     print(f"✅ Resume created: {filename}")
 
 if __name__ == "__main__":
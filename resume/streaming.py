@@ -0,0 +1,54 @@
+"""
+Heartbeats for streamed responses
+Generation streams can go quiet for a long time (waiting for an OpenAI slot
+or the first token). Reading the upstream iterator on a helper thread lets the
+response emit keepalive comments so proxies and browsers keep it open.
+"""
+
+import queue
+import threading
+
+_DONE = object()
+
+
+def with_heartbeat(iterable, interval=15.0):
+    """Yield items from iterable, and None whenever interval seconds pass without one
+
+    Errors raised by the iterable are re-raised in the caller. Closing this
+    generator (e.g. the client went away) stops the reader after its next item.
+    """
+    items = queue.Queue()
+    stop = threading.Event()
+
+    def read():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                items.put((item, None))
+                if stop.is_set():
+                    break
+        except Exception as e:
+            items.put((_DONE, e))
+            return
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close:
+                close()
+        items.put((_DONE, None))
+
+    reader = threading.Thread(target=read, name='stream-reader', daemon=True)
+    reader.start()
+    try:
+        while True:
+            try:
+                item, error = items.get(timeout=interval)
+            except queue.Empty:
+                yield None
+                continue
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
@@ -0,0 +1,176 @@
+"""
+Background thumbnail generation queue
+Jobs are stored in a local SQLite file so no outside broker is needed and
+every gunicorn worker can drain the same queue. Jobs are keyed by resume id,
+so enqueueing a resume that is already waiting just replaces its HTML. A job
+stays in the table while it is being rendered and is only removed once its
+handler succeeds, so a crashed worker or a busy renderer never loses it.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+
+
+class ThumbnailQueue:
+    """SQLite-backed, coalescing job queue drained by a daemon thread"""
+
+    def __init__(self, db_path, handler, poll_interval=1.0, retry_on=(), max_attempts=5,
+                 retry_delay=2.0, max_retry_delay=300.0, claim_timeout=300.0):
+        self.db_path = db_path
+        self.handler = handler
+        self.poll_interval = poll_interval
+        # Handler errors worth retrying with backoff; any other error drops the job
+        self.retry_on = tuple(retry_on)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        # A claim older than this belongs to a worker that died mid-job
+        self.claim_timeout = claim_timeout
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._pid = None
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS thumbnail_jobs ('
+                'resume_id INTEGER PRIMARY KEY, '
+                'html TEXT NOT NULL, '
+                'enqueued_at REAL NOT NULL, '
+                'available_at REAL NOT NULL DEFAULT 0, '
+                'claimed_at REAL, '
+                'attempts INTEGER NOT NULL DEFAULT 0)'
+            )
+            # Queue files created before jobs were retried lack the retry columns
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(thumbnail_jobs)')}
+            for column, definition in (
+                ('available_at', 'REAL NOT NULL DEFAULT 0'),
+                ('claimed_at', 'REAL'),
+                ('attempts', 'INTEGER NOT NULL DEFAULT 0'),
+            ):
+                if column not in columns:
+                    conn.execute(f'ALTER TABLE thumbnail_jobs ADD COLUMN {column} {definition}')
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def enqueue(self, resume_id, html_content):
+        """Queue a thumbnail job, replacing any pending job for the same resume"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO thumbnail_jobs (resume_id, html, enqueued_at, available_at, claimed_at, attempts) '
+                'VALUES (?, ?, ?, ?, NULL, 0)',
+                (resume_id, html_content, now, now)
+            )
+        self.start()
+        self._wakeup.set()
+
+    def discard(self, resume_id):
+        """Drop a pending job, e.g. when its resume is deleted"""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM thumbnail_jobs WHERE resume_id = ?', (resume_id,))
+
+    def pending(self):
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM thumbnail_jobs').fetchone()[0]
+
+    def claim(self):
+        """Atomically mark the oldest runnable job as in progress and return it, or None
+
+        Returns (resume_id, html, enqueued_at, attempts). Jobs waiting out a
+        retry delay are skipped; jobs claimed longer than claim_timeout ago are
+        taken over, and given up on once they have used every attempt.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            while True:
+                row = conn.execute(
+                    'SELECT resume_id, html, enqueued_at, attempts FROM thumbnail_jobs '
+                    'WHERE available_at <= ? AND (claimed_at IS NULL OR claimed_at < ?) '
+                    'ORDER BY available_at, enqueued_at LIMIT 1',
+                    (now, now - self.claim_timeout)
+                ).fetchone()
+                if row is None or row[3] < self.max_attempts:
+                    break
+                conn.execute('DELETE FROM thumbnail_jobs WHERE resume_id = ?', (row[0],))
+                logging.error(f"Thumbnail generation for resume {row[0]} abandoned after {row[3]} attempts")
+            if row:
+                conn.execute(
+                    'UPDATE thumbnail_jobs SET claimed_at = ?, attempts = attempts + 1 WHERE resume_id = ?',
+                    (now, row[0])
+                )
+                row = (row[0], row[1], row[2], row[3] + 1)
+            conn.execute('COMMIT')
+            return row
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            logging.error(f"Thumbnail queue claim failed: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def complete(self, resume_id, enqueued_at):
+        """Remove a finished job unless it was re-enqueued with new HTML meanwhile"""
+        with self._connect() as conn:
+            conn.execute(
+                'DELETE FROM thumbnail_jobs WHERE resume_id = ? AND enqueued_at = ?',
+                (resume_id, enqueued_at)
+            )
+
+    def retry(self, resume_id, enqueued_at, attempts):
+        """Release a failed job to run again after an exponential backoff"""
+        delay = min(self.retry_delay * 2 ** (attempts - 1), self.max_retry_delay)
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE thumbnail_jobs SET claimed_at = NULL, available_at = ? '
+                'WHERE resume_id = ? AND enqueued_at = ?',
+                (time.time() + delay, resume_id, enqueued_at)
+            )
+        return delay
+
+    def run_pending(self):
+        """Process runnable jobs until none are left; returns the number of attempts made"""
+        handled = 0
+        while True:
+            job = self.claim()
+            if job is None:
+                return handled
+            resume_id, html_content, enqueued_at, attempts = job
+            handled += 1
+            try:
+                self.handler(resume_id, html_content)
+            except self.retry_on as e:
+                if attempts < self.max_attempts:
+                    delay = self.retry(resume_id, enqueued_at, attempts)
+                    logging.error(f"Thumbnail generation for resume {resume_id} will retry in {delay:.0f}s: {e!r}")
+                    continue
+                logging.error(f"Thumbnail generation for resume {resume_id} abandoned after {attempts} attempts: {e!r}")
+            except Exception as e:
+                logging.error(f"Thumbnail generation failed for resume {resume_id}: {e}")
+            self.complete(resume_id, enqueued_at)
+
+    def start(self):
+        """Start the worker thread for this process if it is not running"""
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._worker = threading.Thread(target=self._run, name='thumbnail-worker', daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            self.run_pending()
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
@@ -0,0 +1,90 @@
+"""
+Short-TTL identity cache for the login user loader
+Each worker keeps column values for recently seen users. Invalidating a user
+drops the local entry and touches a shared epoch file; every worker checks the
+file's mtime on lookup and clears its cache when another worker has written.
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+
+
+class UserCache:
+    """Per-process TTL cache of user column values with cross-process invalidation"""
+
+    def __init__(self, ttl=30, max_entries=10000, epoch_path=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.epoch_path = epoch_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._epoch = self._read_epoch()
+        self.route_stats = {}
+
+    def _read_epoch(self):
+        if not self.epoch_path:
+            return None
+        try:
+            return os.stat(self.epoch_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _check_epoch(self):
+        epoch = self._read_epoch()
+        if epoch != self._epoch:
+            self._epoch = epoch
+            self._entries.clear()
+
+    def get(self, user_id):
+        with self._lock:
+            self._check_epoch()
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            values, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return values
+
+    def set(self, user_id, values):
+        with self._lock:
+            self._entries[user_id] = (values, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        """Drop a user here and signal every other worker to drop its cache"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            if self.epoch_path:
+                try:
+                    with open(self.epoch_path, 'a'):
+                        os.utime(self.epoch_path, None)
+                except OSError:
+                    pass
+                self._epoch = self._read_epoch()
+
+    def record(self, route, hit, db_seconds=0.0):
+        """Count a lookup for a route; misses also record the DB load time"""
+        with self._lock:
+            stats = self.route_stats.setdefault(route, {'hits': 0, 'misses': 0, 'db_seconds': 0.0})
+            stats['hits' if hit else 'misses'] += 1
+            stats['db_seconds'] += db_seconds
+
+    def stats(self):
+        with self._lock:
+            routes = {}
+            for route, stats in self.route_stats.items():
+                avg_ms = stats['db_seconds'] * 1000 / stats['misses'] if stats['misses'] else 0.0
+                routes[route] = {
+                    'hits': stats['hits'],
+                    'misses': stats['misses'],
+                    'avg_db_ms': round(avg_ms, 3),
+                    'db_ms_saved': round(avg_ms * stats['hits'], 3),
+                }
+            return {'entries': len(self._entries), 'routes': routes}
@@ -0,0 +1,67 @@
+// Posts a form to a /stream/* endpoint and reads the server-sent events as they arrive.
+// handlers: onToken(text), onDone(payload), onError(message)
+function supportsGenerationStream() {
+    return !!(window.fetch && window.ReadableStream && window.TextDecoder);
+}
+
+function streamGeneration(url, form, handlers, fallbackError) {
+    return fetch(url, {
+        method: 'POST',
+        body: new FormData(form)
+    }).then(function(response) {
+        if (!response.ok || !response.body) {
+            return response.json().then(function(data) {
+                handlers.onError(data.error || fallbackError);
+            });
+        }
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let finished = false;
+
+        function handleEvent(raw) {
+            let eventName = 'message';
+            let data = '';
+            raw.split('\n').forEach(function(line) {
+                if (line.startsWith('event: ')) eventName = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            });
+            if (!data) return;
+            const payload = JSON.parse(data);
+            if (eventName === 'done') {
+                finished = true;
+                handlers.onDone(payload);
+            } else if (eventName === 'error') {
+                finished = true;
+                handlers.onError(payload.error || fallbackError);
+            } else if (payload.token) {
+                handlers.onToken(payload.token);
+            }
+        }
+
+        function read() {
+            return reader.read().then(function(result) {
+                if (result.done) {
+                    // The connection closed without a final event
+                    if (!finished) handlers.onError(fallbackError);
+                    return;
+                }
+                buffer += decoder.decode(result.value, { stream: true });
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+                events.forEach(handleEvent);
+                return read();
+            });
+        }
+        return read();
+    }).catch(function() {
+        handlers.onError(fallbackError);
+    });
+}
+
+// Appends streamed text to a <pre> and keeps it scrolled to the end
+function appendStreamToken(output, token) {
+    output.style.display = 'block';
+    output.textContent += token;
+    output.scrollTop = output.scrollHeight;
+}
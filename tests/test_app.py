@@ -1,2 +1,68 @@
+import json
+import time
+
 def test_example():
-    assert 1 + 1 == 2
\ No newline at end of file
+    assert 1 + 1 == 2
+
+
+def parse_events(body):
+    events = []
+    for block in body.split('\n\n'):
+        if not block:
+            continue
+        fields = dict(line.split(': ', 1) for line in block.split('\n'))
+        events.append((fields.get('event'), json.loads(fields['data'])))
+    return events
+
+
+def test_sse_event_framing(app_module):
+    assert app_module.sse_event({'token': 'hi'}) == 'data: {"token": "hi"}\n\n'
+    assert app_module.sse_event({'id': 1}, event='done') == 'event: done\ndata: {"id": 1}\n\n'
+    # Newlines in the payload are JSON-escaped so they cannot end the event early
+    assert app_module.sse_event({'token': 'a\n\nb'}).count('\n\n') == 1
+
+
+def test_sse_response_headers(app_module):
+    with app_module.app.test_request_context():
+        response = app_module.sse_response(iter(['data: {}\n\n']))
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+    assert response.headers['X-Accel-Buffering'] == 'no'
+
+
+def test_stream_interview_qa_sends_tokens_then_done(app_module, client, monkeypatch):
+    monkeypatch.setattr(app_module, 'generate_interview_qa_stream', lambda job_title: iter(['Q1. ', 'Why us?']))
+    response = client.post('/stream/interview-qa', data={'job_title': 'Engineer'})
+    assert response.mimetype == 'text/event-stream'
+    events = parse_events(response.get_data(as_text=True))
+    assert events[:2] == [(None, {'token': 'Q1. '}), (None, {'token': 'Why us?'})]
+    event, payload = events[2]
+    assert event == 'done' and payload['redirect'] == '/interview_qa'
+    with app_module.app.app_context():
+        assert app_module.db.session.get(app_module.InterviewQA, payload['id']).qa == 'Q1. Why us?'
+
+
+def test_stream_reports_errors_as_events(app_module, client, monkeypatch):
+    def failing(job_title):
+        yield 'partial'
+        raise RuntimeError('upstream closed')
+
+    monkeypatch.setattr(app_module, 'generate_interview_qa_stream', failing)
+    events = parse_events(client.post('/stream/interview-qa', data={'job_title': 'Engineer'}).get_data(as_text=True))
+    assert events[0] == (None, {'token': 'partial'})
+    assert events[-1][0] == 'error'
+    assert client.post('/stream/interview-qa', data={'job_title': ''}).status_code == 400
+
+
+def test_quiet_stream_sends_keepalive_comments(app_module, client, monkeypatch):
+    def slow(job_title):
+        time.sleep(0.15)
+        yield 'Q1'
+
+    monkeypatch.setattr(app_module, 'SSE_HEARTBEAT_INTERVAL', 0.05)
+    monkeypatch.setattr(app_module, 'generate_interview_qa_stream', slow)
+    body = client.post('/stream/interview-qa', data={'job_title': 'Engineer'}).get_data(as_text=True)
+    assert body.startswith(': keepalive\n\n')
+    events = parse_events(body.replace(': keepalive\n\n', ''))
+    assert events[0] == (None, {'token': 'Q1'})
+    assert events[-1][0] == 'done'
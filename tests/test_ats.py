@@ -0,0 +1,61 @@
+from resume.ats import analyze_resume_text, extract_skills, find_sections
+
+RESUME = """Jane Doe
+jane@example.com | (555) 123-4567
+
+PROFESSIONAL SUMMARY
+Backend engineer with 6 years building Python services.
+
+SKILLS
+Python, Django, PostgreSQL, AWS, Docker, CI/CD
+
+WORK EXPERIENCE
+Senior Engineer, Acme (2019-2024)
+- Led the migration to Kubernetes, reducing costs by 30%
+- Built REST APIs serving 2M requests per day
+- Mentored 4 engineers
+
+EDUCATION
+B.S. Computer Science
+"""
+
+
+def test_extract_skills_matches_aliases_and_phrases():
+    skills = extract_skills('Shipped Node.js and C++ services on k8s with GitHub Actions; used Python/Django.')
+    assert skills == {'Node.js', 'C++', 'Kubernetes', 'CI/CD', 'Python', 'Django'}
+    assert extract_skills('took a rest after the sprint') == set()
+    assert extract_skills('I will go to market') == set()
+    assert extract_skills('Worked as a security guard; testing new shift schedules') == set()
+    assert extract_skills('Redesigned the spring catalogue UI at each store node') == set()
+    assert extract_skills('Golang, Spring Boot and integration testing') == {'Go', 'Spring', 'Testing'}
+
+
+def test_extract_skills_ignores_everyday_uses_of_skill_names():
+    for text in ['I excel at building teams', 'Praised for swift delivery of orders', 'Handled rust removal on the fleet',
+                 'Measured 500 ml doses', 'Managed the sales floor', 'Sales associate; ML dosing']:
+        assert extract_skills(text) == set(), text
+    assert extract_skills('SwiftUI apps, Rust lang services, MS Excel pivot tables, machine learning, B2B sales') == {
+        'Swift', 'Rust', 'Excel', 'Machine Learning', 'Sales'}
+
+
+def test_find_sections_recognises_headers():
+    sections = find_sections(RESUME.splitlines())
+    assert set(sections) == {'summary', 'skills', 'experience', 'education'}
+    assert sections['education'] == ['B.S. Computer Science']
+
+
+def test_analysis_is_deterministic_and_uses_job_description():
+    result = analyze_resume_text(RESUME, 'Python engineer with AWS and Terraform')
+    assert result == analyze_resume_text(RESUME, 'Python engineer with AWS and Terraform')
+    assert result['missing_keywords'] == ['Terraform']
+    assert result['breakdown']['keywords'] == 67
+    assert result['checks']['quantified_results'] and result['checks']['action_verbs']
+    assert not result['checks']['length']
+    assert 0 < result['score'] < 100
+
+
+def test_empty_resume_scores_low_with_recommendations():
+    result = analyze_resume_text('')
+    assert result['score'] < 20
+    assert result['missing_sections'] == ['experience', 'education', 'skills', 'summary']
+    assert result['recommendations']
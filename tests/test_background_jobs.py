@@ -0,0 +1,191 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+
+def add_account_data(app_module, user_id):
+    with app_module.app.app_context():
+        db = app_module.db
+        db.session.add_all([
+            app_module.Resume(user_id=user_id, title='Resume', content='Python engineer'),
+            app_module.CoverLetter(user_id=user_id, job_title='Engineer', content='Dear team'),
+            app_module.SavedJob(user_id=user_id, title='Engineer', company='Acme', location='Boston', url='https://a/1'),
+            app_module.InterviewQA(user_id=user_id, job_title='Engineer', qa='Q&A'),
+        ])
+        db.session.commit()
+
+
+def add_job(app_module, user_id, kind='delete_account', status='queued'):
+    with app_module.app.app_context():
+        job = app_module.BackgroundJob(user_id=user_id, kind=kind, status=status, params=json.dumps({}))
+        app_module.db.session.add(job)
+        app_module.db.session.commit()
+        return job.id
+
+
+def load_job(app_module, job_id):
+    with app_module.app.app_context():
+        job = app_module.db.session.get(app_module.BackgroundJob, job_id)
+        return job and {'status': job.status, 'user_id': job.user_id, 'error': job.error, 'attempts': job.attempts,
+                        'result': json.loads(job.result) if job.result else None}
+
+
+@pytest.fixture
+def manual_jobs(app_module, monkeypatch):
+    """Keep the app's pool and sweeper away from jobs so tests run them synchronously"""
+    dispatched = []
+    monkeypatch.setattr(app_module.background_jobs, 'dispatch', dispatched.append)
+    monkeypatch.setattr(app_module.background_jobs, 'sweep', lambda limit: [])
+    return dispatched
+
+
+def make_stale(app_module, job_id, attempts):
+    with app_module.app.app_context():
+        app_module.BackgroundJob.query.filter_by(id=job_id).update({
+            'status': 'running', 'attempts': attempts,
+            'updated_at': datetime.utcnow() - app_module.BACKGROUND_JOB_STALE_AFTER - timedelta(seconds=1),
+        }, synchronize_session=False)
+        app_module.db.session.commit()
+
+
+def owned_rows(app_module, user_id):
+    with app_module.app.app_context():
+        return {model.__tablename__: model.query.filter_by(user_id=user_id).count()
+                for model in (app_module.Resume, app_module.CoverLetter, app_module.SavedJob, app_module.InterviewQA)}
+
+
+def test_delete_account_removes_user_and_everything_they_own(app_module, user):
+    add_account_data(app_module, user)
+    finished = add_job(app_module, user, kind='cover_letter', status='succeeded')
+    job_id = add_job(app_module, user)
+    app_module.run_background_job(job_id)
+
+    job = load_job(app_module, job_id)
+    assert job['status'] == 'succeeded' and job['user_id'] is None
+    assert job['result'] == {'deleted': True, 'counts': {'resume': 1, 'cover_letter': 1, 'saved_job': 1, 'interview_qa': 1}}
+    assert set(owned_rows(app_module, user).values()) == {0}
+    assert load_job(app_module, finished) is None
+    with app_module.app.app_context():
+        assert app_module.db.session.get(app_module.User, user) is None
+
+
+def test_failure_mid_delete_leaves_account_intact(app_module, user, monkeypatch):
+    add_account_data(app_module, user)
+    checks = []
+
+    def fail_after_rows_are_deleted(job):
+        # The first check is the wait before deleting; the second runs after every table delete
+        checks.append(job.id)
+        if len(checks) > 1:
+            raise RuntimeError('connection lost')
+        return 0
+
+    monkeypatch.setattr(app_module, 'other_running_jobs', fail_after_rows_are_deleted)
+    job_id = add_job(app_module, user)
+    app_module.run_background_job(job_id)
+
+    job = load_job(app_module, job_id)
+    assert job['status'] == 'failed' and 'connection lost' in job['error']
+    assert owned_rows(app_module, user) == {'resume': 1, 'cover_letter': 1, 'saved_job': 1, 'interview_qa': 1}
+    with app_module.app.app_context():
+        assert app_module.db.session.get(app_module.User, user) is not None
+
+
+def test_delete_waits_for_running_jobs_and_fails_without_touching_them(app_module, user, monkeypatch):
+    add_account_data(app_module, user)
+    running = add_job(app_module, user, kind='cover_letter', status='running')
+    monkeypatch.setattr(app_module, 'DELETE_ACCOUNT_WAIT', 0)
+    job_id = add_job(app_module, user)
+    app_module.run_background_job(job_id)
+
+    job = load_job(app_module, job_id)
+    assert job['status'] == 'failed' and 'still running' in job['error']
+    assert load_job(app_module, running)['status'] == 'running'
+    assert owned_rows(app_module, user)['resume'] == 1
+
+
+def test_failed_job_that_was_deleted_meanwhile_is_ignored(app_module, user, monkeypatch):
+    job_id = add_job(app_module, user, kind='interview_qa')
+
+    def delete_then_fail(job, params):
+        app_module.BackgroundJob.query.filter_by(id=job.id).delete()
+        app_module.db.session.commit()
+        raise RuntimeError('upstream error')
+
+    monkeypatch.setitem(app_module.BACKGROUND_JOB_HANDLERS, 'interview_qa', delete_then_fail)
+    app_module.run_background_job(job_id)
+    assert load_job(app_module, job_id) is None
+
+
+def test_job_api_reports_success(app_module, user, client, manual_jobs, monkeypatch):
+    monkeypatch.setattr(app_module, 'generate_interview_qa', lambda job_title: f'Q&A for {job_title}')
+    response = client.post('/api/interview-qa', json={'job_title': 'Engineer'})
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+    assert manual_jobs == [job_id]
+    status_url = response.get_json()['status_url']
+    assert client.get(status_url).get_json()['status'] == 'queued'
+
+    app_module.run_background_job(job_id)
+    data = client.get(status_url).get_json()
+    assert (data['status'], data['progress'], data['error']) == ('succeeded', 100, None)
+    assert data['result']['qa'] == 'Q&A for Engineer'
+    assert load_job(app_module, job_id)['attempts'] == 1
+    # Already finished, so running it again does nothing
+    app_module.run_background_job(job_id)
+    assert owned_rows(app_module, user)['interview_qa'] == 1
+
+
+def test_job_api_reports_failure_and_hides_other_users_jobs(app_module, user, client, manual_jobs, monkeypatch):
+    def failing(job_title):
+        raise RuntimeError('upstream error')
+
+    monkeypatch.setattr(app_module, 'generate_interview_qa', failing)
+    job_id = client.post('/api/interview-qa', json={'job_title': 'Engineer'}).get_json()['job_id']
+    app_module.run_background_job(job_id)
+    data = client.get(f'/api/jobs/{job_id}').get_json()
+    assert (data['status'], data['error'], data['result']) == ('failed', 'upstream error', None)
+    assert owned_rows(app_module, user)['interview_qa'] == 0
+
+    with app_module.app.app_context():
+        other = app_module.User(email='other-jobs@example.com', password='x', name='Other')
+        app_module.db.session.add(other)
+        app_module.db.session.commit()
+        other_job = add_job(app_module, other.id, kind='interview_qa')
+    assert client.get(f'/api/jobs/{other_job}').status_code == 404
+    assert client.get('/api/jobs/missing').status_code == 404
+
+
+def test_superseded_attempt_discards_its_result(app_module, user, manual_jobs, monkeypatch):
+    job_id = add_job(app_module, user, kind='interview_qa', status='queued')
+
+    def generate_while_requeued(job_title):
+        # The sweep took this job for stale and another worker claimed it meanwhile
+        make_stale(app_module, job_id, attempts=2)
+        return 'late Q&A'
+
+    monkeypatch.setattr(app_module, 'generate_interview_qa', generate_while_requeued)
+    with app_module.app.app_context():
+        app_module.BackgroundJob.query.filter_by(id=job_id).update({'params': json.dumps({'job_title': 'Engineer'})})
+        app_module.db.session.commit()
+    app_module.run_background_job(job_id)
+
+    job = load_job(app_module, job_id)
+    assert (job['status'], job['attempts'], job['result']) == ('running', 2, None)
+    assert owned_rows(app_module, user)['interview_qa'] == 0
+
+
+def test_sweep_requeues_stale_jobs_until_attempts_run_out(app_module, user, manual_jobs):
+    retry = add_job(app_module, user, kind='interview_qa')
+    exhausted = add_job(app_module, user, kind='interview_qa')
+    fresh = add_job(app_module, user, kind='interview_qa', status='running')
+    make_stale(app_module, retry, attempts=1)
+    make_stale(app_module, exhausted, attempts=app_module.BACKGROUND_JOB_MAX_ATTEMPTS)
+
+    queued = app_module.sweep_background_jobs(100)
+    assert retry in queued and exhausted not in queued and fresh not in queued
+    assert load_job(app_module, retry)['status'] == 'queued'
+    job = load_job(app_module, exhausted)
+    assert job['status'] == 'failed' and 'too many times' in job['error']
+    assert load_job(app_module, fresh)['status'] == 'running'
@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+pytest.importorskip('sqlalchemy')
+
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from resume.db_pool import PoolMetrics, engine_options, statement_timeout_listener
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql):
+        self.connection.executed.append((sql, self.connection.autocommit))
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.autocommit = False
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_engine_options_read_pool_settings(monkeypatch):
+    monkeypatch.setenv('DB_POOL_SIZE', '3')
+    monkeypatch.setenv('DB_POOL_PRE_PING', 'false')
+    options = engine_options('sqlite:///app.db', PoolMetrics())
+    assert issubclass(options['poolclass'], QueuePool)
+    assert options['pool_size'] == 3 and options['max_overflow'] == 10
+    assert options['pool_pre_ping'] is False
+    assert 'connect_args' not in options
+
+
+def test_postgres_statement_timeout_is_set_after_connecting(monkeypatch):
+    monkeypatch.setenv('DB_STATEMENT_TIMEOUT_MS', '5000')
+    options = engine_options('postgresql://user@localhost/db', PoolMetrics())
+    # No libpq startup "options", which PgBouncer rejects
+    assert 'connect_args' not in options
+
+    pool = options['poolclass'](FakeConnection, pool_size=1, max_overflow=0)
+    checked_out = pool.connect()
+    connection = checked_out.dbapi_connection
+    checked_out.close()
+    assert connection.executed == [('SET statement_timeout = 5000', True)]
+    assert connection.autocommit is False
+
+
+def test_statement_timeout_can_be_disabled(monkeypatch):
+    monkeypatch.setenv('DB_STATEMENT_TIMEOUT_MS', '0')
+    options = engine_options('postgresql://user@localhost/db', PoolMetrics())
+    pool = options['poolclass'](FakeConnection, pool_size=1, max_overflow=0)
+    checked_out = pool.connect()
+    assert checked_out.dbapi_connection.executed == []
+    checked_out.close()
+
+
+def test_pool_records_checkout_waits_and_timeouts(tmp_path, monkeypatch):
+    monkeypatch.setenv('DB_POOL_SIZE', '1')
+    monkeypatch.setenv('DB_POOL_MAX_OVERFLOW', '0')
+    monkeypatch.setenv('DB_POOL_TIMEOUT', '0.1')
+    metrics = PoolMetrics()
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", **engine_options('sqlite://', metrics))
+    try:
+        held = engine.connect()
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        released = threading.Timer(0.05, held.close)
+        released.start()
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+        released.join()
+    finally:
+        engine.dispose()
+    snapshot = metrics.snapshot(engine.pool)
+    assert snapshot['timeouts'] == 1
+    assert snapshot['checkouts'] == 2
+    assert snapshot['max_wait_ms'] >= 100
+    assert snapshot['pool_size'] == 1
@@ -0,0 +1,110 @@
+import io
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+fitz = pytest.importorskip('fitz')
+docx = pytest.importorskip('docx')
+
+from resume import file_parser
+from resume.file_parser import extract_sections, iter_resume_text, open_upload, page_ranges, parse_resume_file, register_section_keywords, section_header_pattern
+
+
+def make_pdf(pages):
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_docx(paragraphs):
+    document = docx.Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class NonSeekable(io.RawIOBase):
+    def __init__(self, data):
+        self._buffer = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        return self._buffer.readinto(b)
+
+
+def test_open_upload_accepts_bytes_and_non_seekable_streams():
+    assert open_upload(b'abc').read() == b'abc'
+    spooled = open_upload(NonSeekable(b'abc'))
+    assert spooled.seekable() and spooled.read() == b'abc'
+
+
+def test_parses_pdf_and_docx_from_memory():
+    pdf = parse_resume_file(make_pdf(['Jane Doe', 'EXPERIENCE']), 'resume.pdf')
+    assert 'Jane Doe' in pdf['raw_text']
+    document = parse_resume_file(io.BytesIO(make_docx(['Jane Doe', 'SKILLS', 'Python'])), 'resume.docx')
+    assert document['raw_text'] == 'Jane Doe\nSKILLS\nPython'
+
+
+def test_iter_resume_text_yields_pages_and_can_stop_early():
+    data = make_pdf(['Page one', 'Page two', 'Page three'])
+    chunks = iter_resume_text(data, 'resume.pdf')
+    assert 'Page one' in next(chunks)
+    chunks.close()
+    assert len(list(iter_resume_text(data, 'resume.pdf'))) == 3
+    assert list(iter_resume_text(make_docx(['a', 'b']), 'resume.docx')) == ['a\n', 'b\n']
+
+
+def test_page_ranges_cover_every_page_in_order():
+    assert page_ranges(10, 4) == [(0, 3), (3, 6), (6, 9), (9, 10)]
+    assert page_ranges(2, 4) == [(0, 1), (1, 2)]
+
+
+def test_parallel_extraction_keeps_page_order(monkeypatch):
+    monkeypatch.setattr(file_parser, 'PDF_PARALLEL_MIN_PAGES', 2)
+    monkeypatch.setattr(file_parser, 'PDF_EXTRACT_WORKERS', 2)
+    pages = [f'Page {n}' for n in range(6)]
+    chunks = list(file_parser.iter_pdf_text(io.BytesIO(make_pdf(pages))))
+    assert [chunk.strip() for chunk in chunks] == pages
+
+
+def test_broken_extraction_pool_is_replaced(monkeypatch):
+    monkeypatch.setattr(file_parser, 'PDF_PARALLEL_MIN_PAGES', 2)
+    monkeypatch.setattr(file_parser, 'PDF_EXTRACT_WORKERS', 2)
+    pages = [f'Page {n}' for n in range(4)]
+    data = make_pdf(pages)
+    broken = file_parser._get_extract_executor()
+    with pytest.raises(BrokenProcessPool):
+        broken.submit(os._exit, 1).result(timeout=30)
+
+    # Falls back to serial extraction and drops the broken pool
+    assert [chunk.strip() for chunk in file_parser.iter_pdf_text(data)] == pages
+    assert file_parser._extract_executor is not broken
+
+    assert [chunk.strip() for chunk in file_parser.iter_pdf_text(data)] == pages
+    assert file_parser._extract_executor not in (None, broken)
+
+
+def test_extract_sections_matches_headers_case_insensitively():
+    lines = ['Jane Doe', 'PROFESSIONAL EXPERIENCE', 'Engineer at Acme', 'Education', 'B.S.',
+             'I have experience with a very long list of technologies and practices']
+    sections = extract_sections(lines)
+    assert [s['title'] for s in sections] == ['Professional Summary', 'PROFESSIONAL EXPERIENCE', 'Education']
+    assert sections[2]['content'] == 'B.S.\nI have experience with a very long list of technologies and practices'
+
+
+def test_extract_sections_per_locale():
+    lines = ['Experiencia laboral', 'Ingeniera en Acme', 'Formación', 'Ingeniería']
+    assert [s['title'] for s in extract_sections(lines, locales=('es',))] == ['Experiencia laboral', 'Formación']
+    pattern = section_header_pattern(('en', 'fr'))
+    assert pattern.search('profil') and pattern.search('profile') and not pattern.search('prof')
+    register_section_keywords('test', ['werdegang'])
+    assert extract_sections(['Werdegang', 'Acme'], locales=('test',)) == [{'title': 'Werdegang', 'content': 'Acme'}]
@@ -0,0 +1,44 @@
+import time
+
+from resume.generation_cache import (
+    GenerationCache, MemoryBackend, SQLiteBackend, generation_cache_key
+)
+
+
+def test_key_ignores_whitespace_and_case():
+    assert generation_cache_key('gpt-4', '  Software   Engineer\n') == generation_cache_key('gpt-4', 'software engineer')
+    assert generation_cache_key('gpt-4', 'x') != generation_cache_key('gpt-3.5-turbo', 'x')
+
+
+def test_memory_backend_lru_and_counters():
+    cache = GenerationCache(MemoryBackend(max_entries=2), ttl=60)
+    cache.set('gpt-4', 'a', 'A')
+    cache.set('gpt-4', 'b', 'B')
+    assert cache.get('gpt-4', 'a') == 'A'
+    cache.set('gpt-4', 'c', 'C')
+    assert cache.get('gpt-4', 'b') is None
+    assert cache.get('gpt-4', 'c') == 'C'
+    stats = cache.stats()
+    assert stats['hits'] == 2 and stats['misses'] == 1
+
+
+def test_memory_backend_ttl():
+    backend = MemoryBackend()
+    backend.set('k', 'v', ttl=-1)
+    assert backend.get('k') is None
+
+
+def test_sqlite_backend_shared_and_bounded(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    writer = SQLiteBackend(path, max_entries=2)
+    reader = SQLiteBackend(path, max_entries=2)
+    writer.set('a', 'A', 60)
+    time.sleep(0.01)
+    writer.set('b', 'B', 60)
+    time.sleep(0.01)
+    writer.set('c', 'C', 60)
+    assert reader.get('a') is None
+    assert reader.get('b') == 'B'
+    assert reader.get('c') == 'C'
+    writer.set('d', 'D', -1)
+    assert reader.get('d') is None
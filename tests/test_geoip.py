@@ -0,0 +1,74 @@
+import gzip
+
+from resume.geoip import IpLocationDatabase
+
+
+ROWS = [
+    ['8.8.8.0', '8.8.8.255', 'NA', 'US', 'California', 'Mountain View'],
+    ['1.0.0.0', '1.0.0.255', 'OC', 'AU', 'Queensland', 'South Brisbane'],
+    ['2001:4860::', '2001:4860:ffff:ffff:ffff:ffff:ffff:ffff', 'NA', 'US', 'California', 'Mountain View'],
+]
+
+
+def test_lookup_uses_sorted_ranges():
+    db = IpLocationDatabase()
+    db.load_rows(ROWS)
+    assert db.lookup('8.8.8.8') == 'Mountain View, California'
+    assert db.lookup('1.0.0.1') == 'South Brisbane, Queensland'
+    assert db.lookup('::ffff:8.8.8.8') == 'Mountain View, California'
+    assert db.lookup('2001:4860::8888') == 'Mountain View, California'
+    assert db.lookup('8.8.9.1') is None
+
+
+def test_private_and_invalid_addresses_are_not_looked_up():
+    db = IpLocationDatabase()
+    db.load_rows(ROWS)
+    assert db.lookup('127.0.0.1') is None
+    assert db.lookup('10.1.2.3') is None
+    assert db.lookup('not-an-ip') is None
+    assert db.lookup(None) is None
+
+
+def test_loads_gzipped_csv_and_tolerates_missing_file(tmp_path):
+    path = tmp_path / 'dbip.csv.gz'
+    with gzip.open(path, 'wt') as f:
+        f.write('8.8.8.0,8.8.8.255,NA,US,California,"Mountain View",37.4,-122.1\n')
+    db = IpLocationDatabase(str(path))
+    db.load()
+    assert db.lookup('8.8.8.8') == 'Mountain View, California'
+    assert db.stats()['status'] == 'loaded' and db.stats()['ranges'] == 1
+
+
+def test_missing_file_warns_and_serves_no_locations(tmp_path, caplog):
+    missing = IpLocationDatabase(str(tmp_path / 'missing.csv'))
+    with caplog.at_level('WARNING'):
+        missing.load()
+    assert 'not found' in caplog.text and 'GEOIP_DB_PATH' in caplog.text
+    assert missing.ready and missing.lookup('8.8.8.8') is None
+    assert missing.stats() == {'path': str(tmp_path / 'missing.csv'), 'status': 'missing', 'ranges': 0}
+
+
+def test_lookup_returns_none_until_background_load_finishes(tmp_path):
+    path = tmp_path / 'dbip.csv'
+    path.write_text('8.8.8.0,8.8.8.255,NA,US,California,Mountain View\n')
+    db = IpLocationDatabase(str(path))
+    assert not db.ready
+    assert db.lookup('8.8.8.8') is None
+    db.start()
+    db._loader.join(5)
+    assert db.ready
+    assert db.lookup('8.8.8.8') == 'Mountain View, California'
+
+
+def test_unsorted_rows_share_location_strings():
+    db = IpLocationDatabase()
+    db.load_rows([
+        ['9.9.9.0', '9.9.9.255', 'NA', 'US', 'California', 'Mountain View'],
+        ['8.8.8.0', '8.8.8.255', 'NA', 'US', 'California', 'Mountain View'],
+        ['2.0.0.0', '2.0.0.255', 'EU', 'FR', 'Ile-de-France', 'Paris'],
+    ])
+    table = db._tables[4]
+    assert table.names == ['Mountain View, California', 'Paris, Ile-de-France']
+    assert list(table.location_ids) == [1, 0, 0]
+    assert db.lookup('2.0.0.7') == 'Paris, Ile-de-France'
+    assert db.lookup('9.9.9.9') == 'Mountain View, California'
@@ -0,0 +1,63 @@
+import re
+from datetime import datetime, timedelta
+
+
+def add_entries(app_module, user_id, count):
+    base = datetime(2024, 1, 1)
+    with app_module.app.app_context():
+        entries = [app_module.InterviewQA(user_id=user_id, job_title=f'Role {n}', qa=f'Answer {n}',
+                                          created_at=base + timedelta(minutes=n)) for n in range(count)]
+        app_module.db.session.add_all(entries)
+        app_module.db.session.commit()
+        return [entry.id for entry in entries]
+
+
+def listed_ids(body):
+    return [int(qa_id) for qa_id in re.findall(r'data-qa-id="(\d+)"', body)]
+
+
+def test_legacy_session_entries_move_to_the_database(app_module, user, client):
+    with client.session_transaction() as session:
+        session['interview_qa_list'] = [
+            {'job_title': 'Engineer', 'qa': 'Q1. Why us?'},
+            {'job_title': 'Empty', 'qa': ''},
+            'not a dict',
+        ]
+    body = client.get('/interview_qa').get_data(as_text=True)
+    with app_module.app.app_context():
+        rows = app_module.InterviewQA.query.filter_by(user_id=user).all()
+        assert [(row.job_title, row.qa) for row in rows] == [('Engineer', 'Q1. Why us?')]
+        assert listed_ids(body) == [rows[0].id]
+    with client.session_transaction() as session:
+        assert 'interview_qa_list' not in session
+    # The session copy is gone, so a second visit does not import it again
+    client.get('/interview_qa')
+    with app_module.app.app_context():
+        assert app_module.InterviewQA.query.filter_by(user_id=user).count() == 1
+
+
+def test_entries_are_paginated_newest_first(app_module, user, client):
+    per_page = app_module.INTERVIEW_QA_PER_PAGE
+    ids = add_entries(app_module, user, per_page + 3)
+    newest_first = ids[::-1]
+    assert listed_ids(client.get('/interview_qa').get_data(as_text=True)) == newest_first[:per_page]
+    assert listed_ids(client.get('/interview_qa?page=2').get_data(as_text=True)) == newest_first[per_page:]
+    assert listed_ids(client.get('/interview_qa?page=3').get_data(as_text=True)) == []
+
+
+def test_delete_only_removes_own_entries(app_module, user, client):
+    with app_module.app.app_context():
+        other = app_module.User(email=f'other-qa-{user}@example.com', password='x', name='Other')
+        app_module.db.session.add(other)
+        app_module.db.session.commit()
+        other_id = other.id
+    own, = add_entries(app_module, user, 1)
+    theirs, = add_entries(app_module, other_id, 1)
+
+    response = client.post(f'/interview-qa/{theirs}/delete')
+    assert response.status_code == 404
+    assert client.post('/interview-qa/999999/delete').get_json() == response.get_json()
+    assert client.post(f'/interview-qa/{own}/delete').status_code == 200
+    with app_module.app.app_context():
+        assert app_module.db.session.get(app_module.InterviewQA, own) is None
+        assert app_module.db.session.get(app_module.InterviewQA, theirs) is not None
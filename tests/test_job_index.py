@@ -0,0 +1,66 @@
+from resume.job_index import JobIndex, fts_query
+
+
+def listing(title, company, location, url, description='', salary_min=None, salary_max=None):
+    return {
+        'title': title,
+        'company': {'display_name': company},
+        'location': {'display_name': location},
+        'redirect_url': url,
+        'description': description,
+        'salary_min': salary_min,
+        'salary_max': salary_max,
+    }
+
+
+def make_index(tmp_path):
+    index = JobIndex(str(tmp_path / 'jobs.db'))
+    index.add_listings([
+        listing('Python Developer', 'Acme', 'Boston, MA', 'https://a/1', 'Django and Flask', 90000, 120000),
+        listing('Data Engineer', 'Initech', 'Austin, TX', 'https://a/2', 'Python pipelines', 130000, 160000),
+        listing('Sales Manager', 'Globex', 'Boston, MA', 'https://a/3', 'Quota carrying', 70000, 80000),
+    ])
+    index.reindex_user(1, [{'title': 'Pythonista', 'company': 'Hooli', 'location': 'Remote', 'url': 'https://s/1'}])
+    return index
+
+
+def test_fts_query_quotes_prefix_terms():
+    assert fts_query('pyth dev"; DROP') == '"pyth"* "dev"* "DROP"*'
+    assert fts_query('  ') == ''
+
+
+def test_ranked_prefix_search(tmp_path):
+    index = make_index(tmp_path)
+    results = index.search(1, 'pyth')
+    assert {r['url'] for r in results[:2]} == {'https://a/1', 'https://s/1'}
+    assert results[-1]['url'] == 'https://a/2'
+    assert {r['url'] for r in index.search(2, 'pyth')} == {'https://a/1', 'https://a/2'}
+
+
+def test_location_and_salary_filters(tmp_path):
+    index = make_index(tmp_path)
+    assert [r['url'] for r in index.search(1, location='boston', salary_min=100000)] == ['https://a/1']
+    assert [r['url'] for r in index.search(1, salary_min=85000, salary_max=125000)] == ['https://a/1']
+    assert [r['url'] for r in index.search(1, saved_only=True)] == ['https://s/1']
+
+
+def test_reindexing_updates_and_remove_user(tmp_path):
+    index = make_index(tmp_path)
+    index.add_listings([listing('Senior Python Developer', 'Acme', 'Boston, MA', 'https://a/1')])
+    result = index.search(1, 'senior')[0]
+    assert result['description'] == 'Django and Flask' and result['salary_min'] == 90000
+    assert index.has_user(1)
+    index.remove_user(1)
+    assert not index.has_user(1) and index.search(1, saved_only=True) == []
+
+
+def test_search_api_validates_query_parameters(client):
+    assert client.get('/api/jobs/search?q=python&salary_min=80000&salary_max=120000').status_code == 200
+    assert client.get('/api/jobs/search?salary_min=').status_code == 200
+    for query in ('salary_min=80k', 'salary_max=nan', 'salary_min=-5', 'salary_min=90000&salary_max=50000'):
+        response = client.get(f'/api/jobs/search?{query}')
+        assert response.status_code == 400, query
+        assert 'salary' in response.get_json()['error']
+    response = client.get('/api/jobs/search?limit=ten')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'limit and offset must be integers'
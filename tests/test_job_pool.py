@@ -0,0 +1,21 @@
+import threading
+
+from resume.job_pool import JobPool
+
+
+def test_dispatch_runs_jobs_and_rejects_when_saturated():
+    release = threading.Event()
+    ran = []
+
+    def runner(job_id):
+        release.wait(5)
+        ran.append(job_id)
+
+    pool = JobPool(runner, max_workers=1, max_pending=1)
+    assert pool.dispatch('a')
+    assert pool.dispatch('b')
+    assert not pool.dispatch('c')
+    release.set()
+    pool._executor.shutdown(wait=True)
+    assert sorted(ran) == ['a', 'b']
+    assert pool.free_slots() == 2
@@ -0,0 +1,216 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+requests = pytest.importorskip('requests')
+
+from resume import job_search
+from resume.generation_cache import MemoryBackend
+from resume.job_search import AdzunaClient, AdzunaError, JobSearchAggregator, JobSearchTimeout
+
+
+def job(title, company, url, description=''):
+    return {'title': title, 'company': {'display_name': company}, 'redirect_url': url, 'description': description}
+
+
+class FakeClient:
+    def __init__(self, pages, delays=None):
+        self.pages = pages
+        self.delays = delays or {}
+
+    def search(self, keyword, location, page=1, results_per_page=25, country='us'):
+        time.sleep(self.delays.get(page, 0))
+        return {'results': self.pages.get(page, [])}
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self.data = data
+        self.text = json.dumps(data)
+
+    def json(self):
+        return self.data
+
+
+class StubGet:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def __call__(self, url, params=None, timeout=None):
+        self.calls.append((url, params))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def adzuna_server(monkeypatch):
+    """Local HTTP server answering Adzuna searches with a scripted list of statuses"""
+    statuses = []
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.path)
+            status = statuses.pop(0) if statuses else 200
+            body = json.dumps({'results': [{'title': 'Developer'}]} if status == 200 else {'error': 'busy'}).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(job_search, 'ADZUNA_SEARCH_URL',
+                        f'http://127.0.0.1:{server.server_address[1]}/jobs/{{country}}/search/{{page}}')
+    yield statuses, requests_seen
+    server.shutdown()
+    server.server_close()
+
+
+def test_cache_hit_skips_upstream_call():
+    client = AdzunaClient('id', 'key', cache_backend=MemoryBackend())
+    client.session.get = StubGet(FakeResponse(200, {'results': [{'title': 'Developer'}]}))
+    first = client.search('Python  Developer', 'Boston')
+    second = client.search('python developer', 'boston')
+    assert first == second == {'results': [{'title': 'Developer'}]}
+    assert len(client.session.get.calls) == 1
+    url, params = client.session.get.calls[0]
+    assert url.endswith('/us/search/1') and params['what'] == 'Python  Developer'
+    stats = client.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1 and stats['hit_rate'] == 0.5
+    assert stats['upstream_calls'] == 1 and stats['upstream_errors'] == 0
+
+
+def test_upstream_errors_are_counted_and_not_cached():
+    client = AdzunaClient('id', 'key', cache_backend=MemoryBackend())
+    client.session.get = StubGet(
+        FakeResponse(500, {'error': 'down'}),
+        requests.ConnectionError('refused'),
+        FakeResponse(200, {'results': []}),
+    )
+    with pytest.raises(AdzunaError) as excinfo:
+        client.search('python', 'Boston')
+    assert excinfo.value.status_code == 500
+    with pytest.raises(requests.ConnectionError):
+        client.search('python', 'Boston')
+    assert client.search('python', 'Boston') == {'results': []}
+    stats = client.stats()
+    assert stats['upstream_calls'] == 3 and stats['upstream_errors'] == 2
+    assert stats['hits'] == 0 and stats['misses'] == 3
+
+
+def test_throttled_and_failed_requests_are_retried_with_backoff(adzuna_server):
+    statuses, requests_seen = adzuna_server
+    statuses.extend([429, 503])
+    client = AdzunaClient('id', 'key')
+    started = time.monotonic()
+    assert client.search('python', 'Boston') == {'results': [{'title': 'Developer'}]}
+    # urllib3 retries the first failure at once and backs off 2 * 0.5s before the second retry
+    assert time.monotonic() - started >= 0.9
+    assert len(requests_seen) == 3
+    stats = client.stats()
+    assert stats['upstream_calls'] == 1 and stats['upstream_errors'] == 0
+
+
+def test_status_is_reported_once_retries_are_exhausted(adzuna_server):
+    statuses, requests_seen = adzuna_server
+    statuses.extend([502] * 4)
+    client = AdzunaClient('id', 'key')
+    for adapter in client.session.adapters.values():
+        adapter.max_retries = adapter.max_retries.new(backoff_factor=0)
+    with pytest.raises(AdzunaError) as excinfo:
+        client.search('python', 'Boston')
+    assert excinfo.value.status_code == 502
+    assert len(requests_seen) == 4
+    assert client.stats()['upstream_errors'] == 1
+
+
+def test_merges_dedupes_and_ranks_pages():
+    client = FakeClient({
+        1: [job('Sales Lead', 'Acme', 'https://a/1'), job('Python Developer', 'Acme', 'https://a/2')],
+        2: [job('Python Developer', 'Acme', 'https://a/2'), job('python developer', ' acme ', 'https://b/9')],
+        3: [job('Senior Python Developer', 'Initech', 'https://c/1')],
+    })
+    result = JobSearchAggregator(client, budget=2).search('python developer', 'Boston', pages=3)
+    titles = [j['title'] for j in result['results']]
+    assert titles == ['Python Developer', 'Senior Python Developer', 'Sales Lead']
+    assert result['completed'] == 3 and result['late'] == 0
+    assert JobSearchAggregator(client).stats()['searches'] == 0
+
+
+def test_late_pages_are_dropped():
+    client = FakeClient({1: [job('Developer', 'Acme', 'https://a/1')], 2: [job('Engineer', 'Initech', 'https://b/1')]}, delays={2: 1.0})
+    aggregator = JobSearchAggregator(client, budget=0.2)
+    started = time.monotonic()
+    result = aggregator.search('developer', 'Boston', pages=2)
+    assert time.monotonic() - started < 0.8
+    assert [j['title'] for j in result['results']] == ['Developer']
+    assert result['late'] == 1 and aggregator.stats()['requests_late'] == 1
+
+
+def test_all_late_raises_timeout():
+    client = FakeClient({1: [job('Developer', 'Acme', 'https://a/1')]}, delays={1: 0.5, 2: 0.5})
+    aggregator = JobSearchAggregator(client, budget=0.05)
+    with pytest.raises(JobSearchTimeout) as excinfo:
+        aggregator.search('developer', 'Boston', pages=2)
+    assert excinfo.value.late == 2
+    assert aggregator.stats()['requests_late'] == 2
+
+
+def test_jobs_page_reports_timeout(app_module, client, monkeypatch):
+    def timed_out(*args, **kwargs):
+        raise JobSearchTimeout(3, 2.5)
+
+    monkeypatch.setattr(app_module.job_search, 'search', timed_out)
+    body = client.get('/jobs?keyword=python&location=Boston').get_data(as_text=True)
+    assert 'Job search is taking longer than usual' in body
+
+
+def saved_jobs(app_module, user_id):
+    with app_module.app.app_context():
+        return [(job.title, job.url) for job in app_module.SavedJob.query.filter_by(user_id=user_id).all()]
+
+
+def save_form(url, title='Python Developer'):
+    return {'title': title, 'company': 'Acme', 'location': 'Boston', 'url': url}
+
+
+def test_saving_a_job_twice_keeps_one_row(app_module, user, client):
+    for title in ['Python Developer', 'Python Developer (updated)']:
+        response = client.post('/save-job', data=save_form('https://jobs.example/1', title))
+        assert response.status_code == 302 and response.headers['Location'].endswith('/find-jobs')
+    # The first save wins; the repeat is a no-op rather than an error
+    assert saved_jobs(app_module, user) == [('Python Developer', 'https://jobs.example/1')]
+    client.post('/save-job', data=save_form('https://jobs.example/2'))
+    assert len(saved_jobs(app_module, user)) == 2
+
+
+def test_concurrent_saves_of_one_job_keep_one_row(app_module, user, client):
+    statuses = []
+
+    def save():
+        worker = app_module.app.test_client()
+        with worker.session_transaction() as session:
+            session['_user_id'] = str(user)
+            session['_fresh'] = True
+        statuses.append(worker.post('/save-job', data=save_form('https://jobs.example/race')).status_code)
+
+    threads = [threading.Thread(target=save) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert statuses == [302] * 8
+    assert saved_jobs(app_module, user) == [('Python Developer', 'https://jobs.example/race')]
@@ -0,0 +1,31 @@
+import pytest
+
+from resume.matching import JobMatcher, cosine_scores, term_counts
+
+RESUME = 'Backend engineer. Python, Django, PostgreSQL and AWS. Built REST APIs and data pipelines.'
+LISTINGS = [
+    {'title': 'Registered Nurse', 'description': 'Patient care in a busy hospital ward.'},
+    {'title': 'Python Backend Engineer', 'description': '<p>Django, <b>PostgreSQL</b>, AWS and REST APIs.</p>'},
+    {'title': 'Frontend Engineer', 'description': 'React and TypeScript user interfaces.'},
+]
+
+
+def test_term_counts_drop_stop_words_and_markup():
+    assert term_counts('<p>The Python and the python</p>') == {'python': 2}
+
+
+def test_cosine_scores_rank_relevant_listing_first():
+    scores = JobMatcher().score(1, RESUME, LISTINGS)
+    assert scores.index(max(scores)) == 1
+    assert scores[0] == 0.0
+    assert 0.0 < scores[2] < scores[1] <= 1.0
+    assert cosine_scores(term_counts(RESUME), [term_counts(RESUME)]) == [pytest.approx(1.0)]
+
+
+def test_resume_counts_cached_until_content_changes():
+    matcher = JobMatcher()
+    matcher.score(1, RESUME, LISTINGS)
+    matcher.score(1, RESUME, LISTINGS)
+    matcher.score(1, RESUME + ' Kubernetes', LISTINGS)
+    stats = matcher.stats()
+    assert stats['resume_hits'] == 1 and stats['resume_misses'] == 2
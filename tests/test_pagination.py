@@ -0,0 +1,90 @@
+import json
+from datetime import datetime, timedelta
+
+
+def add_resumes(app_module, user, created):
+    with app_module.app.app_context():
+        for index, created_at in enumerate(created):
+            app_module.db.session.add(app_module.Resume(
+                user_id=user, title=f'Resume {index}', content='text', template='classic', created_at=created_at))
+        app_module.db.session.commit()
+
+
+def test_cursor_round_trip(app_module):
+    class Row:
+        created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+        id = 42
+    assert app_module.decode_cursor(app_module.encode_cursor(Row)) == (Row.created_at, 42)
+
+
+def test_keyset_pages_cover_every_row_once_including_ties(app_module, user, client):
+    base = datetime(2024, 1, 1)
+    # Three rows share a created_at so the id tie-breaker has to carry the page boundary
+    add_resumes(app_module, user, [base, base + timedelta(minutes=1), base + timedelta(minutes=1),
+                                   base + timedelta(minutes=1), base + timedelta(minutes=2)])
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        url = '/api/resumes?limit=2' + (f'&cursor={cursor}' if cursor else '')
+        data = client.get(url).get_json()
+        seen.extend(item['id'] for item in data['items'])
+        pages += 1
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 5
+    with app_module.app.app_context():
+        expected = [r.id for r in app_module.Resume.query.filter_by(user_id=user)
+                    .order_by(app_module.Resume.created_at.desc(), app_module.Resume.id.desc())]
+    assert seen == expected
+
+
+def test_last_page_has_no_cursor(app_module, user, client):
+    add_resumes(app_module, user, [datetime(2024, 1, 1), datetime(2024, 1, 2)])
+    data = client.get('/api/resumes?limit=2').get_json()
+    assert len(data['items']) == 2 and data['next_cursor'] is None
+
+
+def test_invalid_cursor_and_limit_return_400(client):
+    assert client.get('/api/resumes?cursor=not-a-cursor').status_code == 400
+    assert client.get('/api/resumes?cursor=Zm9v').status_code == 400
+    assert client.get('/api/resumes?limit=abc').status_code == 400
+
+
+def test_fields_select_the_returned_columns(app_module, user, client):
+    add_resumes(app_module, user, [datetime(2024, 1, 1)])
+    item = client.get('/api/resumes').get_json()['items'][0]
+    assert set(item) == set(app_module.RESUME_API_DEFAULT_FIELDS)
+    assert item['preview'] == 'text'
+    item = client.get('/api/resumes?fields=id, content').get_json()['items'][0]
+    assert set(item) == {'id', 'content'} and item['content'] == 'text'
+    line = client.get('/api/resumes?fields=title&format=ndjson').get_data(as_text=True).splitlines()[0]
+    assert json.loads(line) == {'title': 'Resume 0'}
+
+
+def test_unknown_fields_are_rejected(client):
+    response = client.get('/api/resumes?fields=id,password,user_id')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Unknown fields: password, user_id'
+
+
+def test_preview_and_word_count_follow_content(app_module, user, client):
+    content = 'Jane   Doe\n' + 'word ' * 200
+    resume_id = client.post('/api/resumes', json={'title': 'Engineer', 'content': content}).get_json()['id']
+    with app_module.app.app_context():
+        resume = app_module.db.session.get(app_module.Resume, resume_id)
+        assert resume.preview == ('Jane Doe ' + 'word ' * 200)[:app_module.PREVIEW_LENGTH]
+        resume.content = 'Rewritten summary'
+        letter = app_module.CoverLetter(user_id=user, job_title='Engineer', content='Dear hiring manager,\n\nHello')
+        app_module.db.session.add(letter)
+        app_module.db.session.commit()
+        letter_id = letter.id
+    with app_module.app.app_context():
+        assert app_module.db.session.get(app_module.Resume, resume_id).preview == 'Rewritten summary'
+        letter = app_module.db.session.get(app_module.CoverLetter, letter_id)
+        assert (letter.preview, letter.word_count) == ('Dear hiring manager, Hello', 4)
+        letter.content = None
+        app_module.db.session.commit()
+        assert (letter.preview, letter.word_count) == ('', 0)
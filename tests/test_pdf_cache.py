@@ -0,0 +1,39 @@
+import os
+
+from resume.pdf_cache import PdfRenderCache, resume_cache_key
+
+
+def test_cache_key_changes_with_content():
+    key = resume_cache_key('classic', 1.0, 'content', 'title')
+    assert key == resume_cache_key('classic', 1.0, 'content', 'title')
+    assert key != resume_cache_key('classic', 2.0, 'content', 'title')
+    assert key != resume_cache_key('modern', 1.0, 'content', 'title')
+    assert key != resume_cache_key('classic', 1.0, 'edited', 'title')
+
+
+def test_put_get_and_invalidate(tmp_path):
+    cache = PdfRenderCache(str(tmp_path))
+    assert cache.get(1, 'abc') is None
+    cache.put(1, 'abc', b'%PDF-1')
+    assert cache.get(1, 'abc') == b'%PDF-1'
+    cache.invalidate(1)
+    assert cache.get(1, 'abc') is None
+
+
+def test_put_replaces_stale_entry_for_same_resume(tmp_path):
+    cache = PdfRenderCache(str(tmp_path))
+    cache.put(1, 'old', b'old')
+    cache.put(1, 'new', b'new')
+    assert cache.get(1, 'old') is None
+    assert cache.get(1, 'new') == b'new'
+
+
+def test_lru_eviction(tmp_path):
+    cache = PdfRenderCache(str(tmp_path), max_bytes=10)
+    cache.put(1, 'a', b'12345')
+    os.utime(os.path.join(str(tmp_path), '1-a.pdf'), (1, 1))
+    cache.put(2, 'b', b'12345')
+    cache.put(3, 'c', b'12345')
+    assert cache.get(1, 'a') is None
+    assert cache.get(2, 'b') == b'12345'
+    assert cache.get(3, 'c') == b'12345'
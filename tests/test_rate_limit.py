@@ -0,0 +1,143 @@
+import threading
+import time
+
+import pytest
+
+from resume.rate_limit import ConcurrencyLimiter, LimiterTimeout, SingleFlight, SQLiteCoordinator, TokenBucket
+
+
+def test_limiter_caps_in_flight_calls():
+    limiter = ConcurrencyLimiter(max_in_flight=1, timeout=0.05)
+    entered = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        entered.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=limiter.call, args=(slow,))
+    worker.start()
+    entered.wait(5)
+    with pytest.raises(LimiterTimeout):
+        limiter.call(lambda: None)
+    release.set()
+    worker.join()
+    assert limiter.call(lambda: 'ok') == 'ok'
+    assert limiter.stats()['rejected'] == 1
+
+
+def test_token_bucket_paces_calls():
+    bucket = TokenBucket(rate=1000, capacity=1)
+    assert bucket.acquire()
+    assert bucket.acquire(timeout=1)
+    slow = TokenBucket(rate=0.001, capacity=1)
+    assert slow.acquire()
+    assert not slow.acquire(timeout=0.01)
+
+
+def test_single_flight_shares_one_call():
+    flight = SingleFlight()
+    calls = []
+    gate = threading.Event()
+
+    def upstream():
+        calls.append(1)
+        gate.wait(5)
+        return 'answer'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do('k', upstream))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert results == ['answer'] * 5
+    assert len(calls) == 1
+    assert flight.coalesced == 4
+
+
+# Separate coordinators on one file stand in for separate worker processes
+def test_shared_limiter_caps_in_flight_across_processes(tmp_path):
+    path = str(tmp_path / 'limits.db')
+    first = ConcurrencyLimiter(max_in_flight=1, timeout=0.1, coordinator=SQLiteCoordinator(path), name='openai')
+    second = ConcurrencyLimiter(max_in_flight=1, timeout=0.1, coordinator=SQLiteCoordinator(path), name='openai')
+    with first.slot():
+        with pytest.raises(LimiterTimeout):
+            with second.slot():
+                pass
+    with second.slot():
+        pass
+    assert second.stats()['rejected'] == 1
+
+
+def test_expired_lease_from_dead_process_is_reclaimed(tmp_path):
+    path = str(tmp_path / 'limits.db')
+    assert SQLiteCoordinator(path, lease_ttl=-1).try_lease('openai', 1) is not None
+    # The holder never released its lease, but it has already expired
+    assert SQLiteCoordinator(path).try_lease('openai', 1) is not None
+
+
+def test_shared_token_bucket_paces_all_processes(tmp_path):
+    path = str(tmp_path / 'limits.db')
+    first = SQLiteCoordinator(path)
+    second = SQLiteCoordinator(path)
+    assert first.try_take_token('openai', 0.001, 1) == 0
+    assert second.try_take_token('openai', 0.001, 1) > 0
+
+
+def test_shared_single_flight_coalesces_across_processes(tmp_path):
+    path = str(tmp_path / 'limits.db')
+    leader = SingleFlight(SQLiteCoordinator(path), timeout=5)
+    follower = SingleFlight(SQLiteCoordinator(path), timeout=5)
+    calls = []
+    started = threading.Event()
+    gate = threading.Event()
+
+    def upstream():
+        calls.append(1)
+        started.set()
+        gate.wait(5)
+        return 'answer'
+
+    results = []
+    worker = threading.Thread(target=lambda: results.append(leader.do('k', upstream)))
+    worker.start()
+    started.wait(5)
+    waiter = threading.Thread(target=lambda: results.append(follower.do('k', upstream)))
+    waiter.start()
+    time.sleep(0.1)
+    gate.set()
+    worker.join()
+    waiter.join()
+    assert results == ['answer', 'answer']
+    assert len(calls) == 1
+    assert follower.shared_coalesced == 1
+
+
+def test_failed_shared_call_is_retried_by_a_waiting_process(tmp_path):
+    path = str(tmp_path / 'limits.db')
+    leader = SingleFlight(SQLiteCoordinator(path), timeout=5)
+    follower = SingleFlight(SQLiteCoordinator(path), timeout=5)
+    started = threading.Event()
+    gate = threading.Event()
+
+    def failing():
+        started.set()
+        gate.wait(5)
+        raise RuntimeError('upstream error')
+
+    errors = []
+    worker = threading.Thread(target=lambda: errors.append(pytest.raises(RuntimeError, leader.do, 'k', failing)))
+    worker.start()
+    started.wait(5)
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(follower.do('k', lambda: 'recovered')))
+    waiter.start()
+    time.sleep(0.1)
+    gate.set()
+    worker.join()
+    waiter.join()
+    assert results == ['recovered']
+    assert follower.shared_coalesced == 0
@@ -0,0 +1,75 @@
+import os
+import signal
+import time
+
+import pytest
+
+from resume.renderer import RenderService, RenderQueueFull, RenderTimeout, RenderUnavailable
+
+
+def slow_render(html_string, base_url=None):
+    time.sleep(30)
+    return b'%PDF-slow'
+
+
+def fast_render(html_string, base_url=None):
+    return b'%PDF-' + html_string.encode()
+
+
+def crashing_render(html_string, base_url=None):
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+def test_submit_rejects_when_queue_is_full():
+    service = RenderService(max_workers=1, max_queue=0)
+    service._slots.acquire()
+    with pytest.raises(RenderQueueFull):
+        service.submit('<p>Resume</p>')
+    assert service._executor is None
+
+
+def test_renders_html_to_pdf_bytes():
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError) as e:
+        # WeasyPrint also needs the Pango system libraries at import time
+        pytest.skip(f'weasyprint unavailable: {e}')
+    service = RenderService(max_workers=1, max_queue=0, timeout=60)
+    try:
+        pdf = service.render_pdf('<h1>Jane Doe</h1><p>Backend engineer</p>')
+    finally:
+        service.shutdown()
+    assert pdf.startswith(b'%PDF')
+
+
+def wait_for_free_slots(service, count):
+    deadline = time.monotonic() + 5
+    while service._slots._value < count and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return service._slots._value
+
+
+def test_timeout_kills_the_hung_render_and_recycles_the_pool():
+    service = RenderService(max_workers=1, max_queue=1, timeout=0.5, worker=slow_render)
+    try:
+        with pytest.raises(RenderTimeout):
+            service.render_pdf('<p>Resume</p>')
+        # The hung worker is killed rather than left holding its slot for 30s
+        assert wait_for_free_slots(service, 2) == 2
+        service.worker = fast_render
+        assert service.render_pdf('<p>Again</p>', timeout=30) == b'%PDF-<p>Again</p>'
+    finally:
+        service.shutdown()
+
+
+def test_next_render_succeeds_after_a_worker_dies():
+    service = RenderService(max_workers=1, max_queue=1, timeout=30, worker=crashing_render)
+    try:
+        with pytest.raises(RenderUnavailable):
+            service.render_pdf('<p>Resume</p>')
+        service.worker = fast_render
+        assert service.render_pdf('<p>One</p>') == b'%PDF-<p>One</p>'
+        assert service.render_pdf('<p>Two</p>') == b'%PDF-<p>Two</p>'
+        assert wait_for_free_slots(service, 2) == 2
+    finally:
+        service.shutdown()
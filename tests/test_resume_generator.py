@@ -1,2 +1,55 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
 def test_hello_world():
-    assert "hello" + " " + "world" == "hello world"
\ No newline at end of file
+    assert "hello" + " " + "world" == "hello world"
+
+
+@pytest.fixture
+def generator(tmp_path_factory):
+    pytest.importorskip('openai')
+    os.environ.setdefault('OPENAI_API_KEY', 'test')
+    os.environ.setdefault('OPENAI_LIMITS_PATH', str(tmp_path_factory.getbasetemp() / 'openai_limits.db'))
+    from resume import resume_generator
+    return resume_generator
+
+
+class FakeCompletions:
+    def __init__(self, limiter, deltas):
+        self.limiter = limiter
+        self.deltas = deltas
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return self._chunks()
+
+    def _chunks(self):
+        yield SimpleNamespace(choices=[])
+        for delta in self.deltas:
+            # Chunks are read while the limiter slot is still held
+            assert self.limiter.in_flight == 1
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+
+
+def fake_client(generator, monkeypatch, deltas):
+    completions = FakeCompletions(generator.openai_limiter, deltas)
+    monkeypatch.setattr(generator, 'client', SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    return completions
+
+
+def test_complete_stream_yields_deltas_inside_a_limiter_slot(generator, monkeypatch):
+    completions = fake_client(generator, monkeypatch, ['Hello', None, ', ', '', 'world'])
+    assert list(generator._complete_stream('prompt')) == ['Hello', ', ', 'world']
+    assert completions.calls[0]['stream'] is True
+    assert generator.openai_limiter.in_flight == 0
+
+
+def test_complete_stream_caches_the_joined_text(generator, monkeypatch):
+    completions = fake_client(generator, monkeypatch, ['a', 'b'])
+    monkeypatch.setattr(generator, 'generation_cache', generator.GenerationCache(generator.MemoryBackend(), ttl=60))
+    assert list(generator._complete_stream('cached prompt', cache=True)) == ['a', 'b']
+    assert list(generator._complete_stream('cached prompt', cache=True)) == ['ab']
+    assert len(completions.calls) == 1
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from resume.streaming import with_heartbeat
+
+
+def slow(items, delay):
+    for item in items:
+        time.sleep(delay)
+        yield item
+
+
+def test_heartbeats_fill_quiet_gaps():
+    out = list(with_heartbeat(slow(['a', 'b'], 0.12), interval=0.05))
+    assert [item for item in out if item is not None] == ['a', 'b']
+    assert out.count(None) >= 2
+
+
+def test_fast_stream_has_no_heartbeats():
+    assert list(with_heartbeat(iter(['a', 'b', 'c']), interval=5)) == ['a', 'b', 'c']
+
+
+def test_errors_reach_the_caller():
+    def failing():
+        yield 'a'
+        raise RuntimeError('upstream closed')
+
+    stream = with_heartbeat(failing(), interval=5)
+    assert next(stream) == 'a'
+    with pytest.raises(RuntimeError):
+        next(stream)
+
+
+def test_closing_stops_the_reader():
+    closed = []
+
+    def endless():
+        try:
+            while True:
+                time.sleep(0.01)
+                yield 'x'
+        finally:
+            closed.append(True)
+
+    stream = with_heartbeat(endless(), interval=5)
+    assert next(stream) == 'x'
+    stream.close()
+    deadline = time.monotonic() + 2
+    while not closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert closed == [True]
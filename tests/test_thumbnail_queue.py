@@ -0,0 +1,173 @@
+import sqlite3
+
+import pytest
+
+from resume.renderer import RenderError
+from resume.thumbnail_queue import ThumbnailQueue
+
+
+def make_queue(tmp_path, handled):
+    queue = ThumbnailQueue(str(tmp_path / 'queue.db'), lambda rid, html: handled.append((rid, html)))
+    queue.start = lambda: None
+    return queue
+
+
+def test_duplicate_jobs_are_coalesced(tmp_path):
+    handled = []
+    queue = make_queue(tmp_path, handled)
+    queue.enqueue(1, '<p>v1</p>')
+    queue.enqueue(1, '<p>v2</p>')
+    queue.enqueue(2, '<p>other</p>')
+    assert queue.pending() == 2
+    assert queue.run_pending() == 2
+    assert handled == [(1, '<p>v2</p>'), (2, '<p>other</p>')]
+    assert queue.pending() == 0
+
+
+def test_discard_and_failing_handler(tmp_path):
+    def handler(resume_id, html):
+        raise RuntimeError('render failed')
+
+    queue = ThumbnailQueue(str(tmp_path / 'queue.db'), handler)
+    queue.start = lambda: None
+    queue.enqueue(1, '<p>a</p>')
+    queue.enqueue(2, '<p>b</p>')
+    queue.discard(1)
+    assert queue.run_pending() == 1
+    assert queue.pending() == 0
+
+
+class Busy(Exception):
+    pass
+
+
+def test_job_survives_until_handler_succeeds(tmp_path):
+    calls = []
+
+    def handler(resume_id, html):
+        calls.append(resume_id)
+        if len(calls) < 3:
+            raise Busy()
+
+    queue = ThumbnailQueue(str(tmp_path / 'queue.db'), handler, retry_on=(Busy,), retry_delay=0)
+    queue.start = lambda: None
+    queue.enqueue(1, '<p>a</p>')
+    assert queue.run_pending() == 3
+    assert calls == [1, 1, 1]
+    assert queue.pending() == 0
+
+
+def test_retry_backs_off_and_gives_up_after_max_attempts(tmp_path):
+    def handler(resume_id, html):
+        raise Busy()
+
+    queue = ThumbnailQueue(str(tmp_path / 'queue.db'), handler, retry_on=(Busy,), retry_delay=60)
+    queue.start = lambda: None
+    queue.enqueue(1, '<p>a</p>')
+    assert queue.run_pending() == 1
+    # Still queued, but waiting out its backoff
+    assert queue.pending() == 1
+    assert queue.claim() is None
+
+    queue.retry_delay = 0
+    with queue._connect() as conn:
+        conn.execute('UPDATE thumbnail_jobs SET available_at = 0')
+    assert queue.run_pending() == queue.max_attempts - 1
+    assert queue.pending() == 0
+
+
+def test_claim_from_dead_worker_is_taken_over(tmp_path):
+    handled = []
+    queue = make_queue(tmp_path, handled)
+    queue.enqueue(1, '<p>a</p>')
+    # A worker claims the job and dies before finishing it
+    assert queue.claim()[0] == 1
+    assert queue.run_pending() == 0
+    assert queue.pending() == 1
+
+    queue.claim_timeout = 0
+    with queue._connect() as conn:
+        conn.execute('UPDATE thumbnail_jobs SET claimed_at = claimed_at - 1')
+    assert queue.run_pending() == 1
+    assert handled == [(1, '<p>a</p>')]
+    assert queue.pending() == 0
+
+
+def test_reenqueue_while_rendering_is_not_lost(tmp_path):
+    handled = []
+    queue = make_queue(tmp_path, handled)
+    queue.enqueue(1, '<p>v1</p>')
+    resume_id, html, enqueued_at, attempts = queue.claim()
+    queue.enqueue(1, '<p>v2</p>')
+    queue.complete(resume_id, enqueued_at)
+    assert queue.run_pending() == 1
+    assert handled == [(1, '<p>v2</p>')]
+
+
+def test_existing_queue_file_is_migrated(tmp_path):
+    path = str(tmp_path / 'queue.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE thumbnail_jobs (resume_id INTEGER PRIMARY KEY, html TEXT NOT NULL, enqueued_at REAL NOT NULL)')
+    conn.execute("INSERT INTO thumbnail_jobs VALUES (7, '<p>old</p>', 0)")
+    conn.commit()
+    conn.close()
+    handled = []
+    queue = ThumbnailQueue(path, lambda rid, html: handled.append(rid))
+    assert queue.run_pending() == 1
+    assert handled == [7]
+
+
+def one_page_pdf():
+    fitz = pytest.importorskip('fitz')
+    doc = fitz.open()
+    doc.new_page(width=612, height=792).insert_text((72, 72), 'Jane Doe')
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def add_resume(app_module, user):
+    with app_module.app.app_context():
+        resume = app_module.Resume(user_id=user, title='Engineer', content='Jane Doe')
+        app_module.db.session.add(resume)
+        app_module.db.session.commit()
+        return resume.id
+
+
+def test_generated_thumbnail_replaces_placeholder(app_module, user, client, tmp_path, monkeypatch):
+    # Thumbnails are written relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(app_module, 'render_pdf', lambda html: one_page_pdf())
+    resume_id = add_resume(app_module, user)
+    assert 'class="thumbnail-pending"' in client.get('/resumes').get_data(as_text=True)
+
+    queue = ThumbnailQueue(str(tmp_path / 'queue.db'), app_module.generate_resume_thumbnail)
+    queue.start = lambda: None
+    queue.enqueue(resume_id, '<p>Jane Doe</p>')
+    assert queue.run_pending() == 1
+
+    path = tmp_path / app_module.thumbnail_path(resume_id)
+    fitz = pytest.importorskip('fitz')
+    assert fitz.Pixmap(str(path)).width == app_module.THUMBNAIL_WIDTH
+    assert not list(path.parent.glob('*.tmp'))
+    body = client.get('/resumes').get_data(as_text=True)
+    assert f'<img src="/static/resume_thumbnails/{resume_id}.png"' in body
+    assert 'class="thumbnail-pending"' not in body
+
+
+def test_failed_render_leaves_placeholder(app_module, user, client, tmp_path, monkeypatch):
+    def failing_render(html):
+        raise RenderError('render failed')
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(app_module, 'render_pdf', failing_render)
+    resume_id = add_resume(app_module, user)
+    queue = ThumbnailQueue(str(tmp_path / 'queue.db'), app_module.generate_resume_thumbnail)
+    queue.start = lambda: None
+    queue.enqueue(resume_id, '<p>Jane Doe</p>')
+    assert queue.run_pending() == 1
+    assert queue.pending() == 0
+
+    assert not (tmp_path / app_module.thumbnail_path(resume_id)).exists()
+    body = client.get('/resumes').get_data(as_text=True)
+    assert f'data-thumbnail-src="/static/resume_thumbnails/{resume_id}.png"' in body
@@ -0,0 +1,31 @@
+from resume.user_cache import UserCache
+
+
+def test_get_set_and_ttl():
+    cache = UserCache(ttl=60)
+    cache.set(1, {'id': 1, 'subscription': 'Free'})
+    assert cache.get(1) == {'id': 1, 'subscription': 'Free'}
+    expired = UserCache(ttl=-1)
+    expired.set(1, {'id': 1})
+    assert expired.get(1) is None
+
+
+def test_invalidation_reaches_other_workers(tmp_path):
+    epoch = str(tmp_path / 'users.epoch')
+    worker_a = UserCache(ttl=60, epoch_path=epoch)
+    worker_b = UserCache(ttl=60, epoch_path=epoch)
+    worker_a.set(1, {'id': 1, 'subscription': 'Free'})
+    worker_b.set(1, {'id': 1, 'subscription': 'Free'})
+    worker_b.invalidate(1)
+    assert worker_b.get(1) is None
+    assert worker_a.get(1) is None
+
+
+def test_route_stats_estimate_saved_db_time():
+    cache = UserCache()
+    cache.record('dashboard', hit=False, db_seconds=0.004)
+    cache.record('dashboard', hit=True)
+    cache.record('dashboard', hit=True)
+    stats = cache.stats()['routes']['dashboard']
+    assert stats['hits'] == 2 and stats['misses'] == 1
+    assert stats['db_ms_saved'] == 8.0